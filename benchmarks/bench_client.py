@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Throughput/latency benchmarks for MassiveAPIClient against the local mock server.
+
+Run from the repository root:
+
+    python benchmarks/bench_client.py            # full run
+    python benchmarks/bench_client.py --quick    # smaller workloads
+    python benchmarks/bench_client.py --json out.json
+
+No live API calls are made.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import Dict, Any
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mock_server import MockMassiveServer
+from src.api_client import MassiveAPIClient, RateLimiter, SharedRateLimiter
+from src.bar_store import bars_to_array
+from src.fast_decode import decode_columns, orjson
+from src.fx_rates import FXRates
+from src.key_pool import KeyPool
+from src.ticker_index import TickerIndex
+from src.response_cache import ResponseCache
+from src.retry import EntitlementMap
+from src.transport import RecordingTransport, ReplayTransport
+
+UNLIMITED = 10 ** 9
+
+
+def make_client(server: MockMassiveServer, **kwargs) -> MassiveAPIClient:
+    """Client pointed at the mock server with no rate limit, cache or shared state."""
+    kwargs.setdefault("rate_limiter", RateLimiter(calls_per_minute=UNLIMITED))
+    kwargs.setdefault("entitlements", EntitlementMap(os.path.join(tempfile.mkdtemp(), "entitlements.json")))
+    return MassiveAPIClient(api_key="benchmark", base_url=server.base_url, **kwargs)
+
+
+def bench_requests_per_sec(server: MockMassiveServer, calls: int) -> Dict[str, Any]:
+    """Sequential small requests through _make_request (no cache, no limiter)."""
+    client = make_client(server)
+    latencies = []
+    start = time.perf_counter()
+    for i in range(calls):
+        t0 = time.perf_counter()
+        client._make_request("/v1/marketstatus/upcoming")
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "calls": calls,
+        "requests_per_sec": calls / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def bench_limiter_accuracy(calls: int, per_window: int, period: float) -> Dict[str, Any]:
+    """Achieved vs configured rate and worst window overshoot for both limiters."""
+    results = {}
+    limiters = {
+        "in_process": RateLimiter(calls_per_minute=per_window, period=period),
+        "shared": SharedRateLimiter(os.path.join(tempfile.mkdtemp(), "rate.json"),
+                                    calls_per_minute=per_window, period=period),
+    }
+    for name, limiter in limiters.items():
+        stamps = []
+        start = time.perf_counter()
+        for _ in range(calls):
+            limiter.wait_if_needed()
+            stamps.append(time.perf_counter())
+        elapsed = time.perf_counter() - start
+        # Most calls that landed inside any single window
+        worst = max(
+            sum(1 for t in stamps[i:] if t - stamps[i] < period)
+            for i in range(len(stamps))
+        )
+        ideal = (calls - 1) // per_window * period
+        results[name] = {
+            "configured_per_window": per_window,
+            "max_in_any_window": worst,
+            "elapsed_s": elapsed,
+            "ideal_s": ideal,
+            "overhead_s": elapsed - ideal,
+        }
+    return results
+
+
+def bench_cache(server: MockMassiveServer, calls: int, distinct: int) -> Dict[str, Any]:
+    """Zipf-like repeated lookups through the on-disk cache."""
+    cache = ResponseCache(tempfile.mkdtemp())
+    client = make_client(server, cache=cache)
+    rng = random.Random(0)
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    before = server.request_count
+    start = time.perf_counter()
+    for _ in range(calls):
+        i = rng.choices(range(distinct), weights)[0]
+        client._make_request(f"/v2/aggs/ticker/{server.tickers[i]}/range/1/day/2024-01-01/2024-01-31")
+    elapsed = time.perf_counter() - start
+    stats = cache.stats()
+    return {
+        "calls": calls,
+        "server_requests": server.request_count - before,
+        "hit_ratio": stats["hit_ratio"],
+        "calls_per_sec": calls / elapsed,
+        "cache_bytes": stats["bytes"],
+    }
+
+
+def bench_pagination(server: MockMassiveServer, page_size: int) -> Dict[str, Any]:
+    """Records/sec streaming the full ticker universe through iter_results."""
+    client = make_client(server)
+    before = server.request_count
+    start = time.perf_counter()
+    count = sum(1 for _ in client.iter_results("/reference/tickers", params={"limit": page_size}))
+    elapsed = time.perf_counter() - start
+    return {
+        "records": count,
+        "pages": server.request_count - before,
+        "records_per_sec": count / elapsed,
+    }
+
+
+def bench_replay(server: MockMassiveServer, page_size: int) -> Dict[str, Any]:
+    """Record the pagination workload to a cassette, then replay it offline."""
+    cassette = os.path.join(tempfile.mkdtemp(), "bench.json.gz")
+    params = {"limit": page_size}
+    with make_client(server, transport=RecordingTransport(cassette)) as client:
+        start = time.perf_counter()
+        count = sum(1 for _ in client.iter_results("/reference/tickers", params=params))
+        live = time.perf_counter() - start
+
+    client = make_client(server, transport=ReplayTransport(cassette))
+    start = time.perf_counter()
+    sum(1 for _ in client.iter_results("/reference/tickers", params=params))
+    replay = time.perf_counter() - start
+    return {
+        "records": count,
+        "cassette_kb": os.path.getsize(cassette) / 1e3,
+        "live_records_per_sec": count / live,
+        "replay_records_per_sec": count / replay,
+    }
+
+
+def bench_json_decode(server: MockMassiveServer, repeat: int) -> Dict[str, Any]:
+    """Decode cost of a capped (50,000-bar) minute aggregate response."""
+    client = make_client(server)
+    url = f"{server.root_url}/v2/aggs/ticker/AAPL/range/1/minute/2024-01-01/2024-07-31"
+    response = client.session.get(url, params={"apiKey": "benchmark", "limit": 50000})
+    payload = response.content
+    bars = len(response.json()["results"])
+
+    decoders = {
+        "json": lambda: json.loads(payload),
+        "json_to_array": lambda: bars_to_array(json.loads(payload)["results"]),
+        "columnar": lambda: decode_columns(payload),
+    }
+    results: Dict[str, Any] = {"bars": bars, "payload_mb": len(payload) / 1e6,
+                               "orjson": orjson is not None}
+    for name, decode in decoders.items():
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            decode()
+            best = min(best, time.perf_counter() - t0)
+        results[name] = {
+            "decode_ms": best * 1000,
+            "us_per_bar": best / bars * 1e6,
+            "mb_per_sec": len(payload) / 1e6 / best,
+        }
+    return results
+
+
+def bench_key_pool(calls: int, per_window: int, period: float) -> Dict[str, Any]:
+    """Throughput with 1 vs 4 keys when the server limits every key separately."""
+    results = {}
+    for n_keys in (1, 4):
+        keys = [f"key{i}" for i in range(n_keys)]
+        with MockMassiveServer(rate_limit=per_window, rate_window=period, api_keys=keys) as server:
+            client = make_client(server, rate_limiter=None,
+                                 # A little slack so client and server windows don't race
+                                 key_pool=KeyPool(keys, calls_per_minute=per_window, period=period * 1.05))
+            start = time.perf_counter()
+            for _ in range(calls):
+                client._make_request("/v1/marketstatus/upcoming")
+            elapsed = time.perf_counter() - start
+            results[f"{n_keys}_keys"] = {
+                "requests_per_sec": calls / elapsed,
+                "server_429s": server.status_counts.get(429, 0),
+            }
+    results["speedup"] = results["4_keys"]["requests_per_sec"] / results["1_keys"]["requests_per_sec"]
+    return results
+
+
+def bench_ticker_search(server: MockMassiveServer, repeat: int) -> Dict[str, Any]:
+    """Local TickerIndex search latency vs one remote ?search= call."""
+    index = TickerIndex(server.records("tickers"))
+    client = make_client(server)
+    t0 = time.perf_counter()
+    client._make_request("/reference/tickers", params={"search": "holdings", "limit": 10})
+    remote = time.perf_counter() - t0
+
+    results = {"tickers": len(index), "remote_call_us": remote * 1e6}
+    for label, query in [("symbol_prefix", server.tickers[7][:3]), ("name_word", "holdings"),
+                         ("fuzzy", f"{server.tickers[7].lower()} hodlings")]:
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            index.search(query)
+        results[f"{label}_us"] = (time.perf_counter() - t0) / repeat * 1e6
+    return results
+
+
+def bench_fx_conversion(server: MockMassiveServer, amounts: int) -> Dict[str, Any]:
+    """One grouped fx call, then local cross rates and bulk conversion."""
+    client = make_client(server)
+    t0 = time.perf_counter()
+    rates = FXRates.load(client, date(2024, 6, 7))
+    load = time.perf_counter() - t0
+
+    rng = random.Random(0)
+    values = [rng.uniform(1, 10000) for _ in range(amounts)]
+    currencies = [rng.choice(rates.currencies) for _ in range(amounts)]
+    t0 = time.perf_counter()
+    rates.convert(values, currencies, "USD")
+    bulk = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for currency in currencies[:1000]:
+        rates.rate(currency, "JPY")
+    single = (time.perf_counter() - t0) / 1000
+    return {"currencies": len(rates), "load_ms": load * 1e3, "conversions": amounts,
+            "bulk_conversions_per_sec": amounts / bulk, "cross_rate_us": single * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+    scale = 0.2 if args.quick else 1.0
+
+    results: Dict[str, Any] = {}
+    with MockMassiveServer(tickers=2000) as server:
+        results["requests"] = bench_requests_per_sec(server, int(500 * scale))
+        results["limiter"] = bench_limiter_accuracy(int(60 * scale) or 12, per_window=10, period=0.5)
+        results["cache"] = bench_cache(server, int(2000 * scale), distinct=200)
+        results["pagination"] = bench_pagination(server, page_size=100)
+        results["replay"] = bench_replay(server, page_size=100)
+        results["json_decode"] = bench_json_decode(server, repeat=3 if args.quick else 10)
+        results["ticker_search"] = bench_ticker_search(server, repeat=200 if args.quick else 1000)
+        results["fx_conversion"] = bench_fx_conversion(server, int(1_000_000 * scale))
+    results["key_pool"] = bench_key_pool(int(200 * scale) or 40, per_window=5, period=0.25)
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
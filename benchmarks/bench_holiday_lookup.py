@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Benchmark per-call latency of HolidayFetcher date lookups (no network)."""
+
+import os
+import sys
+import tempfile
+import timeit
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("MASSIVE_API_KEY", "benchmark")
+
+from holiday_fetcher import HolidayFetcher
+
+EXCHANGES = ["NYSE", "NASDAQ", "OTC", "AMEX", "CBOE"]
+
+
+def synthetic_holidays(days: int = 40):
+    """Upcoming-holidays payload shaped like /v1/marketstatus/upcoming."""
+    start = date(2025, 1, 1)
+    holidays = []
+    for i in range(days):
+        day = (start + timedelta(days=9 * i)).isoformat()
+        status = "early-close" if i % 4 == 0 else "closed"
+        for exchange in EXCHANGES:
+            holiday = {"date": day, "exchange": exchange, "name": f"Holiday {i}", "status": status}
+            if status == "early-close":
+                holiday.update(open=f"{day}T14:30:00.000Z", close=f"{day}T18:00:00.000Z")
+            holidays.append(holiday)
+    return holidays
+
+
+def main(number: int = 20000):
+    snapshot = os.path.join(tempfile.mkdtemp(), "holidays.json")
+    fetcher = HolidayFetcher("NASDAQ", snapshot_path=snapshot)
+    payload = synthetic_holidays()
+    fetcher.client.get_market_holidays = lambda: payload
+    fetcher.fetch_holidays()  # Warm the cache
+
+    hit = date(2025, 1, 10)
+    miss = date(2025, 1, 2)
+    cases = {
+        "is_trading_day (holiday)": lambda: fetcher.is_trading_day(hit),
+        "is_trading_day (regular)": lambda: fetcher.is_trading_day(miss),
+        "is_market_closed": lambda: fetcher.is_market_closed(hit),
+        "is_early_close": lambda: fetcher.is_early_close(miss),
+        "get_holiday_info": lambda: fetcher.get_holiday_info(hit),
+    }
+
+    print(f"{len(payload)} cached holidays, {number} calls per case")
+    for name, func in cases.items():
+        seconds = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"  {name:<28} {seconds / number * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
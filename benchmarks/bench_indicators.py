@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Benchmark IndicatorEngine over a BarStore universe (no network)."""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.bar_store import BAR_DTYPE, BarStore
+from src.indicators import ATR, EMA, MACD, RSI, SMA, Bollinger, IndicatorEngine
+
+DAY_MS = 86_400_000
+
+
+def synthetic_bars(rng, count: int, start: int = 0) -> np.ndarray:
+    bars = np.zeros(count, dtype=BAR_DTYPE)
+    bars["t"] = (start + np.arange(count)) * DAY_MS
+    bars["c"] = 100 + np.cumsum(rng.normal(size=count))
+    bars["h"] = bars["c"] + rng.random(count)
+    bars["l"] = bars["c"] - rng.random(count)
+    return bars
+
+
+def twenty_indicators():
+    indicators = {}
+    for n in (10, 20, 50, 100, 200):
+        indicators[f"sma{n}"] = SMA(n)
+        indicators[f"ema{n}"] = EMA(n)
+    for n in (7, 14, 21):
+        indicators[f"rsi{n}"] = RSI(n)
+        indicators[f"atr{n}"] = ATR(n)
+    indicators["macd"] = MACD()
+    indicators["macd_fast"] = MACD(5, 35, 5)
+    indicators["bb20"] = Bollinger(20)
+    indicators["bb50"] = Bollinger(50, 2.5)
+    return indicators
+
+
+def main(tickers: int = 500, history: int = 500):
+    rng = np.random.default_rng(0)
+    store = BarStore(tempfile.mkdtemp())
+    universe = [f"T{i:04d}" for i in range(tickers)]
+    for ticker in universe:
+        store.append(ticker, "day", synthetic_bars(rng, history))
+
+    engine = IndicatorEngine(store, twenty_indicators())
+    t0 = time.perf_counter()
+    engine.update(universe)
+    initial = time.perf_counter() - t0
+
+    for ticker in universe:
+        store.append(ticker, "day", synthetic_bars(rng, 1, start=history))
+    t0 = time.perf_counter()
+    engine.update(universe)
+    incremental = time.perf_counter() - t0
+
+    print(f"{len(engine.indicators)} indicators x {tickers} tickers, {history} daily bars each, 0 API calls")
+    print(f"  initial (full history): {initial * 1000:8.1f} ms")
+    print(f"  update (+1 bar each):   {incremental * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
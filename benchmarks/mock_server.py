@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Massive.com REST API (benchmarks and offline tests).
+
+Serves deterministic, realistically shaped payloads for the endpoints the
+client uses, with optional latency, 429 injection and a per-window call cap:
+
+    /v1/marketstatus/upcoming
+    /v3/reference/dividends            (paginated via next_url)
+    /v3/reference/tickers              (paginated via next_url)
+    /v3/reference/splits               (paginated via next_url)
+    /v2/aggs/ticker/{T}/range/{m}/{span}/{from}/{to}   (minute/hour/day)
+    /v2/aggs/grouped/locale/{locale}/market/{market}/{date}
+"""
+
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+AGG_CAP = 50000
+SESSION_OPEN_MINUTE = 9 * 60 + 30  # 09:30 local, treated as UTC for simplicity
+SESSION_MINUTES = 390
+
+# USD value of one unit of each mock currency, and the pairs the fx grouped
+# endpoint quotes (market convention; HUF and PLN only trade against EUR)
+FX_USD_VALUES = {
+    "USD": 1.0, "EUR": 1.08, "GBP": 1.27, "JPY": 0.0067, "CHF": 1.12, "AUD": 0.66, "CAD": 0.73,
+    "NZD": 0.61, "SEK": 0.095, "NOK": 0.093, "MXN": 0.058, "HKD": 0.128, "HUF": 0.0027, "PLN": 0.25,
+}
+FX_PAIRS = (
+    "EURUSD", "GBPUSD", "AUDUSD", "NZDUSD", "USDJPY", "USDCHF", "USDCAD", "USDSEK", "USDNOK",
+    "USDMXN", "USDHKD", "EURGBP", "EURJPY", "GBPJPY", "EURCHF", "EURHUF", "EURPLN",
+)
+
+
+class MockMassiveServer:
+    """Threaded HTTP server emulating the subset of the API the client uses."""
+
+    def __init__(self, latency: float = 0.0, rate_limit: Optional[int] = None,
+                 rate_window: float = 60.0, fail_429_rate: float = 0.0,
+                 tickers: int = 500, dividends_per_ticker: int = 40, seed: int = 0,
+                 api_keys: Optional[List[str]] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        """Initialize mock server.
+
+        Args:
+            latency: Seconds added to every response
+            rate_limit: Calls allowed per ``rate_window`` and API key before 429s
+                (None = unlimited)
+            rate_window: Window length in seconds for ``rate_limit``
+            fail_429_rate: Probability of a random 429 on any request
+            tickers: Size of the synthetic stock universe
+            dividends_per_ticker: Dividend records generated per ticker
+            seed: RNG seed for deterministic payloads and failures
+            api_keys: Keys accepted (others get 401); None accepts any key
+            host: Bind address
+            port: Bind port (0 = pick a free port)
+        """
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.fail_429_rate = fail_429_rate
+        self.tickers = [self._ticker_name(i) for i in range(tickers)]
+        self.dividends_per_ticker = dividends_per_ticker
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.api_keys = set(api_keys) if api_keys is not None else None
+        self._calls: Dict[str, deque] = {}
+        self.request_count = 0
+        self.status_counts: Dict[int, int] = {}
+        self._records: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+
+        handler = type("Handler", (_Handler,), {"mock": self})
+        self._httpd = ThreadingHTTPServer((host, port), handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _ticker_name(i: int) -> str:
+        letters = ""
+        n = i
+        for _ in range(4):
+            letters = chr(ord("A") + n % 26) + letters
+            n //= 26
+        return letters
+
+    @property
+    def root_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        """Value for MassiveAPIClient(base_url=...)."""
+        return f"{self.root_url}/v3"
+
+    def start(self) -> "MockMassiveServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-massive", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # -- Admission control -------------------------------------------------
+
+    def admit(self, api_key: str = "") -> Optional[float]:
+        """Count a request; return Retry-After seconds if it must get a 429."""
+        with self._lock:
+            self.request_count += 1
+            now = time.monotonic()
+            if self.fail_429_rate and self._rng.random() < self.fail_429_rate:
+                return 1.0
+            if self.rate_limit is None:
+                return None
+            calls = self._calls.setdefault(api_key, deque())
+            while calls and now - calls[0] >= self.rate_window:
+                calls.popleft()
+            if len(calls) >= self.rate_limit:
+                return self.rate_window - (now - calls[0])
+            calls.append(now)
+            return None
+
+    def records(self, kind: str, market: str = "stocks") -> List[Dict[str, Any]]:
+        """Full (memoized) ticker, split or dividend universe."""
+        key = (kind, market)
+        with self._lock:
+            if key not in self._records:
+                if kind == "tickers":
+                    self._records[key] = [self.ticker_record(i, market) for i in range(len(self.tickers))]
+                elif kind == "splits":
+                    self._records[key] = [self.split_record(i) for i in range(0, len(self.tickers), 25)]
+                else:
+                    total = len(self.tickers) * self.dividends_per_ticker
+                    self._records[key] = [self.dividend_record(i) for i in range(total)]
+            return self._records[key]
+
+    def count_status(self, status: int):
+        with self._lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    # -- Payloads ----------------------------------------------------------
+
+    def holidays(self) -> List[Dict[str, Any]]:
+        records = []
+        for day, name, status in [
+            ("2024-11-28", "Thanksgiving", "closed"),
+            ("2024-11-29", "Thanksgiving", "early-close"),
+            ("2024-12-24", "Christmas Eve", "early-close"),
+            ("2024-12-25", "Christmas", "closed"),
+            ("2025-01-01", "New Years Day", "closed"),
+        ]:
+            for exchange in ("NYSE", "NASDAQ", "OTC"):
+                record = {"date": day, "exchange": exchange, "name": name, "status": status}
+                if status == "early-close":
+                    record.update(open=f"{day}T14:30:00.000Z", close=f"{day}T18:00:00.000Z")
+                records.append(record)
+        return records
+
+    def ticker_record(self, i: int, market: str = "stocks") -> Dict[str, Any]:
+        symbol = self.tickers[i]
+        if market == "fx":
+            symbol = f"C:{symbol[-3:]}USD"
+        elif market == "crypto":
+            symbol = f"X:{symbol[-3:]}USD"
+        return {
+            "ticker": symbol,
+            "name": f"{self.tickers[i].title()} Holdings Inc.",
+            "market": market,
+            "locale": "us" if market == "stocks" else "global",
+            "primary_exchange": "XNAS" if i % 2 else "XNYS",
+            "type": "CS" if i % 10 else "ETF",
+            "active": i % 17 != 0,
+            "currency_name": "usd",
+            "cik": f"{1000000 + i:010d}",
+            # Spread over 2024 so incremental (sort=last_updated_utc) syncs have work to skip
+            "last_updated_utc": f"{datetime(2024, 1, 1) + timedelta(minutes=997 * i % 525600):%Y-%m-%dT%H:%M:%S}Z",
+        }
+
+    def dividend_record(self, i: int) -> Dict[str, Any]:
+        ticker = self.tickers[(i // self.dividends_per_ticker) % len(self.tickers)]
+        ex_date = date(2024, 12, 1) - timedelta(days=91 * (i % self.dividends_per_ticker))
+        return {
+            "id": f"E{hashlib.md5(f'{ticker}{i}'.encode()).hexdigest()[:16]}",
+            "ticker": ticker,
+            "cash_amount": round(0.1 + (i % 7) * 0.05, 4),
+            "currency": "USD",
+            "declaration_date": (ex_date - timedelta(days=30)).isoformat(),
+            "ex_dividend_date": ex_date.isoformat(),
+            "record_date": (ex_date + timedelta(days=1)).isoformat(),
+            "pay_date": (ex_date + timedelta(days=14)).isoformat(),
+            "frequency": 4,
+            "dividend_type": "CD",
+        }
+
+    def split_record(self, i: int) -> Dict[str, Any]:
+        """Every 25th ticker splits 2-for-1 (every 100th reverse-splits 1-for-10) in mid 2024."""
+        ticker = self.tickers[i]
+        reverse = i % 100 == 0
+        return {
+            "id": f"S{hashlib.md5(ticker.encode()).hexdigest()[:16]}",
+            "ticker": ticker,
+            "execution_date": (date(2024, 6, 3) + timedelta(weeks=(i // 25) % 10)).isoformat(),
+            "split_from": 10 if reverse else 1,
+            "split_to": 1 if reverse else 2,
+        }
+
+    def fx_rate(self, base: str, quote: str, day: date) -> float:
+        """Mock close of ``base``/``quote`` on ``day`` (consistent across all pairs)."""
+        def value(currency: str) -> float:
+            drift = 1 + 0.01 * math.sin(day.toordinal() / 7 + len(currency) + ord(currency[0]))
+            return FX_USD_VALUES[currency] * (1 if currency == "USD" else drift)
+        return value(base) / value(quote)
+
+    def fx_grouped(self, day: date) -> List[Dict[str, Any]]:
+        """Grouped-daily fx bars (``T`` = ``C:{base}{quote}``)."""
+        midnight = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
+        results = []
+        for pair in FX_PAIRS:
+            close = self.fx_rate(pair[:3], pair[3:], day)
+            results.append({"T": f"C:{pair}", "o": close, "h": close * 1.002, "l": close * 0.998,
+                            "c": close, "v": 1000.0, "vw": close, "t": midnight, "n": 1000})
+        return results
+
+    def bars(self, ticker: str, multiplier: int, timespan: str,
+             start: date, end: date) -> List[Dict[str, Any]]:
+        """Synthetic weekday bars (deterministic random walk per ticker)."""
+        rng = random.Random(ticker)
+        price = 50 + rng.random() * 150
+        step = {"minute": 1, "hour": 60}.get(timespan)
+        bars = []
+        day = start
+        while day <= end:
+            if day.weekday() < 5:
+                midnight = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
+                if step is None:
+                    offsets = [0]
+                else:
+                    offsets = range(SESSION_OPEN_MINUTE, SESSION_OPEN_MINUTE + SESSION_MINUTES, step * multiplier)
+                for minute in offsets:
+                    o = price
+                    price = max(1.0, price * (1 + rng.gauss(0, 0.001)))
+                    bars.append({
+                        "v": float(rng.randint(100, 100000)),
+                        "vw": round((o + price) / 2, 4),
+                        "o": round(o, 4),
+                        "c": round(price, 4),
+                        "h": round(max(o, price) * 1.0005, 4),
+                        "l": round(min(o, price) * 0.9995, 4),
+                        "t": midnight + minute * 60_000,
+                        "n": rng.randint(1, 500),
+                    })
+            day += timedelta(days=1 if timespan != "day" or multiplier == 1 else multiplier)
+        return bars
+
+
+def _page(records: List[Any], query: Dict[str, str], url_path: str, root_url: str,
+          default_limit: int, max_limit: int) -> Dict[str, Any]:
+    """Slice records for a cursor/limit query and add next_url if more remain."""
+    limit = min(int(query.get("limit", default_limit)), max_limit)
+    offset = int(query.get("cursor", 0))
+    page = records[offset:offset + limit]
+    body: Dict[str, Any] = {"status": "OK", "request_id": "mock", "results": page, "count": len(page)}
+    if offset + limit < len(records):
+        next_query = {k: v for k, v in query.items() if k != "apiKey"}
+        next_query["cursor"] = str(offset + limit)
+        body["next_url"] = f"{root_url}{url_path}?{urlencode(next_query)}"
+    return body
+
+
+class _Handler(BaseHTTPRequestHandler):
+    mock: MockMassiveServer
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+
+    def log_message(self, format, *args):  # Keep benchmark output clean
+        pass
+
+    def do_GET(self):
+        mock = self.mock
+        if mock.latency:
+            time.sleep(mock.latency)
+
+        parts = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        api_key = query.get("apiKey", "")
+
+        retry_after = mock.admit(api_key)
+        if retry_after is not None:
+            self._send(429, {"status": "ERROR", "error": "Rate limit exceeded"},
+                       {"Retry-After": str(max(math.ceil(retry_after), 0))})
+            return
+
+        if not api_key or (mock.api_keys is not None and api_key not in mock.api_keys):
+            self._send(401, {"status": "ERROR", "error": "Unknown API Key"})
+            return
+
+        try:
+            status, body = self._route(parts.path, query)
+        except (ValueError, IndexError) as e:
+            status, body = 400, {"status": "ERROR", "error": str(e)}
+        self._send(status, body)
+
+    def _route(self, path: str, query: Dict[str, str]) -> Tuple[int, Any]:
+        mock = self.mock
+        segments = path.strip("/").split("/")
+
+        if path == "/v1/marketstatus/upcoming":
+            return 200, mock.holidays()
+
+        if path == "/v3/reference/tickers":
+            market = query.get("market", "stocks")
+            records = mock.records("tickers", market)
+            search = query.get("search", "").lower()
+            if search:
+                records = [r for r in records if search in r["ticker"].lower() or search in r["name"].lower()]
+            if "active" in query:
+                records = [r for r in records if r["active"] == (query["active"] == "true")]
+            if "sort" in query:
+                records = sorted(records, key=lambda r: r[query["sort"]], reverse=query.get("order") == "desc")
+            return 200, _page(records, query, path, mock.root_url, 100, 1000)
+
+        if path == "/v3/reference/dividends":
+            records = mock.records("dividends")
+            if "ticker" in query:
+                records = [r for r in records if r["ticker"] == query["ticker"]]
+            if "ex_dividend_date.gt" in query:
+                records = [r for r in records if r["ex_dividend_date"] > query["ex_dividend_date.gt"]]
+            if "ex_dividend_date.gte" in query:
+                records = [r for r in records if r["ex_dividend_date"] >= query["ex_dividend_date.gte"]]
+            return 200, _page(records, query, path, mock.root_url, 10, 1000)
+
+        if path == "/v3/reference/splits":
+            records = mock.records("splits")
+            if "ticker" in query:
+                records = [r for r in records if r["ticker"] == query["ticker"]]
+            if "execution_date.gt" in query:
+                records = [r for r in records if r["execution_date"] > query["execution_date.gt"]]
+            return 200, _page(records, query, path, mock.root_url, 10, 1000)
+
+        if len(segments) == 9 and segments[:3] == ["v2", "aggs", "ticker"] and segments[4] == "range":
+            ticker, multiplier, timespan = segments[3], int(segments[5]), segments[6]
+            bars = mock.bars(ticker, multiplier, timespan,
+                             date.fromisoformat(segments[7]), date.fromisoformat(segments[8]))
+            body = _page(bars, query, path, mock.root_url, 5000, AGG_CAP)
+            body.update(ticker=ticker, adjusted=True, queryCount=len(bars),
+                        resultsCount=len(body["results"]))
+            return 200, body
+
+        if len(segments) == 8 and segments[:4] == ["v2", "aggs", "grouped", "locale"]:
+            day = date.fromisoformat(segments[7])
+            if day.weekday() >= 5:
+                return 200, {"status": "OK", "resultsCount": 0, "results": []}
+            if segments[6] == "fx":
+                results = mock.fx_grouped(day)
+                return 200, {"status": "OK", "adjusted": True, "resultsCount": len(results), "results": results}
+            results = []
+            for symbol in mock.tickers:
+                bar = mock.bars(symbol, 1, "day", day, day)[0]
+                bar["T"] = symbol
+                results.append(bar)
+            return 200, {"status": "OK", "adjusted": True, "resultsCount": len(results), "results": results}
+
+        return 404, {"status": "NOT_FOUND", "message": f"Unknown endpoint {path}"}
+
+    def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None):
+        payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        etag = f'"{hashlib.md5(payload).hexdigest()}"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, payload = 304, b""
+
+        self.mock.count_status(status)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if status in (200, 304):
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the mock Massive.com API server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added per response")
+    parser.add_argument("--rate-limit", type=int, help="Calls per window before 429s")
+    parser.add_argument("--rate-window", type=float, default=60.0)
+    parser.add_argument("--fail-429-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockMassiveServer(latency=args.latency, rate_limit=args.rate_limit,
+                               rate_window=args.rate_window, fail_429_rate=args.fail_429_rate,
+                               port=args.port)
+    print(f"Mock Massive API on {server.base_url} (MASSIVE_API_URL={server.base_url})")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
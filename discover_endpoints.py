@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Discover Massive.com API endpoints from the YAML catalog within a call budget."""
+
+import argparse
+import logging
+from src.api_client import MassiveAPIClient
+from src.discovery import DiscoveryEngine, EndpointRegistry, load_catalog
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Probe untested or stale endpoints, then print the registry."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=int, default=5, help="Maximum API calls to spend (default: 5)")
+    parser.add_argument("--category", help="Only probe one category (stocks, forex, crypto, market)")
+    parser.add_argument("--catalog", help="Endpoint catalog YAML (default: config/endpoints.yaml)")
+    parser.add_argument("--registry", help="Registry JSON path (default: in the cache directory)")
+    parser.add_argument("--max-age-days", type=float, default=30, help="Re-probe results older than this")
+    parser.add_argument("--report", action="store_true", help="Only print the registry, no API calls")
+    args = parser.parse_args()
+
+    try:
+        client = MassiveAPIClient()
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        return
+
+    engine = DiscoveryEngine(client, load_catalog(args.catalog), EndpointRegistry(args.registry),
+                             max_age_days=args.max_age_days)
+
+    if not args.report:
+        pending = engine.pending(args.category)
+        logger.info(f"🔍 {len(pending)} endpoint(s) untested or stale; budget {args.budget} call(s)\n")
+        engine.run(budget=args.budget, category=args.category)
+
+    print("\n" + "=" * 70)
+    print("ENDPOINT REGISTRY")
+    print("=" * 70)
+    icons = {"ok": "✅", "forbidden": "🚫", "not_found": "❔", "error": "❌", "untested": "⏳"}
+    for row in engine.report():
+        if args.category and row["category"] != args.category:
+            continue
+        latency = f"{row['latency_ms']:.0f}ms" if row.get("latency_ms") is not None else ""
+        print(f"  {icons.get(row['status'], '?')} {row['name']:<28} {row['status']:<10} {latency:>8}  {row['endpoint']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@
 import sys
 import json
 from src.api_client import MassiveAPIClient
+from src.ticker_index import TickerIndex
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(message)s')
@@ -28,6 +29,7 @@ def main():
     print("MASSIVE.COM API EXPLORER")
     print("=" * 70)
     
+    ticker_index = None  # Loaded on first search
     while True:
         print("\n📊 AVAILABLE OPERATIONS:")
         print("  1. 📅 Get Market Holidays")
@@ -94,13 +96,15 @@ def main():
         elif choice == "4":
             query = input("\nEnter search query (e.g., 'AAPL' or 'apple'): ").strip()
             try:
-                logger.info(f"\n⏳ Searching for '{query}'...")
-                result = client._make_request("/reference/tickers", params={"search": query, "limit": 10})
+                if ticker_index is None:
+                    logger.info("\n⏳ Loading ticker index (downloads the universe on first use)...")
+                    ticker_index = TickerIndex.open(client)
+                results = ticker_index.search(query, limit=10)
                 logger.info(f"✅ Search results:\n")
-                if 'results' in result and result['results']:
-                    for item in result['results']:
-                        print(f"  • {item.get('ticker', 'N/A')}: {item.get('name', 'N/A')}")
-                    logger.info(f"\nFound {result.get('count', len(result['results']))} results")
+                if results:
+                    for item in results:
+                        print(f"  • {item.get('ticker', 'N/A')}: {item.get('name', 'N/A')} ({item.get('market', 'N/A')})")
+                    logger.info(f"\nFound {len(results)} results (searched {len(ticker_index)} tickers locally)")
                 else:
                     logger.warning("No results found")
             except Exception as e:
@@ -114,7 +118,7 @@ def main():
             print(f"API Key: {client.api_key[:10]}...{'*' * 10}")
             print("\n✅ AVAILABLE ENDPOINTS:")
             print("  • GET /reference/dividends?ticker=AAPL - Dividend history")
-            print("  • GET /reference/tickers - Search tickers (with optional 'search' param)")
+            print("  • GET /reference/tickers - Ticker universe (searched locally via TickerIndex)")
             print("  • GET /reference/tickers/{TICKER} - Get specific ticker details")
             print("\n⚠️  RATE LIMIT: 5 calls per minute (handled automatically)")
             print("Note: Use the menu options above to explore these endpoints!")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Stream Massive.com results to NDJSON, CSV or Parquet (resumable).
+
+Examples:
+    python export_data.py pages /reference/tickers -p market=stocks -o data/tickers.ndjson.gz
+    python export_data.py aggs AAPL MSFT --timespan minute --start 2023-01-01 --end 2023-12-31 -o data/bars.csv.gz
+"""
+
+import argparse
+import logging
+from datetime import date
+from src.api_client import MassiveAPIClient
+from src.exporter import FORMATS, Exporter
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Run one export; re-running the same command resumes an interrupted one."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", required=True, help="Output file (.ndjson/.csv[.gz]) or .parquet directory")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (default: from the file name)")
+    parser.add_argument("--compression", help="gzip for NDJSON/CSV; Parquet codec (default snappy)")
+    parser.add_argument("--buffer-rows", type=int, default=10000, help="Rows buffered per write/checkpoint")
+    sources = parser.add_subparsers(dest="source", required=True)
+
+    pages = sources.add_parser("pages", help="Every record of a paginated endpoint")
+    pages.add_argument("endpoint", help="e.g. /reference/tickers")
+    pages.add_argument("-p", "--param", action="append", default=[], help="Query parameter KEY=VALUE")
+
+    aggs = sources.add_parser("aggs", help="Aggregate bars in cap-sized chunks")
+    aggs.add_argument("tickers", nargs="+")
+    aggs.add_argument("--multiplier", type=int, default=1)
+    aggs.add_argument("--timespan", default="day")
+    aggs.add_argument("--start", type=date.fromisoformat, required=True)
+    aggs.add_argument("--end", type=date.fromisoformat, default=date.today())
+    aggs.add_argument("--market", default="stocks", help="stocks, fx or crypto (sets chunk sizes)")
+    aggs.add_argument("--unadjusted", action="store_true", help="Request unadjusted bars")
+    args = parser.parse_args()
+
+    try:
+        client = MassiveAPIClient()
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        return
+
+    exporter = Exporter(client, args.output, fmt=args.format, compression=args.compression,
+                        buffer_rows=args.buffer_rows)
+    if args.source == "pages":
+        params = dict(param.split("=", 1) for param in args.param)
+        exporter.export_pages(args.endpoint, params)
+    else:
+        exporter.export_aggregates(args.tickers, args.multiplier, args.timespan, args.start, args.end,
+                                   adjusted=not args.unadjusted, market=args.market)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,16 @@
 from src.api_client import MassiveAPIClient
 
 client = MassiveAPIClient()
-result = client._make_request('/reference/tickers', params={'market': 'fx', 'limit': 50})
 
 print("\n" + "=" * 70)
 print("MASSIVE.COM FOREX - AVAILABLE CURRENCY PAIRS")
 print("=" * 70 + "\n")
 
-if result.get('results'):
-    print(f"📊 Showing {len(result['results'])} of {result.get('count', '?')} available pairs:\n")
-    for ticker in result['results']:
-        print(f"  • {ticker['ticker']}: {ticker['name']}")
-    
-    if result.get('count', 0) > 50:
-        print(f"\n✅ Total pairs available: {result.get('count')} (pagination available)")
+count = 0
+for ticker in client.iter_results('/reference/tickers', params={'market': 'fx', 'limit': 1000}):
+    print(f"  • {ticker['ticker']}: {ticker['name']}")
+    count += 1
+
+print(f"\n✅ Total pairs available: {count}")
 
 print("\n" + "=" * 70)
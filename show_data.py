@@ -2,6 +2,7 @@
 """Simple Massive.com API data explorer (respects 5 calls/min rate limit)."""
 
 from src.api_client import MassiveAPIClient
+from src.ticker_index import TickerIndex
 import json
 
 def main():
@@ -27,9 +28,10 @@ def main():
     # Test 2: Ticker Search
     print("\n2️⃣  SEARCH TICKERS ('APPLE')")
     print("-" * 70)
-    tickers = client._make_request("/reference/tickers", params={"search": "APPLE", "limit": 5})
-    print(f"✅ Found {len(tickers.get('results', []))} results\n")
-    for ticker in tickers.get('results', [])[:5]:
+    ticker_index = TickerIndex.open(client)  # Local snapshot; refreshed at most daily
+    tickers = ticker_index.search("APPLE", limit=5)
+    print(f"✅ Found {len(tickers)} results\n")
+    for ticker in tickers:
         print(f"  • {ticker.get('ticker')}: {ticker.get('name')}")
     
     # Test 3: Get MSFT dividends
@@ -46,9 +48,9 @@ def main():
     # Test 4: Search NVIDIA
     print("\n4️⃣  SEARCH TICKERS ('NVIDIA')")
     print("-" * 70)
-    nvda = client._make_request("/reference/tickers", params={"search": "NVIDIA", "limit": 5})
-    print(f"✅ Found {len(nvda.get('results', []))} results\n")
-    for ticker in nvda.get('results', [])[:5]:
+    nvda = ticker_index.search("NVIDIA", limit=5)
+    print(f"✅ Found {len(nvda)} results\n")
+    for ticker in nvda:
         print(f"  • {ticker.get('ticker')}: {ticker.get('name')}")
     
     # Test 5: Get TSLA dividends
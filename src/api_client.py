@@ -1,12 +1,40 @@
 """Core Massive.com API client wrapper."""
 
 import os
+import json
 import requests
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Sequence
 from dotenv import load_dotenv
 import logging
+import threading
 import time
 from collections import deque
+from urllib.parse import urlsplit
+
+import numpy as np
+
+try:
+    from .bar_store import BAR_DTYPE
+    from .endpoints import endpoint_template
+    from .fast_decode import body_to_columns, decode_columns
+    from .file_lock import lock_file, unlock_file
+    from .key_pool import KeyPool, key_id
+    from .metrics import CACHE_HIT, CACHE_REVALIDATED, ClientMetrics, RequestEvent
+    from .records import BarSeries, Dividend, Holiday
+    from .response_cache import ResponseCache
+    from .retry import EndpointForbiddenError, EntitlementMap, RetryPolicy
+    from .transport import ReplayTransport, transport_from_env
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from bar_store import BAR_DTYPE
+    from endpoints import endpoint_template
+    from fast_decode import body_to_columns, decode_columns
+    from file_lock import lock_file, unlock_file
+    from key_pool import KeyPool, key_id
+    from metrics import CACHE_HIT, CACHE_REVALIDATED, ClientMetrics, RequestEvent
+    from records import BarSeries, Dividend, Holiday
+    from response_cache import ResponseCache
+    from retry import EndpointForbiddenError, EntitlementMap, RetryPolicy
+    from transport import ReplayTransport, transport_from_env
 
 logger = logging.getLogger(__name__)
 
@@ -14,105 +42,362 @@ logger = logging.getLogger(__name__)
 class RateLimiter:
     """Rate limiter for API calls (5 per minute)."""
     
-    def __init__(self, calls_per_minute: int = 5):
+    def __init__(self, calls_per_minute: int = 5, period: float = 60):
         self.calls_per_minute = calls_per_minute
-        self.min_interval = 60 / calls_per_minute  # 12 seconds per call
+        self.period = period  # Window length in seconds
+        self.min_interval = period / calls_per_minute  # 12 seconds per call
         self.call_times = deque(maxlen=calls_per_minute)
+        # Threads sharing a client (e.g. background refreshes) queue here
+        self._lock = threading.Lock()
     
     def wait_if_needed(self):
         """Wait if necessary to respect rate limit."""
-        if len(self.call_times) < self.calls_per_minute:
-            # Haven't hit limit yet
+        with self._lock:
+            if len(self.call_times) < self.calls_per_minute:
+                # Haven't hit limit yet
+                self.call_times.append(time.time())
+                return
+            
+            # Check if oldest call is outside the window
+            oldest = self.call_times[0]
+            now = time.time()
+            time_since_oldest = now - oldest
+            
+            if time_since_oldest < self.period:
+                wait_time = self.period - time_since_oldest + 0.1
+                logger.info(f"⏳ Rate limit: waiting {wait_time:.1f}s...")
+                time.sleep(wait_time)
+            
             self.call_times.append(time.time())
-            return
-        
-        # Check if oldest call is outside the window
-        oldest = self.call_times[0]
-        now = time.time()
-        time_since_oldest = now - oldest
-        
-        if time_since_oldest < 60:
-            wait_time = 60 - time_since_oldest + 0.1
-            logger.info(f"⏳ Rate limit: waiting {wait_time:.1f}s...")
+
+
+class NullRateLimiter:
+    """Rate limiter that never waits (offline replay, local mocks)."""
+    
+    def wait_if_needed(self):
+        pass
+
+
+class SharedRateLimiter:
+    """Rate limiter whose call window is shared by every process on the host.
+
+    The sliding window of call times lives in a small JSON file guarded by an
+    exclusive file lock, so concurrent scripts and workers draw from one
+    budget instead of each assuming it owns the full 5 calls/min.
+    """
+
+    def __init__(self, path: str, calls_per_minute: int = 5, period: float = 60):
+        """Initialize shared rate limiter.
+
+        Args:
+            path: State file shared by all cooperating processes
+            calls_per_minute: Calls allowed per window
+            period: Window length in seconds
+        """
+        self.path = path
+        self.calls_per_minute = calls_per_minute
+        self.period = period
+        self.min_interval = period / calls_per_minute
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Separate lock file so the state file can be rewritten freely
+        self._lock_path = f"{path}.lock"
+
+    def try_acquire(self) -> float:
+        """Record a call if the window has room.
+
+        Returns:
+            0 if a slot was taken, otherwise seconds to wait before retrying
+        """
+        with open(self._lock_path, "a+") as lock:
+            lock_file(lock)
+            try:
+                now = time.time()
+                call_times = [t for t in self._read_call_times() if now - t < self.period]
+
+                if len(call_times) < self.calls_per_minute:
+                    call_times.append(now)
+                    self._write_call_times(call_times)
+                    return 0
+
+                self._write_call_times(call_times)
+                return self.period - (now - min(call_times)) + 0.1
+            finally:
+                unlock_file(lock)
+
+    def _read_call_times(self) -> List[float]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return []
+
+    def _write_call_times(self, call_times: List[float]):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(call_times, f)
+        os.replace(tmp_path, self.path)
+
+    def wait_if_needed(self):
+        """Wait if necessary to respect the host-wide rate limit."""
+        while True:
+            wait_time = self.try_acquire()
+            if not wait_time:
+                return
+            logger.info(f"⏳ Rate limit (shared): waiting {wait_time:.1f}s...")
             time.sleep(wait_time)
-        
-        self.call_times.append(time.time())
 
 
 class MassiveAPIClient:
     """Wrapper for Massive.com API endpoints."""
 
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 rate_limiter=None, cache: Optional[ResponseCache] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 entitlements: Optional[EntitlementMap] = None,
+                 metrics: Optional[ClientMetrics] = None, transport=None,
+                 api_keys: Optional[Sequence[str]] = None, key_pool: Optional[KeyPool] = None):
         """Initialize API client.
         
         Args:
             api_key: API key (defaults to MASSIVE_API_KEY env var)
             base_url: Base API URL (defaults to MASSIVE_API_URL env var)
+            rate_limiter: Object with ``wait_if_needed()``. Defaults to a
+                SharedRateLimiter when MASSIVE_RATE_LIMIT_FILE is set, else an
+                in-process RateLimiter (5 calls/min). With a key pool the
+                per-key windows apply instead; MASSIVE_RATE_LIMIT_FILE then
+                makes each key's window host-wide (one state file per key)
+            cache: On-disk ResponseCache for GET requests. Defaults to one in
+                MASSIVE_CACHE_DIR when that is set, else no caching
+            retry_policy: Backoff for 429/5xx/connection errors (default 3 retries)
+            entitlements: Persistent map of endpoint families that returned 403
+            metrics: Per-endpoint request metrics and hooks (a fresh one by default)
+            transport: Object with ``request()``/``headers``/``close()`` that
+                performs HTTP calls. Defaults to a pooled HTTPTransport, or a
+                recording/replay transport when MASSIVE_CASSETTE is set
+            api_keys: Several API keys to rotate through (defaults to the
+                comma-separated MASSIVE_API_KEYS env var when ``api_key`` isn't
+                given either). More than one key builds a KeyPool (5 calls/min each)
+            key_pool: Ready-made KeyPool (overrides ``api_keys``)
         """
         load_dotenv("config/massive.env")
         
-        self.api_key = api_key or os.getenv("MASSIVE_API_KEY")
+        self.transport = transport if transport is not None else transport_from_env()
+        replaying = isinstance(self.transport, ReplayTransport)
+        if key_pool is None:
+            keys = list(api_keys or [])
+            if not keys and not api_key:
+                keys = [k.strip() for k in os.getenv("MASSIVE_API_KEYS", "").split(",") if k.strip()]
+            key_pool = KeyPool(keys) if len(set(keys)) > 1 else None
+            api_key = api_key or (keys[0] if keys else None)
+        # Requests draw keys from the pool; api_key is then just its first key
+        self.key_pool = key_pool
+        self.api_key = (key_pool.keys[0] if key_pool is not None else api_key) \
+            or os.getenv("MASSIVE_API_KEY") or ("replay" if replaying else None)
         self.base_url = base_url or os.getenv("MASSIVE_API_URL", "https://api.massive.com/v3")
         
         if not self.api_key:
             raise ValueError("MASSIVE_API_KEY not configured. Set in config/massive.env or pass as argument.")
         
-        self.session = requests.Session()
-        self.rate_limiter = RateLimiter(calls_per_minute=5)
+        # Underlying requests.Session for live transports (None when replaying)
+        self.session = getattr(self.transport, "session", None)
+        # Replayed responses cost no API budget; pooled keys carry their own
+        # windows, shared per key with other processes when a file is set
+        shared_path = os.getenv("MASSIVE_RATE_LIMIT_FILE")
+        if key_pool is not None and shared_path and not replaying:
+            key_pool.share_windows(lambda key: SharedRateLimiter(
+                f"{shared_path}.{key_id(key)}", key_pool.calls_per_minute, key_pool.period))
+        if rate_limiter is None:
+            if replaying or key_pool is not None:
+                rate_limiter = NullRateLimiter()
+            else:
+                rate_limiter = self._default_rate_limiter()
+        self.rate_limiter = rate_limiter
+        cache_dir = os.getenv("MASSIVE_CACHE_DIR")
+        self.cache = cache if cache is not None else (ResponseCache(cache_dir) if cache_dir else None)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.entitlements = entitlements if entitlements is not None else EntitlementMap()
+        self.metrics = metrics if metrics is not None else ClientMetrics()
         self._setup_headers()
     
+    @staticmethod
+    def _default_rate_limiter():
+        """Build the limiter used when none is passed in."""
+        shared_path = os.getenv("MASSIVE_RATE_LIMIT_FILE")
+        if shared_path:
+            return SharedRateLimiter(shared_path, calls_per_minute=5)
+        return RateLimiter(calls_per_minute=5)
+    
     def _setup_headers(self):
         """Configure default headers for API requests."""
-        self.session.headers.update({
+        self.transport.headers.update({
             "User-Agent": "ExploreMassiveAPI/0.1.0",
             "Accept": "application/json"
         })
     
     def _make_request(self, endpoint: str, method: str = "GET", 
                      params: Optional[Dict[str, Any]] = None,
-                     data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                     data: Optional[Dict[str, Any]] = None,
+                     columns: Optional[np.dtype] = None, use_cache: bool = True) -> Dict[str, Any]:
         """Make HTTP request to API endpoint.
         
         Args:
-            endpoint: API endpoint (e.g., "/reference/holidays" or "/v2/last/trade/AAPL")
+            endpoint: API endpoint (e.g., "/reference/holidays" or "/v2/last/trade/AAPL"),
+                or an absolute URL such as a pagination ``next_url``
             method: HTTP method
             params: Query parameters
             data: Request body data
+            columns: Structured dtype (e.g. BAR_DTYPE, TRADE_DTYPE). When given,
+                ``results`` is decoded straight into an array of it instead of
+                a list of dicts (see fast_decode)
+            use_cache: Read and write the response cache (False for callers
+                that need the live answer, e.g. incremental refreshes)
             
         Returns:
             Response JSON
         """
-        # Respect rate limit
-        self.rate_limiter.wait_if_needed()
-        
+        params = dict(params or {})
+        url = self._resolve_url(endpoint)
+        event = self.metrics.start(endpoint, method, params, template=endpoint_template(url))
+        started = time.perf_counter()
+        try:
+            return self._send(event, url, endpoint, method, params, data, columns, use_cache)
+        except Exception as e:
+            event.error = e.__class__.__name__
+            raise
+        finally:
+            event.latency = time.perf_counter() - started
+            self.metrics.finish(event)
+    
+    def _resolve_url(self, endpoint: str) -> str:
+        """Full URL for an endpoint path or absolute URL."""
         # If endpoint already contains a version (v1, v2, v3), use it with base domain
+        if endpoint.startswith(("http://", "https://")):
+            return endpoint
         if endpoint.startswith('/v'):
             base = self.base_url.replace('/v3', '')  # Remove v3 from base
-            url = f"{base}{endpoint}"
-        else:
-            url = f"{self.base_url}{endpoint}"
+            return f"{base}{endpoint}"
+        return f"{self.base_url}{endpoint}"
+    
+    def _send(self, event: RequestEvent, url: str, endpoint: str, method: str,
+              params: Dict[str, Any], data: Optional[Dict[str, Any]],
+              columns: Optional[np.dtype] = None, use_cache: bool = True) -> Dict[str, Any]:
+        """Cache, entitlement, retry and decode steps of ``_make_request``."""
+        # Serve from the response cache without spending rate-limit budget
+        cached = None
+        headers = {}
+        cacheable = self.cache is not None and method == "GET" and use_cache
+        # Clients pointed at different servers (mock, proxy, live) must not share entries
+        split = urlsplit(url)
+        host = f"{split.scheme}://{split.netloc}"
+        if cacheable:
+            cached = self.cache.lookup(endpoint, params, host)
+            if cached is not None:
+                if cached.fresh:
+                    event.cache = CACHE_HIT
+                    return self._cached_body(cached, columns)
+                if cached.etag:
+                    headers["If-None-Match"] = cached.etag
         
-        # Add API key to params
-        if params is None:
-            params = {}
-        params["apiKey"] = self.api_key
+        # Known-forbidden endpoint families fail locally without spending budget
+        self.entitlements.check(endpoint)
+        
+        # API key is added per attempt (cache keys are built without it)
+        request_params = dict(params)
+        
+        attempt = 0
+        while True:
+            # Respect rate limit (every attempt spends budget)
+            waited = time.perf_counter()
+            self.rate_limiter.wait_if_needed()
+            key = self.key_pool.acquire(event.template) if self.key_pool is not None else self.api_key
+            request_params["apiKey"] = key
+            sent = time.perf_counter()
+            event.wait += sent - waited
+            event.attempts += 1
+            
+            try:
+                response = self.transport.request(method, url, params=request_params, json=data,
+                                                  headers=headers)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                event.network += time.perf_counter() - sent
+                if not self.retry_policy.should_retry(None, attempt):
+                    logger.error(f"API request failed: {e}")
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                logger.warning(f"🔁 {e.__class__.__name__}; retrying in {delay:.1f}s "
+                               f"(attempt {attempt + 1}/{self.retry_policy.max_retries})")
+                time.sleep(delay)
+                event.backoff += delay
+                attempt += 1
+                continue
+            event.network += time.perf_counter() - sent
+            event.status = response.status_code
+            event.bytes += len(response.content)
+            
+            if response.status_code == 304 and cached is not None:
+                self.cache.revalidated(cached, endpoint)
+                event.cache = CACHE_REVALIDATED
+                return self._cached_body(cached, columns)
+            if self.key_pool is not None and response.status_code in (401, 403, 429):
+                retry_after = response.headers.get("Retry-After")
+                cooldown = self.retry_policy.delay(attempt, retry_after) if retry_after else None
+                self.key_pool.report(key, response.status_code, event.template, cooldown)
+                if response.status_code == 429 and self.retry_policy.should_retry(429, attempt):
+                    # The pool waits for the soonest key instead of sleeping here
+                    logger.warning(f"🔁 HTTP 429; switching key "
+                                   f"(attempt {attempt + 1}/{self.retry_policy.max_retries})")
+                    attempt += 1
+                    continue
+                if response.status_code != 429 and self.key_pool.has_key_for(event.template):
+                    continue  # Key-specific rejection; another key may be entitled
+            if response.status_code == 403:
+                self.entitlements.record_forbidden(endpoint)
+            if self.retry_policy.should_retry(response.status_code, attempt):
+                delay = self.retry_policy.delay(attempt, response.headers.get("Retry-After"))
+                logger.warning(f"🔁 HTTP {response.status_code}; retrying in {delay:.1f}s "
+                               f"(attempt {attempt + 1}/{self.retry_policy.max_retries})")
+                time.sleep(delay)
+                event.backoff += delay
+                attempt += 1
+                continue
+            break
         
         try:
-            response = self.session.request(method, url, params=params, json=data)
             response.raise_for_status()
-            return response.json()
+            decode_started = time.perf_counter()
+            body = response.json() if columns is None else decode_columns(response.content, columns)
+            event.decode = time.perf_counter() - decode_started
         except requests.exceptions.RequestException as e:
             logger.error(f"API request failed: {e}")
             raise
+        
+        if cacheable:
+            # Columnar requests cache the API's own bytes: plain-JSON callers
+            # share the entry, and the columnar form drops fields outside the dtype
+            self.cache.store(endpoint, params, body if columns is None else None,
+                             etag=response.headers.get("ETag"),
+                             raw=None if columns is None else response.content, host=host)
+        return body
+    
+    @staticmethod
+    def _cached_body(cached, columns: Optional[np.dtype]) -> Dict[str, Any]:
+        """A cache entry in the form the caller asked for."""
+        if columns is None:
+            return cached.body
+        if cached.raw is not None:
+            return decode_columns(cached.raw, columns)
+        return body_to_columns(cached.body, columns)
     
-    def get_market_holidays(self) -> List[Dict[str, Any]]:
+    def get_market_holidays(self) -> List[Holiday]:
         """Fetch upcoming market holidays and their trading status.
         
         This endpoint returns TRADING market closures and early closes, not all holidays.
         Filters include: Thanksgiving, Christmas, Independence Day, etc.
         
         Returns:
-            List of market holiday dictionaries with structure:
+            List of Holiday records. Dict access gives the API structure:
             {
                 "date": "2020-11-26",
                 "exchange": "NYSE",
@@ -121,30 +406,105 @@ class MassiveAPIClient:
                 "open": "2020-11-27T14:30:00.000Z" (if early-close),
                 "close": "2020-11-27T18:00:00.000Z" (if early-close)
             }
+            Attributes are typed (``date`` is a date, ``open``/``close`` Unix ms).
         """
         # Note: This endpoint is at /v1/, not /v3/
-        url = f"{self.base_url.replace('/v3', '/v1')}/marketstatus/upcoming"
-        params = {"apiKey": self.api_key}
-        
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            return response.json() if isinstance(response.json(), list) else response.json().get("results", [])
-        except Exception as e:
-            logger.error(f"API request failed: {e}")
-            raise
+        response = self._make_request("/v1/marketstatus/upcoming")
+        holidays = response if isinstance(response, list) else response.get("results", [])
+        return Holiday.from_list(holidays)
     
-    def get_dividends(self, ticker: str) -> List[Dict[str, Any]]:
+    def get_dividends(self, ticker: str) -> List[Dividend]:
         """Fetch dividend history for a ticker.
         
         Args:
             ticker: Stock ticker symbol
             
         Returns:
-            List of dividend records
+            List of Dividend records (dates parsed; dict access still works)
         """
         response = self._make_request("/reference/dividends", params={"ticker": ticker})
-        return response.get("results", [])
+        return Dividend.from_list(response.get("results", []))
+    
+    def iter_results(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                     max_items: Optional[int] = None,
+                     max_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield ``results`` records one at a time across all pages.
+        
+        Follows ``next_url`` lazily, so only one page is held in memory and
+        no further calls are made once the caller stops iterating. Every
+        page goes through ``_make_request`` (rate limiter and cache).
+        
+        Args:
+            endpoint: API endpoint for the first page
+            params: Query parameters for the first page (``next_url`` carries its own)
+            max_items: Stop after this many records
+            max_pages: Stop after this many pages
+            
+        Yields:
+            Result records
+        """
+        if max_items is not None and max_items <= 0:
+            return
+        
+        page = self._make_request(endpoint, params=params)
+        pages = 1
+        items = 0
+        while True:
+            results = page.get("results") or []
+            if isinstance(results, dict):
+                results = [results]
+            for record in results:
+                yield record
+                items += 1
+                if max_items is not None and items >= max_items:
+                    return
+            
+            next_url = page.get("next_url")
+            if not next_url or (max_pages is not None and pages >= max_pages):
+                return
+            page = self._make_request(next_url)
+            pages += 1
+    
+    def get_aggregates(self, ticker: str, multiplier: int, timespan: str,
+                       from_date: str, to_date: str, adjusted: bool = True,
+                       limit: int = 50000, as_array: bool = False):
+        """Fetch aggregate bars for a ticker over a date range.
+        
+        Follows ``next_url`` if the server truncates the range.
+        
+        Args:
+            ticker: Ticker symbol (e.g., "AAPL", "C:EURUSD", "X:BTCUSD")
+            multiplier: Size of the timespan multiplier
+            timespan: minute, hour, day, week, month, quarter or year
+            from_date: Range start (YYYY-MM-DD or Unix ms)
+            to_date: Range end (YYYY-MM-DD or Unix ms)
+            adjusted: Whether results are adjusted for splits
+            limit: Maximum base aggregates per page (server cap is 50000)
+            as_array: Decode into a BAR_DTYPE array without per-bar dicts
+            
+        Returns:
+            BarSeries of bars with every field the API returned (``array``
+            holds the BAR_DTYPE columns), or only the BAR_DTYPE array when
+            ``as_array`` is True
+        """
+        endpoint = f"/v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{from_date}/{to_date}"
+        params = {"adjusted": str(adjusted).lower(), "sort": "asc", "limit": limit}
+        if not as_array:
+            # Pages are folded into arrays as they arrive; only fields the
+            # array can't hold are kept per bar
+            page = self._make_request(endpoint, params=params)
+            series = [BarSeries.from_list(page.get("results") or [])]
+            while page.get("next_url"):
+                page = self._make_request(page["next_url"])
+                series.append(BarSeries.from_list(page.get("results") or []))
+            return BarSeries.concat(series)
+        
+        page = self._make_request(endpoint, params=params, columns=BAR_DTYPE)
+        parts = [page["results"]]
+        while page.get("next_url"):
+            page = self._make_request(page["next_url"], columns=BAR_DTYPE)
+            parts.append(page["results"])
+        return np.concatenate(parts)
     
     def list_endpoints(self) -> List[str]:
         """List available endpoints discovered so far.
@@ -159,8 +519,12 @@ class MassiveAPIClient:
             # Add more as discovered
         ]
     
+    def close(self):
+        """Close the transport (saves the cassette when recording)."""
+        self.transport.close()
+    
     def __enter__(self):
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.session.close()
+        self.close()
@@ -0,0 +1,169 @@
+"""Asyncio Massive.com API client wrapper built on aiohttp."""
+
+import asyncio
+import os
+import time
+import logging
+from collections import deque
+from typing import Dict, List, Any, Optional
+
+import aiohttp
+from dotenv import load_dotenv
+
+try:
+    from .records import Dividend, Holiday
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from records import Dividend, Holiday
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRateLimiter:
+    """Awaitable rate limiter for API calls (5 per minute).
+
+    Same sliding-window contract as ``RateLimiter`` but sleeps with
+    ``asyncio.sleep`` so the event loop keeps running. Waiters are served
+    in arrival order through an ``asyncio.Lock``.
+    """
+
+    def __init__(self, calls_per_minute: int = 5):
+        self.calls_per_minute = calls_per_minute
+        self.min_interval = 60 / calls_per_minute  # 12 seconds per call
+        self.call_times = deque(maxlen=calls_per_minute)
+        self._lock = asyncio.Lock()
+
+    async def wait_if_needed(self):
+        """Wait if necessary to respect rate limit."""
+        async with self._lock:
+            if len(self.call_times) < self.calls_per_minute:
+                # Haven't hit limit yet
+                self.call_times.append(time.time())
+                return
+
+            # Check if oldest call is outside the window
+            oldest = self.call_times[0]
+            now = time.time()
+            time_since_oldest = now - oldest
+
+            if time_since_oldest < 60:
+                wait_time = 60 - time_since_oldest + 0.1
+                logger.info(f"⏳ Rate limit: waiting {wait_time:.1f}s...")
+                await asyncio.sleep(wait_time)
+
+            self.call_times.append(time.time())
+
+
+class AsyncMassiveAPIClient:
+    """Asyncio wrapper for Massive.com API endpoints.
+
+    All coroutines share one ``aiohttp.ClientSession`` (and its connection
+    pool) and one ``AsyncRateLimiter``, so any number of tasks can queue
+    requests without exceeding the plan's call budget.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 rate_limiter: Optional[AsyncRateLimiter] = None,
+                 max_connections: int = 10):
+        """Initialize async API client.
+
+        Args:
+            api_key: API key (defaults to MASSIVE_API_KEY env var)
+            base_url: Base API URL (defaults to MASSIVE_API_URL env var)
+            rate_limiter: Limiter shared by all requests (defaults to 5 calls/min)
+            max_connections: Size of the shared connection pool
+        """
+        load_dotenv("config/massive.env")
+
+        self.api_key = api_key or os.getenv("MASSIVE_API_KEY")
+        self.base_url = base_url or os.getenv("MASSIVE_API_URL", "https://api.massive.com/v3")
+
+        if not self.api_key:
+            raise ValueError("MASSIVE_API_KEY not configured. Set in config/massive.env or pass as argument.")
+
+        self.rate_limiter = rate_limiter or AsyncRateLimiter(calls_per_minute=5)
+        self.max_connections = max_connections
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                headers={
+                    "User-Agent": "ExploreMassiveAPI/0.1.0",
+                    "Accept": "application/json"
+                }
+            )
+        return self._session
+
+    async def _make_request(self, endpoint: str, method: str = "GET",
+                            params: Optional[Dict[str, Any]] = None,
+                            data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Make HTTP request to API endpoint.
+
+        Args:
+            endpoint: API endpoint (e.g., "/reference/holidays" or "/v2/last/trade/AAPL")
+            method: HTTP method
+            params: Query parameters
+            data: Request body data
+
+        Returns:
+            Response JSON
+        """
+        # Respect rate limit
+        await self.rate_limiter.wait_if_needed()
+
+        # If endpoint already contains a version (v1, v2, v3), use it with base domain
+        if endpoint.startswith('/v'):
+            base = self.base_url.replace('/v3', '')  # Remove v3 from base
+            url = f"{base}{endpoint}"
+        else:
+            url = f"{self.base_url}{endpoint}"
+
+        # Add API key to params
+        params = dict(params or {})
+        params["apiKey"] = self.api_key
+
+        session = self._get_session()
+        try:
+            async with session.request(method, url, params=params, json=data) as response:
+                response.raise_for_status()
+                return await response.json()
+        except aiohttp.ClientError as e:
+            logger.error(f"API request failed: {e}")
+            raise
+
+    async def get_market_holidays(self) -> List[Holiday]:
+        """Fetch upcoming market holidays and their trading status.
+
+        See ``MassiveAPIClient.get_market_holidays`` for the record structure.
+
+        Returns:
+            List of Holiday records
+        """
+        response = await self._make_request("/v1/marketstatus/upcoming")
+        holidays = response if isinstance(response, list) else response.get("results", [])
+        return Holiday.from_list(holidays)
+
+    async def get_dividends(self, ticker: str) -> List[Dividend]:
+        """Fetch dividend history for a ticker.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            List of Dividend records
+        """
+        response = await self._make_request("/reference/dividends", params={"ticker": ticker})
+        return Dividend.from_list(response.get("results", []))
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,179 @@
+"""Daily bar backfill choosing grouped-daily or per-ticker range calls."""
+
+import hashlib
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Any, Iterable, Optional
+
+try:
+    from .bar_store import BarStore, bars_to_array, series_name
+    from .range_planner import RangePlanner
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from bar_store import BarStore, bars_to_array, series_name
+    from range_planner import RangePlanner
+
+logger = logging.getLogger(__name__)
+
+# Whole-market daily bars for one date per call
+GROUPED_ENDPOINTS = {
+    "stocks": "/v2/aggs/grouped/locale/us/market/stocks/{date}",
+    "fx": "/v2/aggs/grouped/locale/global/market/fx/{date}",
+    "crypto": "/v2/aggs/grouped/locale/global/market/crypto/{date}",
+}
+
+GROUPED = "grouped"
+PER_TICKER = "per_ticker"
+
+
+class DailyBackfill:
+    """Backfills daily bars for a ticker universe into a BarStore.
+
+    Two strategies cost very different numbers of calls:
+
+    - grouped: one ``/v2/aggs/grouped/...`` call per trading day, covering
+      every ticker in the market
+    - per_ticker: ``/v2/aggs/ticker/{T}/range/1/day/...`` per ticker (one
+      call covers decades of daily bars)
+
+    ``run`` picks whichever needs fewer calls unless told otherwise.
+    """
+
+    def __init__(self, client, store: BarStore, market: str = "stocks",
+                 calendar=None, flush_days: int = 20):
+        """Initialize daily backfill.
+
+        Args:
+            client: MassiveAPIClient
+            store: Destination bar store (series "day", or "day_unadjusted"
+                for ``adjusted=False`` runs)
+            market: stocks, fx or crypto
+            calendar: Object with ``is_trading_day(date)``; see RangePlanner
+            flush_days: Grouped days buffered in memory before writing
+        """
+        if market not in GROUPED_ENDPOINTS:
+            raise ValueError(f"Unknown market '{market}'. Use one of {sorted(GROUPED_ENDPOINTS)}")
+        self.client = client
+        self.store = store
+        self.market = market
+        self.planner = RangePlanner(client, calendar=calendar, market=market)
+        self.flush_days = flush_days
+
+    def trading_days(self, start: date, end: date) -> List[date]:
+        """Trading days in ``start..end`` (inclusive)."""
+        days = []
+        day = start
+        while day <= end:
+            if self.planner.is_trading_day(day):
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def estimate_calls(self, universe: List[str], start: date, end: date) -> Dict[str, int]:
+        """Number of API calls each strategy needs."""
+        return {
+            GROUPED: len(self.trading_days(start, end)),
+            PER_TICKER: len(universe) * len(self.planner.plan(start, end, "day")),
+        }
+
+    def choose_mode(self, universe: List[str], start: date, end: date) -> str:
+        """Return the strategy with fewer calls (grouped wins ties)."""
+        calls = self.estimate_calls(universe, start, end)
+        return GROUPED if calls[GROUPED] <= calls[PER_TICKER] else PER_TICKER
+
+    def run(self, universe: Iterable[str], start: date, end: date,
+            mode: Optional[str] = None, adjusted: bool = True,
+            resume: bool = True) -> Dict[str, int]:
+        """Backfill daily bars for ``universe`` over ``start..end``.
+
+        Args:
+            universe: Tickers to keep (as they appear in the API, e.g. "C:EURUSD")
+            start: First date
+            end: Last date
+            mode: "grouped" or "per_ticker" (default: fewest calls)
+            adjusted: Request split-adjusted bars
+            resume: Grouped mode skips days a previous run over the same
+                universe (and ``adjusted``) already completed
+
+        Returns:
+            Bars written per ticker
+        """
+        universe = sorted(set(universe))
+        mode = mode or self.choose_mode(universe, start, end)
+        calls = self.estimate_calls(universe, start, end)
+        logger.info(f"Backfilling {len(universe)} {self.market} tickers {start}..{end} "
+                    f"via {mode} ({calls[mode]} calls; other mode {max(calls.values())})")
+
+        if mode == GROUPED:
+            return self._run_grouped(universe, start, end, adjusted, resume)
+        if mode == PER_TICKER:
+            return self._run_per_ticker(universe, start, end, adjusted)
+        raise ValueError(f"Unknown mode '{mode}'")
+
+    def _run_per_ticker(self, universe: List[str], start: date, end: date,
+                        adjusted: bool) -> Dict[str, int]:
+        written = {}
+        series = series_name("day", adjusted=adjusted)
+        for ticker in universe:
+            before = self.store.count(ticker, series)
+            self.planner.fetch(ticker, start, end, "day", store=self.store, adjusted=adjusted)
+            written[ticker] = self.store.count(ticker, series) - before
+        return written
+
+    def _checkpoint_path(self, universe: List[str], adjusted: bool) -> str:
+        key = "\n".join(universe + [f"adjusted={adjusted}"])
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.store.root, f".backfill-{self.market}-{digest}.json")
+
+    def _run_grouped(self, universe: List[str], start: date, end: date,
+                     adjusted: bool, resume: bool) -> Dict[str, int]:
+        checkpoint = self._checkpoint_path(universe, adjusted)
+        days = self.trading_days(start, end)
+        done = set()
+        if resume and os.path.exists(checkpoint):
+            with open(checkpoint, "r") as f:
+                done = set(json.load(f).get("done_days", []))
+            days = [d for d in days if d.isoformat() not in done]
+            logger.info(f"Resuming grouped backfill: {len(days)} day(s) of {start}..{end} left")
+
+        wanted = set(universe)
+        series = series_name("day", adjusted=adjusted)
+        written: Dict[str, int] = defaultdict(int)
+        pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        buffered = 0
+        # Today's snapshot may still be partial, so today is never marked complete
+        last_complete = datetime.now(timezone.utc).date() - timedelta(days=1)
+        covered_from = start
+
+        for i, day in enumerate(days):
+            endpoint = GROUPED_ENDPOINTS[self.market].format(date=day.isoformat())
+            response = self.client._make_request(endpoint, params={"adjusted": str(adjusted).lower()})
+            # Pivot the market-wide snapshot into per-ticker series
+            for bar in response.get("results") or []:
+                ticker = bar.get("T")
+                if ticker in wanted:
+                    pending[ticker].append(bar)
+            buffered += 1
+            if day <= last_complete:
+                done.add(day.isoformat())
+
+            if buffered >= self.flush_days or i == len(days) - 1:
+                for ticker, bars in pending.items():
+                    written[ticker] += self.store.append(ticker, series, bars_to_array(bars))
+                pending.clear()
+                buffered = 0
+                # Every trading day up to here is now stored (fetched or already
+                # done), so range fetches of these tickers can skip it
+                covered_to = min(end if i == len(days) - 1 else day, last_complete)
+                if covered_from <= covered_to:
+                    for ticker in universe:
+                        self.store.add_coverage(ticker, series, covered_from, covered_to)
+                covered_from = max(covered_from, covered_to + timedelta(days=1))
+                # Completed days, not a high-water mark, so older ranges aren't skipped
+                with open(f"{checkpoint}.tmp", "w") as f:
+                    json.dump({"done_days": sorted(done)}, f)
+                os.replace(f"{checkpoint}.tmp", checkpoint)
+
+        return dict(written)
@@ -0,0 +1,262 @@
+"""Local store for aggregate (OHLCV) bars: fixed-width records in memory-mapped files."""
+
+import json
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Iterable, Tuple, Union
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BAR_DIR = os.path.join(os.path.expanduser("~"), ".cache", "explore-massive", "bars")
+
+# One fixed-width record per bar, field names as returned by /v2/aggs
+BAR_DTYPE = np.dtype([
+    ("t", "<i8"),   # Bar start, Unix ms (UTC)
+    ("o", "<f8"),
+    ("h", "<f8"),
+    ("l", "<f8"),
+    ("c", "<f8"),
+    ("v", "<f8"),
+    ("vw", "<f8"),  # NaN when the API omits it
+    ("n", "<i8"),   # Number of trades, 0 when omitted
+])
+
+TimeBound = Union[int, date, datetime, str, None]
+
+# Suffix of series holding unadjusted (``adjusted=false``) bars
+UNADJUSTED_SUFFIX = "_unadjusted"
+
+
+def bars_to_array(bars: Union[np.ndarray, Iterable[Dict[str, Any]]]) -> np.ndarray:
+    """Convert aggregate ``results`` records to a BAR_DTYPE array.
+
+    Args:
+        bars: List of bar dicts from the API, or an array (or array-like such
+            as BarSeries) with BAR_DTYPE fields
+
+    Returns:
+        Structured array with dtype BAR_DTYPE
+    """
+    if not isinstance(bars, np.ndarray) and hasattr(bars, "__array__"):
+        bars = np.asarray(bars)  # e.g. records.BarSeries
+    if isinstance(bars, np.ndarray):
+        if bars.dtype == BAR_DTYPE:
+            return bars
+        out = np.zeros(len(bars), dtype=BAR_DTYPE)
+        out["vw"] = np.nan
+        for name in BAR_DTYPE.names:
+            if bars.dtype.names and name in bars.dtype.names:
+                out[name] = bars[name]
+        return out
+
+    bars = list(bars)
+    out = np.empty(len(bars), dtype=BAR_DTYPE)
+    for name in BAR_DTYPE.names:
+        default = 0 if name == "n" else np.nan
+        out[name] = [bar.get(name, default) for bar in bars]
+    return out
+
+
+def series_name(timespan: str, multiplier: int = 1, adjusted: bool = True) -> str:
+    """Series name for a multiplier/timespan pair, e.g. "day", "5minute" or "day_unadjusted".
+
+    Split-adjusted and raw bars of the same ticker are kept in separate
+    series, since the API returns different prices for them.
+    """
+    name = timespan if multiplier == 1 else f"{multiplier}{timespan}"
+    return name if adjusted else f"{name}{UNADJUSTED_SUFFIX}"
+
+
+def to_epoch_ms(value: TimeBound, end: bool = False) -> Optional[int]:
+    """Convert a time bound to Unix milliseconds (UTC).
+
+    Plain dates (and ISO date strings) cover the whole day: the start of the
+    day when ``end`` is False, the last millisecond of it when True.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value) if "T" in value else date.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    start = int(datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp() * 1000)
+    return start + 86_400_000 - 1 if end else start
+
+
+class BarStore:
+    """Per-ticker/timespan bar files read through ``np.memmap``.
+
+    Each series is a flat file of BAR_DTYPE records sorted by ``t``. Bars
+    newer than the stored tail are appended in place; older or interleaved
+    bars (e.g. backfilling earlier history) are merged and the file is
+    rewritten. Reads map the file and slice it with a binary search on
+    ``t``, so years of minute bars are returned as a zero-copy view without
+    loading or re-parsing anything. A single writer per series is assumed.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        """Initialize bar store.
+
+        Args:
+            root: Directory holding the bar files (defaults to ~/.cache/explore-massive/bars)
+        """
+        self.root = os.path.expanduser(root or DEFAULT_BAR_DIR)
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def _safe_name(value: str) -> str:
+        # Crypto/fx tickers contain ":" (X:BTCUSD), which Windows rejects.
+        # Percent-encoding is reversible, so X:BTCUSD and X_BTCUSD stay apart.
+        name = quote(value, safe="-_.")
+        return "%2E" + name[1:] if name.startswith(".") else name  # Never "." or ".."
+
+    def _path(self, ticker: str, timespan: str) -> str:
+        return os.path.join(self.root, self._safe_name(ticker), f"{self._safe_name(timespan)}.bars")
+
+    def _map(self, ticker: str, timespan: str) -> np.ndarray:
+        """Memory-map a series read-only (empty array if it doesn't exist)."""
+        path = self._path(ticker, timespan)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return np.empty(0, dtype=BAR_DTYPE)
+
+        count = size // BAR_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        # Ignore a torn trailing record left by an interrupted append
+        return np.memmap(path, dtype=BAR_DTYPE, mode="r", shape=(count,))
+
+    def append(self, ticker: str, timespan: str,
+               bars: Union[np.ndarray, Iterable[Dict[str, Any]]]) -> int:
+        """Add bars not already stored (stored bars win on equal ``t``).
+
+        Bars newer than the stored tail are appended in place; if any are
+        older (backfilled history or a gap), the series is merged and
+        rewritten atomically.
+
+        Args:
+            ticker: Ticker symbol
+            timespan: Series name, e.g. "minute", "day" or "5minute"
+            bars: API ``results`` records or a BAR_DTYPE array
+
+        Returns:
+            Number of bars written
+        """
+        new = bars_to_array(bars)
+        if len(new) == 0:
+            return 0
+        if np.any(new["t"][1:] < new["t"][:-1]):
+            new = np.sort(new, order="t", kind="stable")
+        # Drop duplicates within the batch, then anything already stored
+        keep = np.ones(len(new), dtype=bool)
+        keep[1:] = new["t"][1:] != new["t"][:-1]
+        new = new[keep]
+
+        path = self._path(ticker, timespan)
+        stored = self._map(ticker, timespan)
+        if len(stored) and new["t"][0] <= stored["t"][-1]:
+            return self._merge(path, stored, new)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "ab") as f:
+            size = f.tell()
+            torn = size % BAR_DTYPE.itemsize
+            if torn:
+                logger.warning(f"Truncating {torn} torn bytes at end of {path}")
+                f.truncate(size - torn)
+                f.seek(size - torn)
+            f.write(new.tobytes())
+        return len(new)
+
+    def _merge(self, path: str, stored: np.ndarray, new: np.ndarray) -> int:
+        """Rewrite a series with ``new`` bars merged in by ``t``."""
+        new = new[~np.isin(new["t"], stored["t"])]
+        if len(new) == 0:
+            return 0
+        merged = np.concatenate([np.array(stored), new])
+        merged = merged[np.argsort(merged["t"], kind="stable")]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(merged.tobytes())
+        os.replace(tmp_path, path)
+        return len(new)
+
+    def read(self, ticker: str, timespan: str, start: TimeBound = None,
+             end: TimeBound = None) -> np.ndarray:
+        """Return bars with ``start <= t <= end`` as a read-only memmap view.
+
+        Args:
+            ticker: Ticker symbol
+            timespan: Series name
+            start: Inclusive lower bound (ms, date, datetime or ISO string)
+            end: Inclusive upper bound (dates include the whole day)
+
+        Returns:
+            BAR_DTYPE array view; copy it if it must outlive file changes
+        """
+        bars = self._map(ticker, timespan)
+        if len(bars) == 0:
+            return bars
+
+        t = bars["t"]
+        lo = 0 if start is None else int(np.searchsorted(t, to_epoch_ms(start), side="left"))
+        hi = len(bars) if end is None else int(np.searchsorted(t, to_epoch_ms(end, end=True), side="right"))
+        return bars[lo:hi]
+
+    def last_timestamp(self, ticker: str, timespan: str) -> Optional[int]:
+        """Return ``t`` of the newest stored bar, or None if the series is empty."""
+        bars = self._map(ticker, timespan)
+        return int(bars["t"][-1]) if len(bars) else None
+
+    def count(self, ticker: str, timespan: str) -> int:
+        """Return the number of stored bars."""
+        return len(self._map(ticker, timespan))
+
+    def first_timestamp(self, ticker: str, timespan: str) -> Optional[int]:
+        """Return ``t`` of the oldest stored bar, or None if the series is empty."""
+        bars = self._map(ticker, timespan)
+        return int(bars["t"][0]) if len(bars) else None
+
+    def _coverage_path(self, ticker: str, timespan: str) -> str:
+        return f"{self._path(ticker, timespan)[:-len('.bars')]}.coverage.json"
+
+    def coverage(self, ticker: str, timespan: str) -> List[Tuple[date, date]]:
+        """Date ranges recorded as completely fetched, oldest first (see ``add_coverage``)."""
+        try:
+            with open(self._coverage_path(ticker, timespan), "r") as f:
+                return [(date.fromisoformat(a), date.fromisoformat(b)) for a, b in json.load(f)]
+        except FileNotFoundError:
+            return []
+
+    def add_coverage(self, ticker: str, timespan: str, start: date, end: date):
+        """Record that every bar in ``start..end`` is stored (even if there were none).
+
+        Overlapping and adjacent ranges are merged.
+        """
+        merged: List[List[date]] = []
+        for range_start, range_end in sorted(self.coverage(ticker, timespan) + [(start, end)]):
+            if merged and range_start <= merged[-1][1] + timedelta(days=1):
+                merged[-1][1] = max(merged[-1][1], range_end)
+            else:
+                merged.append([range_start, range_end])
+        path = self._coverage_path(ticker, timespan)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump([[a.isoformat(), b.isoformat()] for a, b in merged], f)
+        os.replace(f"{path}.tmp", path)
+
+    def tickers(self) -> List[str]:
+        """Return the tickers with stored series."""
+        return sorted(
+            unquote(name) for name in os.listdir(self.root)
+            if os.path.isdir(os.path.join(self.root, name))
+        )
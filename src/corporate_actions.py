@@ -0,0 +1,353 @@
+"""Local split/dividend adjustment of stored bars.
+
+Keeps a SQLite table of splits (next to the dividends kept by
+``DividendSync``) and turns both into cumulative adjustment factors, so raw
+bars from BarStore can be adjusted on read instead of re-downloading whole
+histories with ``adjusted=true`` after every corporate action.
+
+For each event at time ``T`` (midnight New York time of the execution or
+ex-dividend date, so the previous day's post-market bars are included),
+bars with ``t < T`` are scaled:
+
+- split ``split_from -> split_to``: prices by ``split_from / split_to``,
+  volume by the inverse
+- cash dividend ``D``: prices by ``1 - D / close``, where ``close`` is the
+  last raw close before ``T`` (the usual total-return back-adjustment)
+
+Events after the last bar are ignored, so adjusted prices are always in the
+units of the newest bar. Split-only adjustment matches the API's
+``adjusted=true``; dividend adjustment is opt-in.
+
+The engine reads the unadjusted series (``day_unadjusted``, written by
+``RangePlanner.fetch`` / ``DailyBackfill.run`` with ``adjusted=False``);
+adjusting bars the API already adjusted would apply every split twice.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+try:
+    from .bar_store import BarStore, series_name
+    from .records import Dividend, Split
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from bar_store import BarStore, series_name
+    from records import Dividend, Split
+
+logger = logging.getLogger(__name__)
+
+SPLITS_ENDPOINT = "/reference/splits"
+PAGE_LIMIT = 1000  # API maximum for /v3/reference/splits
+
+PRICE_FIELDS = ("o", "h", "l", "c", "vw")
+
+# Corporate actions take effect at the start of the exchange's calendar day
+MARKET_TZ = ZoneInfo("America/New_York")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS splits (
+    id TEXT PRIMARY KEY,
+    ticker TEXT NOT NULL,
+    execution_date TEXT NOT NULL,
+    split_from REAL NOT NULL,
+    split_to REAL NOT NULL,
+    digest TEXT NOT NULL,
+    synced_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS splits_ticker ON splits (ticker, execution_date);
+CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def _event_ms(day: date) -> int:
+    """Midnight New York time of ``day`` in Unix ms."""
+    return int(datetime.combine(day, time(), tzinfo=MARKET_TZ).timestamp() * 1000)
+
+class SplitSync:
+    """Keeps a local table of stock splits up to date.
+
+    Splits are rare, so every run pages through the whole market: all
+    history the first time, then only execution dates after the high-water
+    mark minus ``lookback_days`` (usually a single call).
+    """
+
+    def __init__(self, client, db_path: str, lookback_days: int = 30):
+        """Initialize split sync.
+
+        Args:
+            client: MassiveAPIClient (None for read-only use)
+            db_path: SQLite database file (may be shared with DividendSync)
+            lookback_days: Days before the high-water mark re-fetched each run
+        """
+        self.client = client
+        self.db_path = db_path
+        self.lookback_days = lookback_days
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._db = sqlite3.connect(db_path)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def high_water_mark(self) -> Optional[date]:
+        """Date of the last completed sync (None before the initial load)."""
+        row = self._db.execute("SELECT value FROM sync_state WHERE key = 'splits_high_water'").fetchone()
+        return date.fromisoformat(row[0]) if row else None
+
+    def splits(self, ticker: str) -> List[Split]:
+        """Stored splits for a ticker, oldest first."""
+        rows = self._db.execute(
+            "SELECT id, ticker, execution_date, split_from, split_to FROM splits "
+            "WHERE ticker = ? ORDER BY execution_date", (ticker,)
+        ).fetchall()
+        return Split.from_list(
+            {"id": r[0], "ticker": r[1], "execution_date": r[2], "split_from": r[3], "split_to": r[4]}
+            for r in rows
+        )
+
+    def count(self) -> int:
+        """Number of stored splits."""
+        return self._db.execute("SELECT COUNT(*) FROM splits").fetchone()[0]
+
+    def fingerprint(self, ticker: str) -> str:
+        """Digest of a ticker's stored splits (changes when any is added or corrected)."""
+        rows = self._db.execute("SELECT id, digest FROM splits WHERE ticker = ? ORDER BY id", (ticker,)).fetchall()
+        return hashlib.sha1(json.dumps(rows).encode("utf-8")).hexdigest()
+
+    def sync(self, as_of: Optional[date] = None) -> Dict[str, int]:
+        """Fetch new or changed splits and upsert them.
+
+        Args:
+            as_of: Date recorded as the new high-water mark (default today)
+
+        Returns:
+            Counts: calls, fetched, inserted, updated, unchanged
+        """
+        as_of = as_of or date.today()
+        stats = dict.fromkeys(("calls", "fetched", "inserted", "updated", "unchanged"), 0)
+        high_water = self.high_water_mark()
+        params = {"limit": PAGE_LIMIT, "sort": "execution_date", "order": "asc"}
+        if high_water is not None:
+            params["execution_date.gt"] = (high_water - timedelta(days=self.lookback_days)).isoformat()
+
+        page = self.client._make_request(SPLITS_ENDPOINT, params=params)
+        while True:
+            stats["calls"] += 1
+            results = page.get("results") or []
+            stats["fetched"] += len(results)
+            self._upsert(results, stats)
+            next_url = page.get("next_url")
+            if not next_url:
+                break
+            page = self.client._make_request(next_url)
+
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO sync_state VALUES ('splits_high_water', ?)",
+                             (as_of.isoformat(),))
+        logger.info(f"✅ Split sync: {stats['inserted']} new, {stats['updated']} changed "
+                    f"in {stats['calls']} call(s)")
+        return stats
+
+    def _upsert(self, records: List[Dict[str, Any]], stats: Dict[str, int]):
+        rows = []
+        for record in records:
+            if not record.get("split_from") or not record.get("split_to"):
+                continue  # A split without both sides can't be applied
+            values = (record.get("ticker"), record.get("execution_date"),
+                      float(record["split_from"]), float(record["split_to"]))
+            record_id = record.get("id") or f"{values[0]}:{values[1]}"
+            digest = hashlib.sha1(json.dumps(values).encode("utf-8")).hexdigest()
+            existing = self._db.execute("SELECT digest FROM splits WHERE id = ?", (record_id,)).fetchone()
+            if existing is None:
+                stats["inserted"] += 1
+            elif existing[0] != digest:
+                stats["updated"] += 1
+            else:
+                stats["unchanged"] += 1
+                continue
+            rows.append((record_id,) + values + (digest, date.today().isoformat()))
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO splits VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+
+def adjustment_factors(t: np.ndarray, close: np.ndarray, splits: Iterable[Split] = (),
+                       dividends: Iterable[Dividend] = ()) -> Tuple[np.ndarray, np.ndarray]:
+    """Cumulative price and volume factors for raw bars.
+
+    Args:
+        t: Bar start times (Unix ms, ascending)
+        close: Raw closes (used to size dividend factors)
+        splits: Split records for the ticker
+        dividends: Dividend records for the ticker (empty = split-only)
+
+    Returns:
+        (price_factor, volume_factor), one float64 per bar
+    """
+    t = np.asarray(t, dtype=np.int64)
+    if len(t) == 0:
+        return np.ones(0), np.ones(0)
+    last = int(t[-1])
+    events: List[Tuple[int, float, float]] = []  # (time, price multiplier, volume multiplier)
+    for split in splits:
+        split = Split.from_dict(split)
+        if isinstance(split.execution_date, date) and split.split_from and split.split_to:
+            moment = _event_ms(split.execution_date)
+            if moment <= last:
+                events.append((moment, 1 / split.ratio, split.ratio))
+    for dividend in dividends:
+        dividend = Dividend.from_dict(dividend)
+        if not isinstance(dividend.ex_dividend_date, date) or not dividend.cash_amount:
+            continue
+        moment = _event_ms(dividend.ex_dividend_date)
+        before = int(np.searchsorted(t, moment, side="left")) - 1
+        if moment > last or before < 0 or not 0 < dividend.cash_amount < close[before]:
+            continue  # Not yet in the data, no prior close, or not meaningful
+        events.append((moment, 1 - dividend.cash_amount / float(close[before]), 1.0))
+
+    if not events:
+        return np.ones(len(t)), np.ones(len(t))
+    events.sort(key=lambda event: event[0])
+    times = np.array([event[0] for event in events], dtype=np.int64)
+    # Suffix products: bars before event k are scaled by events k..end
+    price = np.ones(len(events) + 1)
+    volume = np.ones(len(events) + 1)
+    price[:-1] = np.cumprod([event[1] for event in events][::-1])[::-1]
+    volume[:-1] = np.cumprod([event[2] for event in events][::-1])[::-1]
+    first_after = np.searchsorted(times, t, side="right")
+    return price[first_after], volume[first_after]
+
+
+def apply_factors(bars: np.ndarray, price: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Adjusted copy of BAR_DTYPE ``bars`` (trade counts unchanged)."""
+    out = np.array(bars, copy=True)
+    for name in PRICE_FIELDS:
+        out[name] *= price
+    out["v"] *= volume
+    return out
+
+
+class AdjustmentEngine:
+    """Reads split (and optionally dividend) adjusted bars from a BarStore.
+
+    Factor vectors are computed once per series over its whole stored
+    history and cached; the cache entry is reused until bars are appended
+    or the ticker's stored splits/dividends change (or ``invalidate`` is
+    called).
+    """
+
+    def __init__(self, store: BarStore, splits: SplitSync, dividends=None):
+        """Initialize adjustment engine.
+
+        Args:
+            store: BarStore holding unadjusted (``adjusted=false``) series
+            splits: SplitSync with the locally synced splits
+            dividends: DividendSync, needed for ``dividends=True`` reads
+        """
+        self.store = store
+        self.splits = splits
+        self.dividends = dividends
+        self._cache: Dict[Tuple[str, str, bool], Tuple[Any, np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def _actions_version(self, ticker: str, dividends: bool) -> Tuple[Any, ...]:
+        # Row digests, not counts: a same-day re-sync may correct a ratio or amount
+        version = (self.splits.fingerprint(ticker),)
+        if dividends:
+            version += (self.dividends.fingerprint(ticker),)
+        return version
+
+    def invalidate(self, ticker: Optional[str] = None):
+        """Drop cached factors (for one ticker, or all)."""
+        if ticker is None:
+            self._cache.clear()
+        else:
+            for key in [key for key in self._cache if key[0] == ticker]:
+                del self._cache[key]
+
+    def _series(self, ticker: str, timespan: str) -> str:
+        """Unadjusted series for ``timespan``; refuses when only adjusted bars are stored."""
+        series = series_name(timespan, adjusted=False)
+        if self.store.count(ticker, series) == 0 and self.store.count(ticker, timespan) > 0:
+            raise ValueError(f"{ticker} has only split-adjusted {timespan} bars stored; fetch them "
+                             f"with adjusted=False for local adjustment")
+        return series
+
+    def factors(self, ticker: str, timespan: str = "day",
+                dividends: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Cached (t, price_factor, volume_factor) over the stored unadjusted series."""
+        if dividends and self.dividends is None:
+            raise ValueError("Dividend adjustment needs a DividendSync")
+        series = self._series(ticker, timespan)
+        key = (ticker, timespan, dividends)
+        version = (self.store.count(ticker, series),) + self._actions_version(ticker, dividends)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1:]
+
+        bars = self.store.read(ticker, series)
+        t = np.array(bars["t"])
+        price, volume = adjustment_factors(t, bars["c"], self.splits.splits(ticker),
+                                           self.dividends.dividends(ticker) if dividends else ())
+        self._cache[key] = (version, t, price, volume)
+        return t, price, volume
+
+    def read(self, ticker: str, timespan: str = "day", start=None, end=None,
+             dividends: bool = False) -> np.ndarray:
+        """Adjusted bars with ``start <= t <= end`` (a copy, unlike BarStore.read).
+
+        Args:
+            ticker: Ticker symbol
+            timespan: Bar size, e.g. "day" or "5minute" (its unadjusted series is read)
+            start: Inclusive lower bound (ms, date, datetime or ISO string)
+            end: Inclusive upper bound
+            dividends: Also back-adjust for cash dividends (total return)
+
+        Returns:
+            BAR_DTYPE array
+
+        Raises:
+            ValueError: Only split-adjusted bars are stored for the ticker
+        """
+        bars = self.store.read(ticker, self._series(ticker, timespan), start, end)
+        if len(bars) == 0:
+            return np.array(bars)
+        t, price, volume = self.factors(ticker, timespan, dividends)
+        lo = int(np.searchsorted(t, bars["t"][0], side="left"))
+        return apply_factors(bars, price[lo:lo + len(bars)], volume[lo:lo + len(bars)])
+
+    def adjust(self, bars: np.ndarray, ticker: str, dividends: bool = False) -> np.ndarray:
+        """Adjust an arbitrary raw BAR_DTYPE array (e.g. fresh from the API) for ``ticker``.
+
+        Factors are relative to the last bar of ``bars``.
+        """
+        if dividends and self.dividends is None:
+            raise ValueError("Dividend adjustment needs a DividendSync")
+        price, volume = adjustment_factors(bars["t"], bars["c"], self.splits.splits(ticker),
+                                           self.dividends.dividends(ticker) if dividends else ())
+        return apply_factors(bars, price, volume)
+
+
+if __name__ == "__main__":
+    import argparse
+    from api_client import MassiveAPIClient
+
+    parser = argparse.ArgumentParser(description="Sync stock splits into SQLite")
+    parser.add_argument("--db", default="data/dividends.db", help="SQLite database file")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    with SplitSync(MassiveAPIClient(), args.db) as sync:
+        print(json.dumps(sync.sync(), indent=2))
@@ -0,0 +1,200 @@
+"""Budget-aware endpoint discovery driven by a YAML catalog."""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Any, Optional
+
+import requests
+import yaml
+
+try:
+    from .response_cache import DEFAULT_CACHE_DIR
+    from .retry import EndpointForbiddenError
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from response_cache import DEFAULT_CACHE_DIR
+    from retry import EndpointForbiddenError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "config", "endpoints.yaml"))
+DEFAULT_PRIORITY = 5
+
+# Registry statuses
+OK = "ok"
+FORBIDDEN = "forbidden"      # 401/403: plan entitlement
+NOT_FOUND = "not_found"      # 404: endpoint doesn't exist
+ERROR = "error"              # Anything else; retried sooner
+
+
+def load_catalog(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Load and validate endpoint entries from a YAML catalog."""
+    with open(path or DEFAULT_CATALOG, "r", encoding="utf-8") as f:
+        entries = (yaml.safe_load(f) or {}).get("endpoints") or []
+
+    seen = set()
+    for entry in entries:
+        if "name" not in entry or "endpoint" not in entry:
+            raise ValueError(f"Catalog entry needs 'name' and 'endpoint': {entry}")
+        if entry["name"] in seen:
+            raise ValueError(f"Duplicate catalog entry name: {entry['name']}")
+        seen.add(entry["name"])
+        entry.setdefault("params", None)
+        entry.setdefault("category", "uncategorized")
+        entry.setdefault("priority", DEFAULT_PRIORITY)
+    return entries
+
+
+def infer_schema(value: Any, depth: int = 3) -> Any:
+    """Describe the shape of a JSON value (types only, first list element)."""
+    if isinstance(value, dict):
+        if depth <= 0:
+            return "object"
+        return {k: infer_schema(v, depth - 1) for k, v in value.items()}
+    if isinstance(value, list):
+        if not value:
+            return []
+        return [infer_schema(value[0], depth - 1)] if depth > 0 else "array"
+    if value is None:
+        return "null"
+    return type(value).__name__
+
+
+class EndpointRegistry:
+    """Local JSON record of probe results, keyed by catalog entry name."""
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize endpoint registry.
+
+        Args:
+            path: JSON file (defaults to endpoint_registry.json in
+                MASSIVE_CACHE_DIR or ~/.cache/explore-massive)
+        """
+        cache_dir = os.path.expanduser(os.getenv("MASSIVE_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.path = path or os.path.join(cache_dir, "endpoint_registry.json")
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.results: Dict[str, Dict[str, Any]] = json.load(f)
+        except FileNotFoundError:
+            self.results = {}
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.results.get(name)
+
+    def record(self, name: str, result: Dict[str, Any]):
+        """Store a probe result and persist immediately (runs can be interrupted)."""
+        self.results[name] = result
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.results, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class DiscoveryEngine:
+    """Probes catalog endpoints that are untested or stale, within a call budget."""
+
+    def __init__(self, client, catalog: List[Dict[str, Any]], registry: EndpointRegistry,
+                 max_age_days: float = 30, error_retry_days: float = 1):
+        """Initialize discovery engine.
+
+        Args:
+            client: MassiveAPIClient
+            catalog: Entries from ``load_catalog``
+            registry: Where results are kept between runs
+            max_age_days: Re-probe known results older than this
+            error_retry_days: Re-probe transient errors older than this
+        """
+        self.client = client
+        self.catalog = catalog
+        self.registry = registry
+        self.max_age = max_age_days * 86400
+        self.error_retry = error_retry_days * 86400
+
+    def _is_stale(self, entry: Dict[str, Any], now: float) -> bool:
+        result = self.registry.get(entry["name"])
+        if result is None or result.get("endpoint") != entry["endpoint"] \
+                or result.get("params") != entry["params"]:
+            return True
+        max_age = self.error_retry if result["status"] == ERROR else self.max_age
+        return now - result["tested_at"] >= max_age
+
+    def pending(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Entries needing a probe: by priority, untested first, then oldest."""
+        now = time.time()
+        entries = [
+            e for e in self.catalog
+            if (category is None or e["category"] == category) and self._is_stale(e, now)
+        ]
+
+        def order(entry):
+            result = self.registry.get(entry["name"])
+            return (entry["priority"], result is not None, result["tested_at"] if result else 0)
+
+        return sorted(entries, key=order)
+
+    def probe(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Call one endpoint and describe the outcome."""
+        result = {
+            "endpoint": entry["endpoint"],
+            "params": entry["params"],
+            "category": entry["category"],
+            "tested_at": time.time(),
+        }
+        start = time.perf_counter()
+        try:
+            body = self.client._make_request(entry["endpoint"], params=dict(entry["params"] or {}))
+        except EndpointForbiddenError as e:
+            result.update(status=FORBIDDEN, http_status=403, error=str(e)[:200])
+            return result
+        except requests.exceptions.HTTPError as e:
+            code = e.response.status_code if e.response is not None else None
+            status = FORBIDDEN if code in (401, 403) else NOT_FOUND if code == 404 else ERROR
+            result.update(status=status, http_status=code, error=str(e)[:200])
+        except Exception as e:
+            result.update(status=ERROR, http_status=None, error=str(e)[:200])
+        else:
+            results = body.get("results") if isinstance(body, dict) else body
+            result.update(
+                status=OK,
+                http_status=200,
+                response_keys=sorted(body.keys()) if isinstance(body, dict) else [],
+                results_count=len(results) if isinstance(results, list) else None,
+                sample_schema=infer_schema(results[0] if isinstance(results, list) and results else results),
+            )
+        # Wall time, including any rate-limit wait
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+    def run(self, budget: int = 5, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Probe up to ``budget`` pending endpoints.
+
+        Endpoints already known to be forbidden (cached 403) are recorded
+        without spending budget.
+
+        Returns:
+            Results of this run, in probe order
+        """
+        done = []
+        spent = 0
+        for entry in self.pending(category):
+            if spent >= budget:
+                break
+            if self.client.entitlements.forbidden_until(entry["endpoint"]) is None:
+                spent += 1
+            result = self.probe(entry)
+            self.registry.record(entry["name"], result)
+            done.append(dict(result, name=entry["name"]))
+            icon = "✅" if result["status"] == OK else "❌"
+            logger.info(f"{icon} {entry['name']}: {result['status']} ({entry['endpoint']})")
+        return done
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Current registry state for every catalog entry (untested included)."""
+        rows = []
+        for entry in self.catalog:
+            result = self.registry.get(entry["name"]) or {"status": "untested"}
+            rows.append(dict(result, name=entry["name"], endpoint=entry["endpoint"],
+                             category=entry["category"], priority=entry["priority"]))
+        return rows
@@ -0,0 +1,252 @@
+"""Incremental dividend sync for a ticker universe into SQLite."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import date, timedelta
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+try:
+    from .records import Dividend
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from records import Dividend
+
+logger = logging.getLogger(__name__)
+
+DIVIDENDS_ENDPOINT = "/reference/dividends"
+PAGE_LIMIT = 1000  # API maximum for /v3/reference/dividends
+
+_COLUMNS = Dividend._FIELDS[:-1]  # Everything but "id", which is the key
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS dividends (
+    id TEXT PRIMARY KEY,
+    {", ".join(f"{name} {'REAL' if name == 'cash_amount' else 'TEXT'}" for name in _COLUMNS)},
+    extra TEXT,
+    digest TEXT NOT NULL,
+    synced_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dividends_ticker ON dividends (ticker, ex_dividend_date);
+CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS synced_tickers (ticker TEXT PRIMARY KEY);
+"""
+
+
+def _row(record: Dict[str, Any]) -> Tuple[str, Tuple[Any, ...], str]:
+    """(id, column values, digest) for an API dividend record."""
+    values = tuple(record.get(name) for name in _COLUMNS)
+    extra = {key: value for key, value in record.items() if key not in Dividend._FIELDS}
+    extra_json = json.dumps(extra, sort_keys=True) if extra else None
+    record_id = record.get("id") or f"{record.get('ticker')}:{record.get('ex_dividend_date')}:{record.get('dividend_type')}"
+    digest = hashlib.sha1(json.dumps([values, extra_json]).encode("utf-8")).hexdigest()
+    return record_id, values + (extra_json,), digest
+
+
+class DividendSync:
+    """Keeps a local dividend table for a ticker universe up to date.
+
+    The first run loads history with one call per ticker for small
+    universes (up to ``max_ticker_calls``), and otherwise pages through the
+    whole market (``PAGE_LIMIT`` records per call). Later runs only ask for
+    dividends with ``ex_dividend_date`` after the high-water mark: the date
+    of the last completed sync minus ``lookback_days``, so late corrections
+    and newly declared (future-dated) dividends are picked up. Records are
+    upserted by id and rows whose content is unchanged are left alone.
+
+    Tickers added to the universe after the initial load get their history
+    the same way: per-ticker calls, or one more market-wide pass when there
+    are more than ``max_ticker_calls`` of them.
+    """
+
+    def __init__(self, client, db_path: str, lookback_days: int = 7,
+                 max_ticker_calls: int = 50):
+        """Initialize dividend sync.
+
+        Args:
+            client: MassiveAPIClient
+            db_path: SQLite database file (created if missing)
+            lookback_days: Days before the high-water mark re-fetched each run
+            max_ticker_calls: Tickers whose history is loaded one call each
+                before switching to a market-wide pass
+        """
+        self.client = client
+        self.db_path = db_path
+        self.lookback_days = lookback_days
+        self.max_ticker_calls = max_ticker_calls
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._db = sqlite3.connect(db_path)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # -- State -------------------------------------------------------------
+
+    def high_water_mark(self) -> Optional[date]:
+        """Date of the last completed sync (None before the initial load)."""
+        row = self._db.execute("SELECT value FROM sync_state WHERE key = 'high_water'").fetchone()
+        return date.fromisoformat(row[0]) if row else None
+
+    def synced_tickers(self) -> List[str]:
+        """Tickers whose full history has been loaded."""
+        return [row[0] for row in self._db.execute("SELECT ticker FROM synced_tickers ORDER BY ticker")]
+
+    def dividends(self, ticker: str) -> List[Dividend]:
+        """Stored dividends for a ticker, oldest ex-dividend date first."""
+        rows = self._db.execute(
+            f"SELECT id, {', '.join(_COLUMNS)}, extra FROM dividends "
+            "WHERE ticker = ? ORDER BY ex_dividend_date", (ticker,)
+        ).fetchall()
+        records = []
+        for row in rows:
+            record = {name: value for name, value in zip(("id",) + _COLUMNS, row) if value is not None}
+            if row[-1]:
+                record.update(json.loads(row[-1]))
+            records.append(record)
+        return Dividend.from_list(records)
+
+    def count(self) -> int:
+        """Number of stored dividends."""
+        return self._db.execute("SELECT COUNT(*) FROM dividends").fetchone()[0]
+
+    def fingerprint(self, ticker: str) -> str:
+        """Digest of a ticker's stored dividends (changes when any is added or corrected)."""
+        rows = self._db.execute("SELECT id, digest FROM dividends WHERE ticker = ? ORDER BY id",
+                                (ticker,)).fetchall()
+        return hashlib.sha1(json.dumps(rows).encode("utf-8")).hexdigest()
+
+    # -- Sync --------------------------------------------------------------
+
+    def sync(self, universe: Optional[Iterable[str]] = None, since: Optional[date] = None,
+             as_of: Optional[date] = None) -> Dict[str, int]:
+        """Fetch new or changed dividends and upsert them.
+
+        Args:
+            universe: Tickers to keep (None = every ticker in the market)
+            since: Oldest ex-dividend date for the initial load (None = all history)
+            as_of: Date recorded as the new high-water mark (default today)
+
+        Returns:
+            Counts: calls, fetched, inserted, updated, unchanged, skipped
+        """
+        wanted = set(universe) if universe is not None else None
+        as_of = as_of or date.today()
+        stats = dict.fromkeys(("calls", "fetched", "inserted", "updated", "unchanged", "skipped"), 0)
+        high_water = self.high_water_mark()
+        history = {"ex_dividend_date.gte": since.isoformat()} if since else {}
+
+        if high_water is None:
+            logger.info("📥 Initial dividend load")
+            self._load_history(wanted, history, stats)
+        else:
+            if not self._whole_market_loaded():
+                if wanted is None:
+                    # Earlier runs loaded only a universe; the rest of the market has no history yet
+                    logger.info("📥 Loading history for the whole market")
+                    self._load_history(None, history, stats)
+                else:
+                    new = sorted(wanted - set(self.synced_tickers()))
+                    if new:
+                        logger.info(f"📥 Loading history for {len(new)} new ticker(s)")
+                    self._load_history(set(new), history, stats)
+
+            gt = high_water - timedelta(days=self.lookback_days)
+            logger.info(f"🔄 Dividend refresh: ex-dividend dates after {gt}")
+            self._fetch({"ex_dividend_date.gt": gt.isoformat()}, wanted, stats)
+
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO sync_state VALUES ('high_water', ?)", (as_of.isoformat(),))
+        logger.info(f"✅ Dividend sync: {stats['inserted']} new, {stats['updated']} changed "
+                    f"in {stats['calls']} call(s)")
+        return stats
+
+    def _load_history(self, tickers: Optional[set], history: Dict[str, Any], stats: Dict[str, int]):
+        """Load full history for ``tickers`` (None = whole market) and mark them loaded."""
+        if tickers is not None and len(tickers) <= self.max_ticker_calls:
+            for ticker in sorted(tickers):
+                self._fetch(dict(history, ticker=ticker), {ticker}, stats)
+        else:
+            logger.info(f"📥 {len(tickers) if tickers is not None else 'All'} tickers; paging history market-wide")
+            self._fetch(history, tickers, stats)
+        self._mark_loaded(tickers)
+
+    def _whole_market_loaded(self) -> bool:
+        return self._db.execute("SELECT 1 FROM sync_state WHERE key = 'whole_market'").fetchone() is not None
+
+    def _mark_loaded(self, tickers: Optional[Iterable[str]]):
+        with self._db:
+            if tickers is None:
+                self._db.execute("INSERT OR REPLACE INTO sync_state VALUES ('whole_market', '1')")
+                return
+            self._db.executemany("INSERT OR IGNORE INTO synced_tickers VALUES (?)", [(t,) for t in tickers])
+
+    def _fetch(self, params: Dict[str, Any], wanted: Optional[set], stats: Dict[str, int]):
+        """Page through a dividends query, upserting one page per transaction."""
+        params = dict(params, limit=PAGE_LIMIT, sort="ex_dividend_date", order="asc")
+        page = self.client._make_request(DIVIDENDS_ENDPOINT, params=params)
+        while True:
+            stats["calls"] += 1
+            results = page.get("results") or []
+            stats["fetched"] += len(results)
+            self._upsert([r for r in results if wanted is None or r.get("ticker") in wanted], stats)
+            stats["skipped"] += sum(1 for r in results if wanted is not None and r.get("ticker") not in wanted)
+            next_url = page.get("next_url")
+            if not next_url:
+                return
+            page = self.client._make_request(next_url)
+
+    def _upsert(self, records: List[Dict[str, Any]], stats: Dict[str, int]):
+        if not records:
+            return
+        rows = {}
+        for record in records:
+            record_id, values, digest = _row(record)
+            rows[record_id] = (values, digest)
+        ids = list(rows)
+        existing = {}
+        for i in range(0, len(ids), 500):  # Stay under SQLite's bound-parameter limit
+            chunk = ids[i:i + 500]
+            existing.update(self._db.execute(
+                f"SELECT id, digest FROM dividends WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall())
+
+        changed = []
+        for record_id, (values, digest) in rows.items():
+            if record_id not in existing:
+                stats["inserted"] += 1
+            elif existing[record_id] != digest:
+                stats["updated"] += 1
+            else:
+                stats["unchanged"] += 1
+                continue
+            changed.append((record_id,) + values + (digest, date.today().isoformat()))
+
+        with self._db:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO dividends VALUES ({','.join('?' * (len(_COLUMNS) + 4))})", changed
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+    from api_client import MassiveAPIClient
+
+    parser = argparse.ArgumentParser(description="Sync dividends for a ticker universe into SQLite")
+    parser.add_argument("--db", default="data/dividends.db", help="SQLite database file")
+    parser.add_argument("--tickers", help="Comma-separated universe (default: whole market)")
+    parser.add_argument("--since", type=date.fromisoformat, help="Oldest ex-dividend date for the initial load")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    universe = args.tickers.split(",") if args.tickers else None
+    with DividendSync(MassiveAPIClient(), args.db) as sync:
+        print(json.dumps(sync.sync(universe, since=args.since), indent=2))
@@ -0,0 +1,37 @@
+"""Endpoint path helpers shared by the client's bookkeeping layers."""
+
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_NUMBER = re.compile(r"^\d+$")
+# Tickers and currency codes: AAPL, BRK.B, C:EURUSD, X:BTCUSD, O:SPY241220C00500000
+_SYMBOL = re.compile(r"^[A-Z0-9][A-Za-z0-9.:\-]*$")
+
+
+@lru_cache(maxsize=4096)
+def endpoint_template(endpoint: str) -> str:
+    """Collapse a concrete endpoint to its family template.
+
+    Dates, numbers and symbols in the path become placeholders so calls to
+    the same endpoint for different tickers or days share one key:
+
+        /v2/aggs/ticker/AAPL/range/1/day/2024-01-01/2024-12-31
+        -> /v2/aggs/ticker/{ticker}/range/{n}/day/{date}/{date}
+
+    Absolute URLs (pagination ``next_url``) are reduced to their path and
+    query strings are dropped.
+    """
+    path = urlsplit(endpoint).path
+    segments = []
+    for segment in path.split("/"):
+        if _DATE.match(segment):
+            segments.append("{date}")
+        elif _NUMBER.match(segment):
+            segments.append("{n}")
+        elif _SYMBOL.match(segment) and segment.lower() != segment:
+            segments.append("{ticker}")
+        else:
+            segments.append(segment)
+    return "/".join(segments)
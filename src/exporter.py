@@ -0,0 +1,354 @@
+"""Stream paginated results or chunked aggregate ranges to NDJSON, CSV or Parquet.
+
+Rows are buffered up to ``buffer_rows`` and written page by page, so memory
+stays flat however large the export. After every flush a checkpoint next to
+the output records where to continue (the page's ``next_url`` or the next
+aggregate chunk) and how many bytes were committed; an interrupted export
+re-run with the same arguments truncates anything written after that point
+and resumes instead of refetching.
+"""
+
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+from datetime import date
+from typing import Dict, List, Any, Iterable, Optional
+
+try:
+    from .range_planner import RangePlanner
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from range_planner import RangePlanner
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Optional: only needed for Parquet output
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+NDJSON = "ndjson"
+CSV = "csv"
+PARQUET = "parquet"
+FORMATS = (NDJSON, CSV, PARQUET)
+
+# Checkpoint position after a source's last unit (distinct from any start position)
+END = {"end": True}
+
+_EXTENSIONS = {".ndjson": NDJSON, ".jsonl": NDJSON, ".json": NDJSON, ".csv": CSV, ".parquet": PARQUET}
+
+
+def format_for(path: str) -> str:
+    """Output format implied by a file name (``.gz`` suffix ignored)."""
+    base = path[:-3] if path.endswith(".gz") else path
+    fmt = _EXTENSIONS.get(os.path.splitext(base)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Can't tell the format of '{path}'. Use one of {FORMATS}")
+    return fmt
+
+
+class _TextWriter:
+    """Appends encoded rows to one file; gzip output is one member per flush.
+
+    Concatenated gzip members are a valid gzip stream, so every flush ends
+    on a boundary the checkpoint can truncate back to.
+    """
+
+    def __init__(self, path: str, compress: bool, state: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.compress = compress
+        offset = (state or {}).get("offset", 0)
+        if offset:
+            self._file = open(path, "r+b")
+            self._file.truncate(offset)  # Drop rows written after the checkpoint
+            self._file.seek(offset)
+        else:
+            self._file = open(path, "wb")
+
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        raise NotImplementedError
+
+    def write(self, rows: List[Dict[str, Any]]):
+        data = self.encode(rows)
+        if self.compress:
+            data = gzip.compress(data)
+        self._file.write(data)
+        self._file.flush()
+
+    def state(self) -> Dict[str, Any]:
+        return {"offset": self._file.tell()}
+
+    def close(self):
+        self._file.close()
+
+
+class NDJSONWriter(_TextWriter):
+    """One JSON object per line."""
+
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        return "".join(json.dumps(row, separators=(",", ":"), default=str) + "\n" for row in rows).encode("utf-8")
+
+
+class CSVWriter(_TextWriter):
+    """Columns fixed by the first rows written; nested values become JSON.
+
+    Keys first seen after the header was written go into a trailing
+    ``extra`` column as one JSON object per row, so no field is dropped.
+    """
+
+    EXTRA = "extra"
+
+    def __init__(self, path: str, compress: bool, state: Optional[Dict[str, Any]] = None):
+        super().__init__(path, compress, state)
+        self.fieldnames: Optional[List[str]] = (state or {}).get("fieldnames")
+        self._warned: set = set()
+
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        buffer = io.StringIO()
+        header = self.fieldnames is None
+        if header:
+            keys = dict.fromkeys(key for row in rows for key in row)
+            keys.pop(self.EXTRA, None)  # Collides with the overflow column; kept inside it
+            self.fieldnames = list(keys) + [self.EXTRA]
+        columns = set(self.fieldnames) - {self.EXTRA}
+        writer = csv.DictWriter(buffer, fieldnames=self.fieldnames)
+        if header:
+            writer.writeheader()
+        for row in rows:
+            out = {}
+            extra = {}
+            for key, value in row.items():
+                if key in columns:
+                    out[key] = json.dumps(value) if isinstance(value, (dict, list)) else value
+                else:
+                    extra[key] = value
+            if extra:
+                new_keys = set(extra) - self._warned
+                if new_keys:
+                    self._warned |= new_keys
+                    logger.warning(f"⚠️  {self.path}: {', '.join(sorted(new_keys))} not in the CSV header; "
+                                   f"written to the '{self.EXTRA}' column")
+                out[self.EXTRA] = json.dumps(extra, separators=(",", ":"), default=str)
+            writer.writerow(out)
+        return buffer.getvalue().encode("utf-8")
+
+    def state(self) -> Dict[str, Any]:
+        return dict(super().state(), fieldnames=self.fieldnames)
+
+
+class ParquetWriter:
+    """Writes a Parquet dataset directory, one ``part-NNNNN.parquet`` per flush.
+
+    Parquet files can't be appended to, so each flush is its own part and a
+    resume removes parts written after the checkpoint. Every part has the
+    first part's schema; rows missing a column get nulls, and a part that
+    would add a column (or give one that was all null a type) is refused
+    rather than written with a schema the dataset can't read back.
+    """
+
+    def __init__(self, path: str, compression: Optional[str] = "snappy",
+                 state: Optional[Dict[str, Any]] = None):
+        if pyarrow is None:
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow)")
+        self.path = path
+        self.compression = compression or "none"
+        self.parts = (state or {}).get("parts", 0)
+        self._schema = None
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.startswith("part-") and name.endswith(".parquet") and int(name[5:10]) >= self.parts:
+                os.remove(os.path.join(path, name))
+        if self.parts:
+            self._schema = pyarrow.parquet.read_schema(os.path.join(path, "part-00000.parquet"))
+
+    def write(self, rows: List[Dict[str, Any]]):
+        table = pyarrow.Table.from_pylist(rows)
+        if self._schema is None:
+            self._schema = table.schema
+        else:
+            self._check_schema(table.schema)
+            table = pyarrow.Table.from_pylist(rows, schema=self._schema)
+        pyarrow.parquet.write_table(table, os.path.join(self.path, f"part-{self.parts:05d}.parquet"),
+                                    compression=self.compression)
+        self.parts += 1
+
+    def _check_schema(self, schema):
+        """Raise if ``schema`` has columns the dataset schema can't hold."""
+        new = [name for name in schema.names if name not in self._schema.names]
+        untyped = [name for name in schema.names if name in self._schema.names
+                   and pyarrow.types.is_null(self._schema.field(name).type)
+                   and not pyarrow.types.is_null(schema.field(name).type)]
+        if new or untyped:
+            problems = []
+            if new:
+                problems.append(f"new column(s) {', '.join(new)}")
+            if untyped:
+                problems.append(f"values in column(s) {', '.join(untyped)} that were all null in part-00000")
+            raise ValueError(f"Part {self.parts} of {self.path} has {' and '.join(problems)}. "
+                             f"Re-export with a larger buffer_rows so the first part sees every "
+                             f"column, or export to NDJSON")
+
+    def state(self) -> Dict[str, Any]:
+        return {"parts": self.parts}
+
+    def close(self):
+        pass
+
+
+class Exporter:
+    """Streams API results into a file with bounded memory and resumable checkpoints."""
+
+    def __init__(self, client, output: str, fmt: Optional[str] = None,
+                 compression: Optional[str] = None, buffer_rows: int = 10000,
+                 checkpoint: Optional[str] = None):
+        """Initialize exporter.
+
+        Args:
+            client: MassiveAPIClient
+            output: Output file (a directory for Parquet)
+            fmt: ndjson, csv or parquet (default: from the file name)
+            compression: "gzip" for NDJSON/CSV (default when ``output`` ends
+                in .gz); any pyarrow codec for Parquet (default snappy)
+            buffer_rows: Rows held in memory before a flush (and checkpoint)
+            checkpoint: Checkpoint file (default ``<output>.checkpoint.json``)
+        """
+        self.client = client
+        self.output = output
+        self.fmt = fmt or format_for(output)
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{self.fmt}'. Use one of {FORMATS}")
+        if compression is None and self.fmt != PARQUET and output.endswith(".gz"):
+            compression = "gzip"
+        if compression not in (None, "gzip") and self.fmt != PARQUET:
+            raise ValueError(f"{self.fmt} output supports gzip compression only, not '{compression}'")
+        self.compression = compression
+        self.buffer_rows = buffer_rows
+        self.checkpoint_path = checkpoint or f"{output.rstrip(os.sep)}.checkpoint.json"
+
+    # -- Checkpoints -------------------------------------------------------
+
+    def _load_checkpoint(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, "r") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("job") != job:
+            raise ValueError(f"{self.checkpoint_path} belongs to a different export; "
+                             f"delete it or choose another output")
+        logger.info(f"⏯️  Resuming export to {self.output} after {checkpoint['rows']} rows")
+        return checkpoint
+
+    def _save_checkpoint(self, job: Dict[str, Any], position: Any, rows: int, writer):
+        checkpoint = {"job": job, "position": position, "rows": rows, "writer": writer.state(),
+                      "done": position == END}
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _open_writer(self, state: Optional[Dict[str, Any]]):
+        if self.fmt == PARQUET:
+            return ParquetWriter(self.output, self.compression or "snappy", state)
+        writer_class = NDJSONWriter if self.fmt == NDJSON else CSVWriter
+        return writer_class(self.output, self.compression == "gzip", state)
+
+    def _run(self, job: Dict[str, Any], units, start: Any) -> int:
+        """Drive ``units(start)``: an iterator of (rows, position after them).
+
+        The last unit's position must be ``END``, so a checkpoint saved
+        after it can't be mistaken for the start.
+        """
+        checkpoint = self._load_checkpoint(job)
+        if checkpoint and checkpoint.get("done"):
+            # Every row was written; only removing the checkpoint was interrupted
+            os.remove(self.checkpoint_path)
+            logger.info(f"✅ Export to {self.output} was already complete ({checkpoint['rows']} rows)")
+            return checkpoint["rows"]
+        position = checkpoint["position"] if checkpoint else start
+        rows_written = checkpoint["rows"] if checkpoint else 0
+        writer = self._open_writer(checkpoint["writer"] if checkpoint else None)
+        buffer: List[Dict[str, Any]] = []
+        try:
+            for rows, position in units(position):
+                buffer.extend(rows)
+                if len(buffer) >= self.buffer_rows:
+                    writer.write(buffer)
+                    rows_written += len(buffer)
+                    buffer = []
+                    self._save_checkpoint(job, position, rows_written, writer)
+            if buffer:
+                writer.write(buffer)
+                rows_written += len(buffer)
+                self._save_checkpoint(job, END, rows_written, writer)
+        finally:
+            writer.close()
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)  # Finished; a re-run starts over
+        logger.info(f"✅ Exported {rows_written} rows to {self.output}")
+        return rows_written
+
+    # -- Sources -----------------------------------------------------------
+
+    def export_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> int:
+        """Export every ``results`` record of a paginated endpoint.
+
+        Returns:
+            Total rows in the output
+        """
+        job = {"kind": "pages", "endpoint": endpoint, "params": params or {}, "format": self.fmt}
+
+        def pages(next_url: Optional[str]):
+            if next_url == END:
+                return
+            page = self.client._make_request(next_url or endpoint, params=None if next_url else params)
+            while True:
+                results = page.get("results") or []
+                if isinstance(results, dict):
+                    results = [results]
+                next_url = page.get("next_url")
+                yield results, next_url or END
+                if not next_url:
+                    return
+                page = self.client._make_request(next_url)
+
+        return self._run(job, pages, None)
+
+    def export_aggregates(self, tickers: Iterable[str], multiplier: int, timespan: str,
+                          start: date, end: date, adjusted: bool = True,
+                          market: str = "stocks", calendar=None) -> int:
+        """Export aggregate bars for tickers over ``start..end`` in cap-sized chunks.
+
+        Rows are the API's ``results`` records as returned (every field,
+        including any the BAR_DTYPE columns don't cover), with the ticker
+        added in ``T`` as in grouped-daily responses.
+
+        Returns:
+            Total rows in the output
+        """
+        tickers = list(tickers)
+        planner = RangePlanner(self.client, calendar=calendar, market=market)
+        chunks = planner.plan(start, end, timespan, multiplier)
+        job = {"kind": "aggregates", "tickers": tickers, "multiplier": multiplier, "timespan": timespan,
+               "start": start.isoformat(), "end": end.isoformat(), "adjusted": adjusted, "format": self.fmt}
+
+        def ranges(position: List[int]):
+            if position == END:
+                return
+            ticker_index, chunk_index = position
+            for i in range(ticker_index, len(tickers)):
+                for j in range(chunk_index if i == ticker_index else 0, len(chunks)):
+                    chunk_start, chunk_end = chunks[j]
+                    rows = self.client.get_aggregates(tickers[i], multiplier, timespan, chunk_start.isoformat(),
+                                                      chunk_end.isoformat(), adjusted=adjusted).to_list()
+                    for row in rows:
+                        row["T"] = tickers[i]
+                    if j + 1 < len(chunks):
+                        after = [i, j + 1]
+                    else:
+                        after = [i + 1, 0] if i + 1 < len(tickers) else END
+                    yield rows, after
+
+        return self._run(job, ranges, [0, 0])
@@ -0,0 +1,180 @@
+"""Decode list responses straight into NumPy structured arrays.
+
+``response.json()`` builds one dict per bar; a year of minute bars is
+hundreds of thousands of short-lived dicts. ``decode_columns`` instead
+scans the ``results`` array of the raw payload into typed columns when every
+row has the same all-numeric shape (the normal case for aggregates), and
+otherwise parses with orjson when installed (stdlib ``json`` if not) and
+fills the columns from the parsed records.
+"""
+
+import json
+import re
+from typing import Dict, List, Any, Iterable, Optional
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up
+    orjson = None
+
+try:
+    from .bar_store import BAR_DTYPE
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from bar_store import BAR_DTYPE
+
+# Numeric fields of /v3/trades and /v3/quotes records (timestamps in Unix ns)
+TRADE_DTYPE = np.dtype([
+    ("sip_timestamp", "<i8"),
+    ("participant_timestamp", "<i8"),
+    ("price", "<f8"),
+    ("size", "<f8"),
+    ("exchange", "<i4"),
+    ("tape", "<i4"),
+    ("sequence_number", "<i8"),
+])
+
+QUOTE_DTYPE = np.dtype([
+    ("sip_timestamp", "<i8"),
+    ("participant_timestamp", "<i8"),
+    ("bid_price", "<f8"),
+    ("bid_size", "<f8"),
+    ("bid_exchange", "<i4"),
+    ("ask_price", "<f8"),
+    ("ask_size", "<f8"),
+    ("ask_exchange", "<i4"),
+    ("tape", "<i4"),
+    ("sequence_number", "<i8"),
+])
+
+_RESULTS = re.compile(rb'"results"\s*:\s*\[')
+_NUMBER_CHARS = b"0123456789.eE+-"
+_WHITESPACE = b" \t\r\n"
+# Integers above this lose precision when scanned as float64
+_EXACT_INT = 2 ** 53
+
+
+def loads(payload: bytes) -> Any:
+    """Parse JSON with orjson when available, else the stdlib."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def records_to_columns(records: Iterable[Dict[str, Any]], dtype: np.dtype) -> np.ndarray:
+    """Fill a structured array from parsed records.
+
+    Missing or null float fields become NaN, missing integer fields 0.
+    """
+    records = records if isinstance(records, list) else list(records)
+    out = np.empty(len(records), dtype=dtype)
+    for name in dtype.names:
+        floating = dtype[name].kind == "f"
+        default = np.nan if floating else 0
+        values = [record.get(name, default) for record in records]
+        if floating:
+            out[name] = np.array(values, dtype=float)  # None -> NaN
+        else:
+            out[name] = [default if value is None else value for value in values]
+    return out
+
+
+def columns_to_records(array: np.ndarray) -> List[Dict[str, Any]]:
+    """Inverse of ``records_to_columns`` (NaN floats are dropped)."""
+    names = array.dtype.names
+    records = []
+    for row in array.tolist():
+        records.append({name: value for name, value in zip(names, row) if value == value})
+    return records
+
+
+def decode_columns(payload: bytes, dtype: np.dtype = BAR_DTYPE) -> Dict[str, Any]:
+    """Decode a list response, replacing ``results`` with a ``dtype`` array.
+
+    Args:
+        payload: Raw response body
+        dtype: Structured dtype whose field names match the record keys
+
+    Returns:
+        The response dict with ``results`` as a structured array
+    """
+    match = _RESULTS.search(payload)
+    if match is not None:
+        start = match.end()
+        # Uniform numeric rows contain no brackets, so the first one closes the array
+        end = payload.find(b"]", start)
+        if end >= 0:
+            array = _scan_rows(payload[start:end], dtype)
+            if array is not None:
+                body = loads(payload[:start] + payload[end:])
+                body["results"] = array
+                return body
+
+    return body_to_columns(loads(payload), dtype)
+
+
+def body_to_columns(body: Dict[str, Any], dtype: np.dtype) -> Dict[str, Any]:
+    """Copy of a parsed response with ``results`` converted to ``dtype``."""
+    body = dict(body)
+    results = body.get("results") or []
+    if isinstance(results, dict):
+        results = [results]
+    body["results"] = records_to_columns(results, dtype)
+    return body
+
+
+def _scan_rows(span: bytes, dtype: np.dtype) -> Optional[np.ndarray]:
+    """Parse ``{..},{..}`` rows without building dicts, or None if not uniform.
+
+    Deleting number characters from every row must leave an identical
+    skeleton (same keys, same order, no strings, nulls or nested values).
+    Then every structural byte is turned into whitespace and the numbers
+    are read in one ``np.fromstring`` call, row-major.
+    """
+    span = span.strip(_WHITESPACE)
+    if not span:
+        return np.empty(0, dtype=dtype)
+    if span[:1] != b"{":
+        return None
+
+    first = span[:span.find(b"}") + 1]
+    try:
+        keys = list(loads(first).keys())
+    except (ValueError, AttributeError):
+        return None
+    # Every value must be a bare number: true/false/null or strings leave
+    # letters or quotes behind once the number characters are deleted
+    skeleton = b"{" + b",".join(json.dumps(key).encode("utf-8") + b":" for key in keys) + b"}"
+    skeleton = skeleton.translate(None, _NUMBER_CHARS)
+    rows = span.count(b"}")
+    if span.translate(None, _NUMBER_CHARS + _WHITESPACE) != b",".join([skeleton] * rows):
+        return None
+
+    key_chars = set("".join(keys).encode("utf-8"))
+    if key_chars & set(_NUMBER_CHARS):
+        # Blanking these key bytes would also eat digits/exponents; drop whole keys instead
+        for key in keys:
+            span = span.replace(json.dumps(key).encode("utf-8"), b"")
+        key_chars = set()
+    table = bytearray(range(256))
+    for byte in key_chars | set(b'"{}:,'):
+        table[byte] = ord(" ")
+    try:
+        values = np.fromstring(span.translate(bytes(table)), sep=" ")
+    except ValueError:  # Anything the checks above missed: let the JSON parser decide
+        return None
+    if values.size != rows * len(keys):
+        return None
+    values = values.reshape(rows, len(keys))
+
+    out = np.empty(rows, dtype=dtype)
+    for name in dtype.names:
+        if name not in keys:
+            out[name] = np.nan if dtype[name].kind == "f" else 0
+            continue
+        column = values[:, keys.index(name)]
+        if dtype[name].kind in "iu" and rows and np.abs(column).max() >= _EXACT_INT:
+            return None  # e.g. nanosecond timestamps; let the parser keep them exact
+        out[name] = column
+    return out
@@ -0,0 +1,202 @@
+"""Local FX cross rates and bulk conversion from one grouped-daily snapshot.
+
+``/v1/conversion/{FROM}/{TO}`` (or a per-pair quote call) costs one
+rate-limited call per currency pair. One ``/v2/aggs/grouped/.../fx/{date}``
+call returns the day's bar for every quoted pair instead; FXRates turns it
+into a currency-by-currency rate matrix so any cross rate, and any number
+of conversions, is answered locally.
+
+Pairs that aren't quoted directly are triangulated through the pairs that
+are: every currency is valued in the anchor currency (USD when quoted)
+along the shortest chain of quotes, e.g. HUF -> EUR -> USD. Direct quotes
+take precedence over triangulated rates for their own pair.
+"""
+
+import logging
+from collections import deque
+from datetime import date, timedelta
+from typing import Dict, List, Any, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from .backfill import GROUPED_ENDPOINTS
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from backfill import GROUPED_ENDPOINTS
+
+logger = logging.getLogger(__name__)
+
+Codes = Union[str, Iterable[str], np.ndarray]
+
+
+def parse_pair(ticker: str) -> Optional[Tuple[str, str]]:
+    """("EUR", "USD") for "C:EURUSD" (or "EURUSD"); None for anything else."""
+    symbol = ticker[2:] if ticker.startswith("C:") else ticker
+    if len(symbol) != 6 or not symbol.isalpha():
+        return None
+    return symbol[:3].upper(), symbol[3:].upper()
+
+
+class FXRates:
+    """Cross-rate matrix over every currency in a set of pair quotes.
+
+    ``matrix[i, j]`` is the price of one unit of ``currencies[i]`` in
+    ``currencies[j]``; NaN where no chain of quotes links the two.
+    """
+
+    def __init__(self, quotes: Dict[str, float], as_of: Optional[date] = None,
+                 anchor: Optional[str] = None):
+        """Initialize FX rates.
+
+        Args:
+            quotes: Pair ticker ("C:EURUSD" or "EURUSD") -> price of the base
+                currency in the quote currency
+            as_of: Date of the quotes
+            anchor: Currency everything is triangulated through (default
+                USD, else the most quoted currency)
+        """
+        self.as_of = as_of
+        pairs: Dict[Tuple[str, str], float] = {}
+        for ticker, price in quotes.items():
+            pair = parse_pair(ticker)
+            if pair is not None and pair[0] != pair[1] and price and price > 0:
+                pairs[pair] = float(price)
+        self.pairs = pairs
+        self.currencies: List[str] = sorted({currency for pair in pairs for currency in pair})
+        self._codes = np.array(self.currencies, dtype=str)
+        self._position = {currency: i for i, currency in enumerate(self.currencies)}
+        self.anchor = anchor.upper() if anchor else self._default_anchor()
+        if self.anchor is not None and self.anchor not in self._position:
+            raise ValueError(f"Anchor {self.anchor} isn't in any quoted pair")
+        self.matrix = self._build()
+
+    def __len__(self) -> int:
+        return len(self.currencies)
+
+    def _default_anchor(self) -> Optional[str]:
+        if not self.pairs:
+            return None
+        if "USD" in self._position:
+            return "USD"
+        counts: Dict[str, int] = {}
+        for pair in self.pairs:
+            for currency in pair:
+                counts[currency] = counts.get(currency, 0) + 1
+        return max(sorted(counts), key=counts.get)
+
+    def _build(self) -> np.ndarray:
+        n = len(self.currencies)
+        values = np.full(n, np.nan)  # Price of one unit in the anchor currency
+        if n:
+            neighbours: Dict[str, List[Tuple[str, float]]] = {}
+            for (base, quote), price in self.pairs.items():
+                neighbours.setdefault(base, []).append((quote, 1 / price))
+                neighbours.setdefault(quote, []).append((base, price))
+            # Breadth-first, so each currency is valued along its shortest chain
+            values[self._position[self.anchor]] = 1.0
+            queue = deque([self.anchor])
+            while queue:
+                currency = queue.popleft()
+                value = values[self._position[currency]]
+                for other, per_unit in neighbours.get(currency, ()):
+                    i = self._position[other]
+                    if np.isnan(values[i]):
+                        values[i] = value * per_unit
+                        queue.append(other)
+            unreachable = [c for c, v in zip(self.currencies, values) if np.isnan(v)]
+            if unreachable:
+                logger.warning(f"⚠️  No quote chain to {self.anchor} for {', '.join(unreachable)}")
+
+        matrix = values[:, None] / values[None, :]
+        if self.pairs:
+            base = np.array([self._position[b] for b, _ in self.pairs])
+            quote = np.array([self._position[q] for _, q in self.pairs])
+            prices = np.array(list(self.pairs.values()))
+            matrix[base, quote] = prices
+            matrix[quote, base] = 1 / prices
+        np.fill_diagonal(matrix, 1.0)
+        return matrix
+
+    # -- Lookups -----------------------------------------------------------
+
+    def index(self, codes: Codes) -> Union[int, np.ndarray]:
+        """Matrix position(s) of currency code(s).
+
+        Raises:
+            ValueError: A code isn't in the snapshot
+        """
+        if isinstance(codes, str) and codes.upper() in self._position:
+            return self._position[codes.upper()]  # Scalar fast path
+        codes = np.char.upper(np.asarray(codes, dtype=str))
+        positions = np.searchsorted(self._codes, codes)
+        if len(self._codes):
+            found = self._codes[np.minimum(positions, len(self._codes) - 1)] == codes
+        else:
+            found = np.zeros(codes.shape, dtype=bool)
+        if not np.all(found):
+            missing = sorted(set(np.atleast_1d(codes)[~np.atleast_1d(found)].tolist()))
+            raise ValueError(f"Unknown currency {', '.join(missing)}. Known: {', '.join(self.currencies)}")
+        return int(positions) if positions.ndim == 0 else positions
+
+    def rate(self, base: str, quote: str) -> float:
+        """Price of one ``base`` in ``quote`` (direct or triangulated).
+
+        Raises:
+            ValueError: Unknown currency, or no chain of quotes links the two
+        """
+        value = float(self.matrix[self.index(base), self.index(quote)])
+        if np.isnan(value):
+            raise ValueError(f"No quotes link {base} and {quote}")
+        return value
+
+    def convert(self, amounts, from_currency: Codes, to_currency: Codes) -> Union[float, np.ndarray]:
+        """Convert amounts between currencies in one vectorized lookup.
+
+        ``amounts``, ``from_currency`` and ``to_currency`` broadcast against
+        each other: e.g. a column of amounts with a column of currency
+        codes, converted into one reporting currency.
+
+        Returns:
+            Converted amounts (NaN where no chain of quotes exists)
+        """
+        converted = np.asarray(amounts, dtype=np.float64) * self.matrix[self.index(from_currency),
+                                                                        self.index(to_currency)]
+        return float(converted) if converted.ndim == 0 else converted
+
+    def table(self, currencies: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, float]]:
+        """Cross-rate table {base: {quote: rate}} for some (default all) currencies."""
+        currencies = list(currencies) if currencies is not None else self.currencies
+        positions = np.atleast_1d(self.index(currencies))
+        sub = self.matrix[np.ix_(positions, positions)]
+        return {base: dict(zip(currencies, row.tolist())) for base, row in zip(currencies, sub)}
+
+    # -- Loading -----------------------------------------------------------
+
+    @classmethod
+    def from_grouped(cls, results: Iterable[Dict[str, Any]], field: str = "c",
+                     as_of: Optional[date] = None, anchor: Optional[str] = None) -> "FXRates":
+        """Build from grouped-daily fx ``results`` (``T`` plus OHLC), using ``field`` as the rate."""
+        quotes = {bar["T"]: bar.get(field) for bar in results if bar.get("T")}
+        return cls(quotes, as_of=as_of, anchor=anchor)
+
+    @classmethod
+    def load(cls, client, day: Optional[date] = None, field: str = "c",
+             max_lookback: int = 7, anchor: Optional[str] = None) -> "FXRates":
+        """Fetch the grouped fx snapshot for ``day`` (default yesterday).
+
+        Weekends and holidays have no bars, so earlier days are tried, up to
+        ``max_lookback`` of them; ``as_of`` is the day actually used.
+
+        Raises:
+            ValueError: No fx bars within the lookback
+        """
+        day = day or date.today() - timedelta(days=1)
+        for back in range(max_lookback + 1):
+            as_of = day - timedelta(days=back)
+            endpoint = GROUPED_ENDPOINTS["fx"].format(date=as_of.isoformat())
+            results = client._make_request(endpoint).get("results") or []
+            if results:
+                rates = cls.from_grouped(results, field=field, as_of=as_of, anchor=anchor)
+                logger.info(f"💱 FX rates for {as_of}: {len(rates.pairs)} pairs, {len(rates)} currencies")
+                return rates
+        raise ValueError(f"No grouped fx bars between {day - timedelta(days=max_lookback)} and {day}")
@@ -1,34 +1,71 @@
 """Market holiday fetcher using Massive.com API."""
 
+import json
 import logging
+import os
+import threading
 from datetime import datetime, date, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Tuple
 from api_client import MassiveAPIClient
+from records import Holiday
+from response_cache import DEFAULT_CACHE_DIR
+from trading_calendar import TradingCalendar
 
 logger = logging.getLogger(__name__)
 
 
+class CalendarUnavailableError(RuntimeError):
+    """No holiday calendar could be loaded (no snapshot and the API failed).
+
+    Raised instead of answering "regular trading day" from an empty calendar.
+    """
+
+
 class HolidayFetcher:
     """Fetches and caches trading market holidays from Massive.com API.
     
     Returns ACTUAL TRADING HOLIDAYS (closed/early-close), not all calendar holidays.
     Examples: Thanksgiving, Christmas, Independence Day (market closures only)
+    
+    The last good calendar is persisted to a snapshot file and loaded at
+    construction, so lookups never wait on the API once a snapshot exists.
+    A stale calendar keeps being served while a background thread refreshes
+    it; the network is only awaited when there is no data at all (and if
+    that fails, lookups raise CalendarUnavailableError rather than report a
+    normal trading day). After a failed refresh, retries back off
+    exponentially (``_retry_min`` doubling up to ``_retry_max``) instead of
+    starting one per lookup.
     """
     
-    def __init__(self, exchange: str = "NASDAQ"):
+    def __init__(self, exchange: str = "NASDAQ", snapshot_path: Optional[str] = None):
         """Initialize holiday fetcher.
         
         Args:
             exchange: Default exchange code (NASDAQ, NYSE, etc.)
+            snapshot_path: Calendar snapshot file (defaults to holidays.json
+                in MASSIVE_CACHE_DIR or ~/.cache/explore-massive)
         """
         self.exchange = exchange
         self.client = MassiveAPIClient()
-        self._cache: Optional[List[Dict[str, Any]]] = None
+        cache_dir = os.path.expanduser(os.getenv("MASSIVE_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.snapshot_path = snapshot_path or os.path.join(cache_dir, "holidays.json")
+        self._cache: Optional[List[Holiday]] = None
         self._cache_timestamp: Optional[datetime] = None
         self._cache_duration = timedelta(hours=24)  # Refresh daily
+        # Rebuilt from _cache on every refresh so per-signal checks are dict lookups
+        self._index: Dict[Tuple[str, date], Holiday] = {}
+        self._by_exchange: Dict[str, List[Holiday]] = {}
+        self._calendars: Dict[str, TradingCalendar] = {}
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._failures = 0
+        self._retry_at: Optional[datetime] = None  # No refresh attempts before this
+        self._retry_min = timedelta(minutes=1)
+        self._retry_max = timedelta(hours=1)
+        self._load_snapshot()
     
     def fetch_holidays(self, exchange: Optional[str] = None, 
-                      force_refresh: bool = False) -> List[Dict[str, Any]]:
+                      force_refresh: bool = False) -> List[Holiday]:
         """Fetch upcoming market holidays from Massive.com API.
         
         Returns actual trading holidays (closed/early-close status) for specific exchange.
@@ -38,7 +75,7 @@ class HolidayFetcher:
             force_refresh: Force cache refresh
             
         Returns:
-            List of market holiday dictionaries with structure:
+            List of Holiday records; dict access gives the API structure:
             {
                 "date": "2020-11-26",
                 "exchange": "NYSE",
@@ -50,29 +87,139 @@ class HolidayFetcher:
         """
         exchange = exchange or self.exchange
         
-        # Check cache validity
-        if self._cache and not force_refresh:
-            if datetime.now() - self._cache_timestamp < self._cache_duration:
-                return self._filter_by_exchange(self._cache, exchange)
+        # Serve cached data (stale data triggers a background refresh)
+        if not force_refresh and self._cache is not None:
+            self._ensure_loaded()
+            return list(self._by_exchange.get(exchange, []))
         
         try:
-            all_holidays = self.client.get_market_holidays()
-            self._cache = all_holidays
-            self._cache_timestamp = datetime.now()
-            
-            filtered = self._filter_by_exchange(all_holidays, exchange)
-            logger.info(f"Cached {len(all_holidays)} market holidays; {len(filtered)} for {exchange}")
+            self._refresh()
+            filtered = list(self._by_exchange.get(exchange, []))
+            logger.info(f"Cached {len(self._cache)} market holidays; {len(filtered)} for {exchange}")
             
             return filtered
         
         except Exception as e:
             logger.error(f"Error fetching market holidays: {e}")
-            return []
+            # Last good calendar beats an empty one ("market open")
+            return list(self._by_exchange.get(exchange, []))
+    
+    def _refresh(self):
+        """Fetch holidays from the API, re-index and persist the snapshot.
+        
+        Failures are recorded and schedule the next allowed attempt.
+        """
+        try:
+            all_holidays = Holiday.from_list(self.client.get_market_holidays())
+        except Exception:
+            with self._refresh_lock:
+                self._failures += 1
+                delay = min(self._retry_min * 2 ** (self._failures - 1), self._retry_max)
+                self._retry_at = datetime.now() + delay
+            raise
+        fetched_at = datetime.now()
+        with self._refresh_lock:
+            self._cache = all_holidays
+            self._cache_timestamp = fetched_at
+            self._failures = 0
+            self._retry_at = None
+            self._build_index(all_holidays)
+        self._save_snapshot(all_holidays, fetched_at)
+    
+    def _backing_off(self) -> bool:
+        retry_at = self._retry_at  # A concurrent refresh may reset it
+        return retry_at is not None and datetime.now() < retry_at
+    
+    def _background_refresh(self):
+        try:
+            self._refresh()
+            logger.info(f"Refreshed {len(self._cache)} market holidays in background")
+        except Exception as e:
+            retry_at = self._retry_at  # None if another refresh succeeded meanwhile
+            retry = f"until a retry at {retry_at:%H:%M:%S}" if retry_at is not None else "for now"
+            logger.warning(f"Background holiday refresh failed; serving stale calendar {retry}: {e}")
+    
+    def _ensure_loaded(self):
+        """Make sure some calendar is loaded; refresh stale data without blocking.
+        
+        Raises:
+            CalendarUnavailableError: No calendar at all (no snapshot, fetch failed)
+        """
+        if self._cache is None:
+            if not self._backing_off():
+                self.fetch_holidays(force_refresh=True)
+            if self._cache is None:
+                raise CalendarUnavailableError(
+                    f"No holiday calendar: no snapshot at {self.snapshot_path} and the API fetch failed"
+                )
+        elif not self._cache_is_valid() and not self._backing_off():
+            with self._refresh_lock:
+                if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                    return
+                self._refresh_thread = threading.Thread(
+                    target=self._background_refresh, name="holiday-refresh", daemon=True
+                )
+                self._refresh_thread.start()
+    
+    def _load_snapshot(self):
+        """Load the last persisted calendar, if any."""
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            holidays = Holiday.from_list(snapshot["holidays"])
+            fetched_at = datetime.fromisoformat(snapshot["fetched_at"])
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable holiday snapshot {self.snapshot_path}: {e}")
+            return
+        
+        self._cache = holidays
+        self._cache_timestamp = fetched_at
+        self._build_index(holidays)
+        logger.info(f"Loaded {len(holidays)} market holidays from snapshot ({fetched_at:%Y-%m-%d %H:%M})")
+    
+    def _save_snapshot(self, holidays: List[Holiday], fetched_at: datetime):
+        """Atomically persist the calendar for the next cold start."""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.snapshot_path)), exist_ok=True)
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"fetched_at": fetched_at.isoformat(),
+                           "holidays": [holiday.to_dict() for holiday in holidays]}, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Could not save holiday snapshot {self.snapshot_path}: {e}")
+    
+    def _cache_is_valid(self) -> bool:
+        """True if the cached holidays are younger than the cache duration."""
+        return self._cache is not None and datetime.now() - self._cache_timestamp < self._cache_duration
+    
+    def _build_index(self, holidays: List[Holiday]):
+        """Index holidays by (exchange, date) and by exchange.
+        
+        Dates were parsed when the records were built. The first record
+        for an (exchange, date) pair wins, matching the old linear scan.
+        """
+        index: Dict[Tuple[str, date], Holiday] = {}
+        by_exchange: Dict[str, List[Holiday]] = {}
+        for holiday in holidays:
+            by_exchange.setdefault(holiday.exchange, []).append(holiday)
+            if not isinstance(holiday.date, date):
+                logger.warning(f"Skipping holiday with bad date: {holiday}")
+                continue
+            index.setdefault((holiday.exchange, holiday.date), holiday)
+        self._index = index
+        self._by_exchange = by_exchange
+        self._calendars = {}
     
-    def _filter_by_exchange(self, holidays: List[Dict[str, Any]], 
-                           exchange: str) -> List[Dict[str, Any]]:
-        """Filter holidays to specific exchange."""
-        return [h for h in holidays if h.get("exchange") == exchange]
+    def _lookup(self, check_date: Optional[date], exchange: Optional[str]) -> Optional[Holiday]:
+        """Return the holiday record for a date/exchange, refreshing if stale."""
+        self._ensure_loaded()
+        check_date = check_date or date.today()
+        if isinstance(check_date, datetime):
+            check_date = check_date.date()
+        return self._index.get((exchange or self.exchange, check_date))
     
     def is_market_closed(self, check_date: Optional[date] = None, 
                         exchange: Optional[str] = None) -> bool:
@@ -85,17 +232,8 @@ class HolidayFetcher:
         Returns:
             True if market has "closed" status (not early-close)
         """
-        check_date = check_date or date.today()
-        exchange = exchange or self.exchange
-        
-        holidays = self.fetch_holidays(exchange)
-        date_str = check_date.isoformat()
-        
-        for holiday in holidays:
-            if holiday.get("date") == date_str and holiday.get("status") == "closed":
-                return True
-        
-        return False
+        holiday = self._lookup(check_date, exchange)
+        return holiday is not None and holiday.is_closed
     
     def is_early_close(self, check_date: Optional[date] = None, 
                       exchange: Optional[str] = None) -> bool:
@@ -108,20 +246,11 @@ class HolidayFetcher:
         Returns:
             True if market has "early-close" status
         """
-        check_date = check_date or date.today()
-        exchange = exchange or self.exchange
-        
-        holidays = self.fetch_holidays(exchange)
-        date_str = check_date.isoformat()
-        
-        for holiday in holidays:
-            if holiday.get("date") == date_str and holiday.get("status") == "early-close":
-                return True
-        
-        return False
+        holiday = self._lookup(check_date, exchange)
+        return holiday is not None and holiday.is_early_close
     
     def get_holiday_info(self, check_date: Optional[date] = None, 
-                        exchange: Optional[str] = None) -> Optional[Dict[str, Any]]:
+                        exchange: Optional[str] = None) -> Optional[Holiday]:
         """Get complete holiday details for a date.
         
         Args:
@@ -129,20 +258,10 @@ class HolidayFetcher:
             exchange: Exchange code (uses default if not specified)
             
         Returns:
-            Full holiday dictionary if date is a holiday, None otherwise
+            Holiday record if date is a holiday, None otherwise
             Includes: date, name, status, open time (if early-close), close time
         """
-        check_date = check_date or date.today()
-        exchange = exchange or self.exchange
-        
-        holidays = self.fetch_holidays(exchange)
-        date_str = check_date.isoformat()
-        
-        for holiday in holidays:
-            if holiday.get("date") == date_str:
-                return holiday
-        
-        return None
+        return self._lookup(check_date, exchange)
     
     def is_trading_day(self, check_date: Optional[date] = None, 
                       exchange: Optional[str] = None, 
@@ -165,6 +284,26 @@ class HolidayFetcher:
         
         return not self.is_market_closed(check_date, exchange)
     
+    def get_calendar(self, exchange: Optional[str] = None) -> TradingCalendar:
+        """Get a vectorized trading calendar built from the fetched holidays.
+        
+        Rebuilt only when the holiday cache refreshes.
+        
+        Args:
+            exchange: Exchange code (uses default if not specified)
+            
+        Returns:
+            TradingCalendar for bulk date queries (weekdays minus closures,
+            early-close sessions tracked separately)
+        """
+        exchange = exchange or self.exchange
+        self._ensure_loaded()
+        calendar = self._calendars.get(exchange)
+        if calendar is None:
+            calendar = TradingCalendar.from_holidays(self._by_exchange.get(exchange, []))
+            self._calendars[exchange] = calendar
+        return calendar
+    
     def get_early_close_time(self, check_date: Optional[date] = None, 
                             exchange: Optional[str] = None) -> Optional[str]:
         """Get early close time if market closes early on this date.
@@ -178,7 +317,7 @@ class HolidayFetcher:
             None otherwise
         """
         holiday_info = self.get_holiday_info(check_date, exchange)
-        if holiday_info and holiday_info.get("status") == "early-close":
+        if holiday_info and holiday_info.is_early_close:
             return holiday_info.get("close")
         return None
     
@@ -194,7 +333,7 @@ class HolidayFetcher:
             Holiday name (e.g., "Thanksgiving", "Christmas") or None
         """
         holiday_info = self.get_holiday_info(check_date, exchange)
-        return holiday_info.get("name") if holiday_info else None
+        return holiday_info.name if holiday_info else None
 
 
 if __name__ == "__main__":
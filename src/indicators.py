@@ -0,0 +1,417 @@
+"""Vectorized technical indicators over locally stored aggregate bars.
+
+Replaces ``/v1/indicators/...`` calls (one rate-limited call per indicator,
+window and ticker) with NumPy over BarStore data. Inputs are panels: one row
+per ticker, bars left-aligned in time, rows shorter than the panel padded
+with trailing NaN. Every indicator runs column by column from a carried
+state, so the same code computes a full history or advances by just the
+bars appended since the last run.
+
+Conventions follow the usual definitions: EMA seeded with the SMA of its
+first ``n`` values; RSI and ATR use Wilder smoothing (alpha ``1/n``);
+Bollinger bands use the population standard deviation.
+"""
+
+import logging
+from typing import Dict, List, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from .bar_store import BarStore
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from bar_store import BarStore
+
+logger = logging.getLogger(__name__)
+
+State = Dict[str, np.ndarray]
+Outputs = Dict[str, np.ndarray]
+
+
+# -- Panels ------------------------------------------------------------------
+
+def as_panel(series: Iterable[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Left-align 1-D float series into a NaN-padded (tickers, time) panel.
+
+    Returns:
+        (panel, lengths)
+    """
+    series = [np.asarray(s, dtype=np.float64) for s in series]
+    lengths = np.array([len(s) for s in series], dtype=np.int64)
+    panel = np.full((len(series), int(lengths.max()) if len(series) else 0), np.nan)
+    for i, s in enumerate(series):
+        panel[i, :len(s)] = s
+    return panel, lengths
+
+
+def _as_2d(values) -> Tuple[np.ndarray, bool]:
+    values = np.asarray(values, dtype=np.float64)
+    return (values[np.newaxis, :], True) if values.ndim == 1 else (values, False)
+
+
+def _tail(values: np.ndarray, k: int) -> np.ndarray:
+    """Values up to and including each row's last non-NaN, ``k`` wide (NaN-padded on the left)."""
+    rows, width = values.shape
+    if width == 0:
+        return np.full((rows, k), np.nan)
+    valid = ~np.isnan(values)
+    end = np.where(valid.any(axis=1), width - np.argmax(valid[:, ::-1], axis=1), 0)
+    idx = end[:, np.newaxis] - k + np.arange(k)
+    out = np.take_along_axis(values, np.clip(idx, 0, width - 1), axis=1)
+    out[idx < 0] = np.nan
+    return out
+
+
+# Window elements materialized at once by _rolling (bounds its temporaries)
+_ROLLING_BLOCK = 1 << 22
+
+
+def _rolling(history: np.ndarray, values: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and sum of squared deviations over the last ``n`` values.
+
+    ``history`` holds the ``n - 1`` values before ``values`` (NaN if unknown).
+    Windows containing a NaN give NaN. Each window is summed directly and
+    the deviations are taken from its own mean (two passes), so precision
+    doesn't degrade with series length or price level the way differences
+    of whole-series cumulative sums do.
+    """
+    joined = np.concatenate([history, values], axis=1)
+    rows, width = values.shape
+    mean = np.full((rows, width), np.nan)
+    m2 = np.full((rows, width), np.nan)
+    step = max(1, _ROLLING_BLOCK // max(1, rows * n))
+    for start in range(0, width, step):
+        end = min(start + step, width)
+        windows = np.lib.stride_tricks.sliding_window_view(joined[:, start:end + n - 1], n, axis=1)
+        mean[:, start:end] = windows.sum(axis=2) / n
+        deviations = windows - mean[:, start:end, np.newaxis]
+        m2[:, start:end] = np.einsum("ijk,ijk->ij", deviations, deviations)
+    return mean, m2
+
+
+def _ema_state(rows: int) -> State:
+    return {"ema": np.full(rows, np.nan), "seen": np.zeros(rows, dtype=np.int64), "warm": np.zeros(rows)}
+
+
+def _ema_run(values: np.ndarray, state: State, n: int, alpha: float) -> Tuple[np.ndarray, State]:
+    """Exponential average along time, skipping NaN; seeded by the mean of the first ``n``.
+
+    Columns where some row is still seeding are stepped one at a time; the
+    rest is a blocked prefix scan of ``y = (1 - alpha) * y + alpha * x``.
+    """
+    ema, seen, warm = state["ema"].copy(), state["seen"].copy(), state["warm"].copy()
+    out = np.full(values.shape, np.nan)
+    valid_all = ~np.isnan(values)
+    t = 0
+    width = values.shape[1]
+    last_valid = np.where(valid_all.any(axis=1), width - 1 - np.argmax(valid_all[:, ::-1], axis=1), -1) \
+        if width else np.full(len(values), -1)
+    while t < width and ((seen < n) & (last_valid >= t)).any():
+        x = values[:, t]
+        valid = valid_all[:, t]
+        seeding = valid & (seen < n)
+        warm[seeding] += x[seeding]
+        seen[valid] += 1
+        seeded = seeding & (seen == n)
+        ema[seeded] = warm[seeded] / n
+        running = valid & ~seeding
+        ema[running] += alpha * (x[running] - ema[running])
+        out[valid & (seen >= n), t] = ema[valid & (seen >= n)]
+        t += 1
+
+    # Every remaining value belongs to a seeded row. Within a block,
+    # y_t = P_t * (y_0 + sum(c_k / P_k)) with P the running product of decays;
+    # blocks stay short enough that 1 / P_k keeps full precision.
+    decay = 1.0 - alpha
+    block = max(1, int(np.log(1e-6) / np.log(decay))) if decay > 0 else 1
+    seen += valid_all[:, t:].sum(axis=1)
+    while t < width:
+        end = min(t + block, width)
+        valid = valid_all[:, t:end]
+        factor = np.cumprod(np.where(valid, decay, 1.0), axis=1)
+        terms = np.where(valid, alpha * values[:, t:end], 0.0) / factor
+        ys = factor * (np.where(np.isnan(ema), 0.0, ema)[:, np.newaxis] + np.cumsum(terms, axis=1))
+        out[:, t:end] = np.where(valid, ys, np.nan)
+        ema = np.where(np.isnan(ema), ema, ys[:, -1])
+        t = end
+    return out, {"ema": ema, "seen": seen, "warm": warm}
+
+
+def _substate(state: State, prefix: str) -> State:
+    return {key[len(prefix):]: value for key, value in state.items() if key.startswith(prefix)}
+
+
+def _prefixed(state: State, prefix: str) -> State:
+    return {f"{prefix}{key}": value for key, value in state.items()}
+
+
+def _changes(close: np.ndarray, prev: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Bar-to-bar change (NaN for a row's first bar) and the new last close."""
+    previous = np.concatenate([prev[:, np.newaxis], close[:, :-1]], axis=1)
+    last = _tail(np.concatenate([prev[:, np.newaxis], close], axis=1), 1)[:, 0]
+    return close - previous, last
+
+
+# -- Indicators --------------------------------------------------------------
+
+class Indicator:
+    """Base class: ``run`` maps new bar columns plus state to outputs and a new state."""
+
+    fields: Tuple[str, ...] = ("c",)
+
+    def initial_state(self, rows: int) -> State:
+        raise NotImplementedError
+
+    def run(self, bars: Dict[str, np.ndarray], state: State) -> Tuple[Outputs, State]:
+        raise NotImplementedError
+
+    def __call__(self, *values) -> Union[np.ndarray, Outputs]:
+        """Full-history computation on 1-D series or left-aligned panels."""
+        arrays = [_as_2d(v) for v in values]
+        single = arrays[0][1]
+        bars = {name: array for name, (array, _) in zip(self.fields, arrays)}
+        outputs, _ = self.run(bars, self.initial_state(len(arrays[0][0])))
+        if single:
+            outputs = {key: value[0] for key, value in outputs.items()}
+        return outputs["value"] if list(outputs) == ["value"] else outputs
+
+
+class SMA(Indicator):
+    """Simple moving average of close."""
+
+    def __init__(self, n: int = 20):
+        self.n = n
+
+    def initial_state(self, rows: int) -> State:
+        return {"history": np.full((rows, self.n - 1), np.nan)}
+
+    def run(self, bars, state):
+        close = bars["c"]
+        value, _ = _rolling(state["history"], close, self.n)
+        history = _tail(np.concatenate([state["history"], close], axis=1), self.n - 1)
+        return {"value": value}, {"history": history}
+
+
+class EMA(Indicator):
+    """Exponential moving average of close (alpha ``2 / (n + 1)``)."""
+
+    def __init__(self, n: int = 20):
+        self.n = n
+
+    def initial_state(self, rows: int) -> State:
+        return _ema_state(rows)
+
+    def run(self, bars, state):
+        value, state = _ema_run(bars["c"], state, self.n, 2.0 / (self.n + 1))
+        return {"value": value}, state
+
+
+class RSI(Indicator):
+    """Relative strength index (Wilder), 0-100."""
+
+    def __init__(self, n: int = 14):
+        self.n = n
+
+    def initial_state(self, rows: int) -> State:
+        return {"prev": np.full(rows, np.nan), **_prefixed(_ema_state(rows), "gain_"),
+                **_prefixed(_ema_state(rows), "loss_")}
+
+    def run(self, bars, state):
+        change, prev = _changes(bars["c"], state["prev"])
+        # np.maximum keeps NaN (a row's first bar), so it stays out of the averages
+        gain, gain_state = _ema_run(np.maximum(change, 0.0), _substate(state, "gain_"), self.n, 1.0 / self.n)
+        loss, loss_state = _ema_run(np.maximum(-change, 0.0), _substate(state, "loss_"), self.n, 1.0 / self.n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            value = np.where(loss == 0, 100.0, 100.0 - 100.0 / (1.0 + gain / loss))
+        value[np.isnan(gain)] = np.nan
+        return {"value": value}, {"prev": prev, **_prefixed(gain_state, "gain_"),
+                                  **_prefixed(loss_state, "loss_")}
+
+
+class MACD(Indicator):
+    """MACD line (fast EMA - slow EMA), its signal EMA and the histogram."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast, self.slow, self.signal = fast, slow, signal
+
+    def initial_state(self, rows: int) -> State:
+        return {**_prefixed(_ema_state(rows), "fast_"), **_prefixed(_ema_state(rows), "slow_"),
+                **_prefixed(_ema_state(rows), "signal_")}
+
+    def run(self, bars, state):
+        fast, fast_state = _ema_run(bars["c"], _substate(state, "fast_"), self.fast, 2.0 / (self.fast + 1))
+        slow, slow_state = _ema_run(bars["c"], _substate(state, "slow_"), self.slow, 2.0 / (self.slow + 1))
+        macd = fast - slow
+        signal, signal_state = _ema_run(macd, _substate(state, "signal_"), self.signal, 2.0 / (self.signal + 1))
+        return {"macd": macd, "signal": signal, "hist": macd - signal}, \
+            {**_prefixed(fast_state, "fast_"), **_prefixed(slow_state, "slow_"), **_prefixed(signal_state, "signal_")}
+
+
+class Bollinger(Indicator):
+    """Bollinger bands: SMA middle band +/- ``k`` standard deviations."""
+
+    def __init__(self, n: int = 20, k: float = 2.0):
+        self.n, self.k = n, k
+
+    def initial_state(self, rows: int) -> State:
+        return {"history": np.full((rows, self.n - 1), np.nan)}
+
+    def run(self, bars, state):
+        close = bars["c"]
+        middle, m2 = _rolling(state["history"], close, self.n)
+        std = np.sqrt(m2 / self.n)
+        history = _tail(np.concatenate([state["history"], close], axis=1), self.n - 1)
+        return {"middle": middle, "upper": middle + self.k * std, "lower": middle - self.k * std}, \
+            {"history": history}
+
+
+class ATR(Indicator):
+    """Average true range (Wilder)."""
+
+    fields = ("h", "l", "c")
+
+    def __init__(self, n: int = 14):
+        self.n = n
+
+    def initial_state(self, rows: int) -> State:
+        return {"prev": np.full(rows, np.nan), **_prefixed(_ema_state(rows), "tr_")}
+
+    def run(self, bars, state):
+        high, low, close = bars["h"], bars["l"], bars["c"]
+        previous = np.concatenate([state["prev"][:, np.newaxis], close[:, :-1]], axis=1)
+        true_range = high - low
+        gap = np.fmax(np.abs(high - previous), np.abs(low - previous))  # fmax ignores a missing previous close
+        true_range = np.fmax(true_range, gap)
+        true_range[np.isnan(high - low)] = np.nan
+        value, ema_state = _ema_run(true_range, _substate(state, "tr_"), self.n, 1.0 / self.n)
+        prev = _tail(np.concatenate([state["prev"][:, np.newaxis], close], axis=1), 1)[:, 0]
+        return {"value": value}, {"prev": prev, **_prefixed(ema_state, "tr_")}
+
+
+def sma(close, n: int = 20) -> np.ndarray:
+    """Simple moving average of a series or panel."""
+    return SMA(n)(close)
+
+
+def ema(close, n: int = 20) -> np.ndarray:
+    """Exponential moving average of a series or panel."""
+    return EMA(n)(close)
+
+
+def rsi(close, n: int = 14) -> np.ndarray:
+    """Wilder RSI of a series or panel."""
+    return RSI(n)(close)
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Outputs:
+    """MACD line, signal and histogram of a series or panel."""
+    return MACD(fast, slow, signal)(close)
+
+
+def bollinger(close, n: int = 20, k: float = 2.0) -> Outputs:
+    """Bollinger middle/upper/lower bands of a series or panel."""
+    return Bollinger(n, k)(close)
+
+
+def atr(high, low, close, n: int = 14) -> np.ndarray:
+    """Wilder ATR of a series or panel."""
+    return ATR(n)(high, low, close)
+
+
+# -- Engine ------------------------------------------------------------------
+
+class IndicatorEngine:
+    """Keeps indicators current for many tickers from a BarStore.
+
+    Each ``update`` reads only the bars appended since the previous one,
+    stacks them into a panel (one row per ticker) and advances every
+    indicator from its saved state, so the cost is proportional to new bars,
+    not history. No API calls are made. If bars were merged in before a
+    ticker's newest one (e.g. backfilled history), that ticker's state is
+    rebuilt from its first stored bar.
+    """
+
+    def __init__(self, store: BarStore, indicators: Dict[str, Indicator], timespan: str = "day"):
+        """Initialize indicator engine.
+
+        Args:
+            store: Bar store holding the series
+            indicators: Output name -> indicator, e.g. ``{"sma50": SMA(50)}``
+            timespan: BarStore series name
+        """
+        self.store = store
+        self.indicators = indicators
+        self.timespan = timespan
+        self._rows: Dict[str, int] = {}
+        self._last_t: List[Optional[int]] = []
+        self._consumed: List[int] = []  # Stored bars already folded into each row's state
+        self._latest: Dict[str, np.ndarray] = {}  # Output name -> latest value per row
+        self._states: Dict[str, State] = {name: ind.initial_state(0) for name, ind in indicators.items()}
+
+    def _ensure_rows(self, tickers: List[str]):
+        new = [t for t in dict.fromkeys(tickers) if t not in self._rows]
+        if not new:
+            return
+        for ticker in new:
+            self._rows[ticker] = len(self._rows)
+            self._last_t.append(None)
+            self._consumed.append(0)
+        for name, indicator in self.indicators.items():
+            fresh = indicator.initial_state(len(new))
+            self._states[name] = {key: np.concatenate([self._states[name][key], fresh[key]])
+                                  for key in fresh}
+        for label, values in self._latest.items():
+            self._latest[label] = np.concatenate([values, np.full(len(new), np.nan)])
+
+    def _reset_row(self, row: int):
+        """Return a row to its initial state so it is recomputed from the first bar."""
+        self._last_t[row] = None
+        self._consumed[row] = 0
+        for name, indicator in self.indicators.items():
+            fresh = indicator.initial_state(1)
+            for key, value in fresh.items():
+                self._states[name][key][row] = value[0]
+
+    def update(self, tickers: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Advance every indicator over bars appended since the last update.
+
+        Args:
+            tickers: Tickers to update (new ones start from their first stored bar)
+
+        Returns:
+            Output name -> latest value per ticker (in ``tickers`` order; NaN
+            while an indicator is still warming up)
+        """
+        tickers = list(tickers)
+        self._ensure_rows(tickers)
+        rows = np.array([self._rows[t] for t in tickers], dtype=np.int64)
+
+        new_bars = []
+        for ticker, row in zip(tickers, rows):
+            last = self._last_t[row]
+            bars = self.store.read(ticker, self.timespan, start=None if last is None else last + 1)
+            if last is not None and self.store.count(ticker, self.timespan) != self._consumed[row] + len(bars):
+                logger.info(f"🔁 {ticker}: bars were merged into stored history; recomputing indicators")
+                self._reset_row(row)
+                bars = self.store.read(ticker, self.timespan)
+            if len(bars):
+                self._last_t[row] = int(bars["t"][-1])
+                self._consumed[row] += len(bars)
+            new_bars.append(bars)
+        panel = {field: as_panel([bars[field] for bars in new_bars])[0] for field in ("h", "l", "c")}
+        lengths = np.array([len(bars) for bars in new_bars], dtype=np.int64)
+        has_new = lengths > 0
+
+        latest: Dict[str, np.ndarray] = {}
+        for name, indicator in self.indicators.items():
+            state = {key: value[rows] for key, value in self._states[name].items()}
+            outputs, state = indicator.run({field: panel[field] for field in indicator.fields}, state)
+            for key, value in state.items():
+                self._states[name][key][rows] = value
+            for key, values in outputs.items():
+                label = name if key == "value" else f"{name}.{key}"
+                store = self._latest.setdefault(label, np.full(len(self._rows), np.nan))
+                # Value at each row's newest bar; rows without new bars keep theirs
+                store[rows[has_new]] = values[has_new, lengths[has_new] - 1]
+                latest[label] = store[rows]
+        return latest
@@ -0,0 +1,177 @@
+"""Pool of API keys, each with its own rate-limit window."""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Any, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class NoKeysAvailableError(RuntimeError):
+    """Every key in the pool was rejected (401) or is forbidden for the endpoint."""
+
+
+class _KeyState:
+    __slots__ = ("key", "calls", "cooldown_until", "disabled", "forbidden", "last_used",
+                 "shared", "shared_ready")
+
+    def __init__(self, key: str, calls_per_minute: int):
+        self.key = key
+        self.calls: deque = deque(maxlen=calls_per_minute)
+        self.cooldown_until = 0.0
+        self.disabled: Optional[str] = None
+        self.forbidden: set = set()  # Endpoint templates this key got a 403 for
+        self.last_used = 0.0
+        self.shared = None  # Host-wide window for this key (see KeyPool.share_windows)
+        self.shared_ready = 0.0
+
+
+def mask_key(key: str) -> str:
+    """Log-safe form of an API key."""
+    return f"…{key[-4:]}" if len(key) > 4 else "…"
+
+
+def key_id(key: str) -> str:
+    """Stable, non-reversible id of an API key (e.g. for state file names)."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+class KeyPool:
+    """Dispatches calls to whichever key can fire soonest.
+
+    Every key has its own sliding window of ``calls_per_minute`` per
+    ``period`` (the same contract as RateLimiter), so N keys give roughly N
+    times the throughput. Ties go to the least recently used key.
+
+    Keys leave rotation automatically:
+
+    - 401: the key is disabled for the life of the pool
+    - 403: the key is skipped for that endpoint template only (plans differ)
+    - 429: the key cools down for Retry-After (or ``cooldown``) seconds
+    """
+
+    def __init__(self, keys: Sequence[str], calls_per_minute: int = 5, period: float = 60,
+                 cooldown: float = 60):
+        """Initialize key pool.
+
+        Args:
+            keys: API keys (duplicates are ignored)
+            calls_per_minute: Calls allowed per key per window
+            period: Window length in seconds
+            cooldown: Seconds a key rests after a 429 without Retry-After
+        """
+        keys = list(dict.fromkeys(k for k in keys if k))
+        if not keys:
+            raise ValueError("KeyPool needs at least one API key")
+        self.calls_per_minute = calls_per_minute
+        self.period = period
+        self.cooldown = cooldown
+        self._states = [_KeyState(key, calls_per_minute) for key in keys]
+        self._by_key = {state.key: state for state in self._states}
+        self._cond = threading.Condition()
+
+    @property
+    def keys(self) -> List[str]:
+        return [state.key for state in self._states]
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def share_windows(self, limiter_for: Callable[[str], Any]):
+        """Also hold each key to a window shared with other processes.
+
+        Args:
+            limiter_for: Called once per key; returns an object whose
+                ``try_acquire()`` takes a slot and returns 0, or returns the
+                seconds to wait (e.g. a SharedRateLimiter on a per-key file)
+        """
+        with self._cond:
+            for state in self._states:
+                state.shared = limiter_for(state.key)
+
+    def _ready_at(self, state: _KeyState, now: float) -> float:
+        ready = max(now, state.cooldown_until, state.shared_ready)
+        if len(state.calls) >= self.calls_per_minute:
+            ready = max(ready, state.calls[0] + self.period)
+        return ready
+
+    def _candidates(self, template: Optional[str]) -> List[_KeyState]:
+        return [s for s in self._states if s.disabled is None and template not in s.forbidden]
+
+    def has_key_for(self, template: Optional[str] = None) -> bool:
+        """Whether any key is still usable for an endpoint template."""
+        with self._cond:
+            return bool(self._candidates(template))
+
+    def acquire(self, template: Optional[str] = None) -> str:
+        """Block until a key may fire, record the call and return the key.
+
+        Args:
+            template: Endpoint template (keys forbidden for it are skipped)
+
+        Raises:
+            NoKeysAvailableError: No usable key is left
+        """
+        with self._cond:
+            while True:
+                candidates = self._candidates(template)
+                if not candidates:
+                    raise NoKeysAvailableError(
+                        f"No usable API key for {template or 'any endpoint'} "
+                        f"({len(self._states)} in pool)"
+                    )
+                now = time.monotonic()
+                best = min(candidates, key=lambda s: (self._ready_at(s, now), s.last_used))
+                ready = self._ready_at(best, now)
+                if ready <= now and best.shared is not None:
+                    # Other processes may have used this key's window
+                    shared_wait = best.shared.try_acquire()
+                    if shared_wait:
+                        best.shared_ready = now + shared_wait
+                        continue
+                if ready <= now:
+                    best.calls.append(now)
+                    best.last_used = now
+                    return best.key
+                wait_time = ready - now
+                logger.info(f"⏳ Rate limit: {len(candidates)} key(s) busy; waiting {wait_time:.1f}s...")
+                self._cond.wait(wait_time)
+
+    def report(self, key: str, status: int, template: Optional[str] = None,
+               retry_after: Optional[float] = None):
+        """Feed back a response status for a key taken from ``acquire``."""
+        with self._cond:
+            state = self._by_key.get(key)
+            if state is None:
+                return
+            if status == 401:
+                state.disabled = "401 Unauthorized"
+                logger.warning(f"🔑 API key {mask_key(key)} rejected (401); removed from rotation")
+            elif status == 403:
+                state.forbidden.add(template)
+                logger.warning(f"🚫 API key {mask_key(key)} not entitled to {template}; using other keys")
+            elif status == 429:
+                rest = self.cooldown if retry_after is None else retry_after
+                state.cooldown_until = max(state.cooldown_until, time.monotonic() + rest)
+                logger.warning(f"🧊 API key {mask_key(key)} rate limited; cooling down {rest:.1f}s")
+            else:
+                return
+            self._cond.notify_all()
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Per-key state (keys masked) for logging and dashboards."""
+        with self._cond:
+            now = time.monotonic()
+            return [
+                {
+                    "key": mask_key(state.key),
+                    "calls_in_window": sum(1 for t in state.calls if now - t < self.period),
+                    "ready_in": max(0.0, self._ready_at(state, now) - now),
+                    "disabled": state.disabled,
+                    "forbidden": sorted(state.forbidden, key=str),
+                }
+                for state in self._states
+            ]
@@ -0,0 +1,232 @@
+"""Per-endpoint request metrics for MassiveAPIClient."""
+
+import bisect
+import logging
+import threading
+from typing import Dict, List, Any, Callable, Optional, Sequence
+
+try:
+    from .endpoints import endpoint_template
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from endpoints import endpoint_template
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram upper bounds in seconds (Prometheus-style, +Inf implied)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CACHE_HIT = "hit"
+CACHE_REVALIDATED = "revalidated"
+
+
+class RequestEvent:
+    """One logical ``_make_request`` call, passed to hooks.
+
+    Timings are in seconds. ``network`` covers every attempt's round trip
+    (including the body download); ``backoff`` is time slept between retries.
+    """
+
+    __slots__ = ("endpoint", "template", "method", "params", "status", "attempts",
+                 "latency", "wait", "network", "backoff", "decode", "bytes", "cache", "error")
+
+    def __init__(self, endpoint: str, method: str = "GET", params: Optional[Dict[str, Any]] = None,
+                 template: Optional[str] = None):
+        self.endpoint = endpoint
+        self.template = template or endpoint_template(endpoint)
+        self.method = method
+        self.params = params
+        self.status: Optional[int] = None
+        self.attempts = 0
+        self.latency = 0.0
+        self.wait = 0.0
+        self.network = 0.0
+        self.backoff = 0.0
+        self.decode = 0.0
+        self.bytes = 0
+        self.cache: Optional[str] = None
+        self.error: Optional[str] = None
+
+    def __repr__(self):
+        return (f"RequestEvent({self.method} {self.template} status={self.status} "
+                f"latency={self.latency:.3f}s wait={self.wait:.3f}s)")
+
+
+class EndpointStats:
+    """Running totals and latency histogram for one endpoint template."""
+
+    __slots__ = ("requests", "attempts", "errors", "cache_hits", "statuses", "bucket_counts",
+                 "latency_sum", "wait_sum", "network_sum", "backoff_sum", "decode_sum", "bytes")
+
+    def __init__(self, n_buckets: int):
+        self.requests = 0
+        self.attempts = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.statuses: Dict[int, int] = {}
+        self.bucket_counts = [0] * (n_buckets + 1)  # Last slot is +Inf
+        self.latency_sum = 0.0
+        self.wait_sum = 0.0
+        self.network_sum = 0.0
+        self.backoff_sum = 0.0
+        self.decode_sum = 0.0
+        self.bytes = 0
+
+
+class ClientMetrics:
+    """Collects per-endpoint-template metrics and runs request hooks.
+
+    Endpoints are grouped with ``endpoint_template`` so every ticker/date
+    shares one series. Export with ``snapshot()`` (dict) or
+    ``to_prometheus()`` (text exposition format).
+
+    Hooks are callables taking a RequestEvent: ``before`` ones see only
+    endpoint/template/method/params, ``after`` ones see the finished event.
+    A failing hook is logged and never breaks the request.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize metrics.
+
+        Args:
+            buckets: Latency histogram upper bounds in seconds, ascending
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._stats: Dict[str, EndpointStats] = {}
+        self._before: List[Callable[[RequestEvent], None]] = []
+        self._after: List[Callable[[RequestEvent], None]] = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, before: Optional[Callable[[RequestEvent], None]] = None,
+                 after: Optional[Callable[[RequestEvent], None]] = None):
+        """Register callables run before and/or after every request."""
+        if before is not None:
+            self._before.append(before)
+        if after is not None:
+            self._after.append(after)
+
+    def remove_hook(self, hook: Callable[[RequestEvent], None]):
+        """Unregister a hook added with ``add_hook``."""
+        for hooks in (self._before, self._after):
+            if hook in hooks:
+                hooks.remove(hook)
+
+    def start(self, endpoint: str, method: str = "GET", params: Optional[Dict[str, Any]] = None,
+              template: Optional[str] = None) -> RequestEvent:
+        """Create the event for a request and run ``before`` hooks."""
+        event = RequestEvent(endpoint, method, params, template)
+        self._run_hooks(self._before, event)
+        return event
+
+    def finish(self, event: RequestEvent):
+        """Record a finished event and run ``after`` hooks."""
+        with self._lock:
+            stats = self._stats.get(event.template)
+            if stats is None:
+                stats = self._stats[event.template] = EndpointStats(len(self.buckets))
+            stats.requests += 1
+            stats.attempts += event.attempts
+            if event.error:
+                stats.errors += 1
+            if event.cache == CACHE_HIT:
+                stats.cache_hits += 1
+            if event.status is not None:
+                stats.statuses[event.status] = stats.statuses.get(event.status, 0) + 1
+            stats.bucket_counts[bisect.bisect_left(self.buckets, event.latency)] += 1
+            stats.latency_sum += event.latency
+            stats.wait_sum += event.wait
+            stats.network_sum += event.network
+            stats.backoff_sum += event.backoff
+            stats.decode_sum += event.decode
+            stats.bytes += event.bytes
+        self._run_hooks(self._after, event)
+
+    @staticmethod
+    def _run_hooks(hooks: List[Callable[[RequestEvent], None]], event: RequestEvent):
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception as e:
+                logger.warning(f"Request hook {hook!r} failed: {e}")
+
+    def reset(self):
+        """Drop all collected metrics (hooks are kept)."""
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics per endpoint template as plain dicts."""
+        with self._lock:
+            result = {}
+            for template, stats in sorted(self._stats.items()):
+                cumulative = 0
+                histogram = {}
+                for bound, count in zip(self.buckets + (float("inf"),), stats.bucket_counts):
+                    cumulative += count
+                    histogram[bound] = cumulative
+                result[template] = {
+                    "requests": stats.requests,
+                    "attempts": stats.attempts,
+                    "errors": stats.errors,
+                    "cache_hits": stats.cache_hits,
+                    "statuses": dict(stats.statuses),
+                    "latency_seconds": {
+                        "sum": stats.latency_sum,
+                        "mean": stats.latency_sum / stats.requests,
+                        "buckets": histogram,
+                    },
+                    "rate_limit_wait_seconds": stats.wait_sum,
+                    "network_seconds": stats.network_sum,
+                    "retry_backoff_seconds": stats.backoff_sum,
+                    "decode_seconds": stats.decode_sum,
+                    "response_bytes": stats.bytes,
+                }
+            return result
+
+    def to_prometheus(self, prefix: str = "massive") -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        counters = [
+            ("requests_total", "requests", "Logical API requests"),
+            ("request_attempts_total", "attempts", "HTTP attempts including retries"),
+            ("request_errors_total", "errors", "Requests that raised"),
+            ("cache_hits_total", "cache_hits", "Requests served fresh from the response cache"),
+            ("rate_limit_wait_seconds_total", "rate_limit_wait_seconds", "Time spent waiting on the rate limiter"),
+            ("network_seconds_total", "network_seconds", "Time spent in HTTP round trips"),
+            ("retry_backoff_seconds_total", "retry_backoff_seconds", "Time spent sleeping between retries"),
+            ("decode_seconds_total", "decode_seconds", "Time spent parsing JSON responses"),
+            ("response_bytes_total", "response_bytes", "Response body bytes received"),
+        ]
+        for name, key, help_text in counters:
+            family(name, "counter", help_text)
+            for template, stats in snapshot.items():
+                lines.append(f'{prefix}_{name}{{endpoint="{_escape(template)}"}} {_number(stats[key])}')
+
+        family("responses_total", "counter", "Final HTTP responses by status")
+        for template, stats in snapshot.items():
+            for status, count in sorted(stats["statuses"].items()):
+                lines.append(f'{prefix}_responses_total{{endpoint="{_escape(template)}",status="{status}"}} {count}')
+
+        family("request_duration_seconds", "histogram", "End-to-end request latency")
+        for template, stats in snapshot.items():
+            label = f'endpoint="{_escape(template)}"'
+            for bound, count in stats["latency_seconds"]["buckets"].items():
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{label},le="{le}"}} {count}')
+            lines.append(f"{prefix}_request_duration_seconds_sum{{{label}}} {_number(stats['latency_seconds']['sum'])}")
+            lines.append(f"{prefix}_request_duration_seconds_count{{{label}}} {stats['requests']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
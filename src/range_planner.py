@@ -0,0 +1,229 @@
+"""Plan and fetch large aggregate ranges in the fewest capped calls."""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .bar_store import BarStore, bars_to_array, series_name
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from bar_store import BarStore, bars_to_array, series_name
+
+logger = logging.getLogger(__name__)
+
+# Server-side cap on base aggregates per /v2/aggs range response
+RESULT_CAP = 50000
+
+# Estimated multiplier-1 bars per trading session. Stocks trade pre/post
+# market 04:00-20:00 ET (16h); fx and crypto trade around the clock.
+SESSION_BARS = {
+    "stocks": {"second": 57600, "minute": 960, "hour": 16, "day": 1},
+    "fx": {"second": 86400, "minute": 1440, "hour": 24, "day": 1},
+    "crypto": {"second": 86400, "minute": 1440, "hour": 24, "day": 1},
+}
+# Longer spans never come close to the cap
+_LONG_SPANS = {"week", "month", "quarter", "year"}
+
+Chunk = Tuple[date, date]
+
+
+class RangeFetchError(Exception):
+    """A chunked fetch stopped part-way; carries what's needed to resume."""
+
+    def __init__(self, message: str, completed: List[Chunk], remaining: List[Chunk],
+                 bars: np.ndarray):
+        super().__init__(message)
+        self.completed = completed
+        self.remaining = remaining
+        self.bars = bars
+
+
+class RangePlanner:
+    """Splits ``/v2/aggs/ticker/.../range`` queries into cap-sized chunks.
+
+    Bars per chunk are estimated from the trading calendar (weekends and,
+    when a calendar is given, exchange holidays) so each call asks for as
+    much as fits under ``RESULT_CAP`` and no more calls than necessary.
+    """
+
+    def __init__(self, client, calendar=None, market: str = "stocks",
+                 result_cap: int = RESULT_CAP, safety: float = 0.9):
+        """Initialize range planner.
+
+        Args:
+            client: MassiveAPIClient used to fetch chunks
+            calendar: Object with ``is_trading_day(date)`` (e.g. HolidayFetcher).
+                Defaults to weekdays for stocks/fx and every day for crypto
+            market: stocks, fx or crypto (sets session length)
+            result_cap: Maximum bars the server returns per call
+            safety: Fraction of the cap to plan for (extended sessions,
+                estimate error)
+        """
+        if market not in SESSION_BARS:
+            raise ValueError(f"Unknown market '{market}'. Use one of {sorted(SESSION_BARS)}")
+        self.client = client
+        self.calendar = calendar
+        self.market = market
+        self.result_cap = result_cap
+        self.safety = safety
+
+    def is_trading_day(self, day: date) -> bool:
+        """Whether ``day`` has a session for this market."""
+        if self.calendar is not None:
+            return bool(self.calendar.is_trading_day(day))
+        if self.market == "crypto":
+            return True
+        return day.weekday() < 5
+
+    def bars_per_day(self, timespan: str, multiplier: int = 1) -> float:
+        """Estimated bars in one trading session."""
+        if timespan in _LONG_SPANS:
+            return 1 / multiplier
+        try:
+            return SESSION_BARS[self.market][timespan] / multiplier
+        except KeyError:
+            raise ValueError(f"Unsupported timespan '{timespan}'")
+
+    def plan(self, start: date, end: date, timespan: str, multiplier: int = 1) -> List[Chunk]:
+        """Split ``start..end`` (inclusive) into the fewest chunks under the cap.
+
+        Chunks are contiguous and cover every calendar day, so nothing is
+        skipped if the calendar is wrong; non-trading days just cost nothing
+        in the estimate.
+
+        Returns:
+            List of (chunk_start, chunk_end) dates
+        """
+        if end < start:
+            return []
+
+        budget = self.result_cap * self.safety
+        per_day = self.bars_per_day(timespan, multiplier)
+        chunks: List[Chunk] = []
+        chunk_start = start
+        estimate = 0.0
+        day = start
+        while day <= end:
+            day_bars = per_day if self.is_trading_day(day) else 0.0
+            if estimate and estimate + day_bars > budget:
+                chunks.append((chunk_start, day - timedelta(days=1)))
+                chunk_start = day
+                estimate = 0.0
+            estimate += day_bars
+            day += timedelta(days=1)
+        chunks.append((chunk_start, end))
+        return chunks
+
+    def _gaps(self, store: BarStore, ticker: str, series: str, start: date, end: date) -> List[Chunk]:
+        """Parts of ``start..end`` with trading days the store doesn't cover."""
+        covered = store.coverage(ticker, series)
+        first, last = store.first_timestamp(ticker, series), store.last_timestamp(ticker, series)
+        if not covered and first is not None:
+            # Series stored before coverage was recorded: trust first..last bar,
+            # except today, which may still be trading
+            first_day = datetime.fromtimestamp(first / 1000, tz=timezone.utc).date()
+            last_day = datetime.fromtimestamp(last / 1000, tz=timezone.utc).date()
+            if last_day >= datetime.now(timezone.utc).date():
+                last_day -= timedelta(days=1)
+            covered = [(first_day, last_day)]
+
+        gaps = []
+        day = start
+        for covered_start, covered_end in covered:
+            if covered_end < day:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > day:
+                gaps.append((day, covered_start - timedelta(days=1)))
+            day = covered_end + timedelta(days=1)
+        if day <= end:
+            gaps.append((day, end))
+        return [(a, b) for a, b in gaps if self._has_trading_day(a, b)]
+
+    def _has_trading_day(self, start: date, end: date) -> bool:
+        day = start
+        while day <= end:
+            if self.is_trading_day(day):
+                return True
+            day += timedelta(days=1)
+        return False
+
+    @staticmethod
+    def series_name(timespan: str, multiplier: int = 1, adjusted: bool = True) -> str:
+        """BarStore series name for a multiplier/timespan pair (see ``bar_store.series_name``)."""
+        return series_name(timespan, multiplier, adjusted)
+
+    def fetch(self, ticker: str, start: date, end: date, timespan: str = "minute",
+              multiplier: int = 1, store: Optional[BarStore] = None,
+              adjusted: bool = True) -> np.ndarray:
+        """Fetch a range with the planned chunks, stitching and deduplicating.
+
+        With a ``store`` each completed chunk is appended immediately and
+        recorded as covered, so a re-run (or a wider or older range) only
+        fetches the days the store doesn't cover yet. Adjusted and
+        unadjusted bars go to separate series (``series_name``).
+
+        Returns:
+            BAR_DTYPE array for ``start..end`` (a store view when ``store`` is given)
+
+        Raises:
+            RangeFetchError: A chunk failed; ``remaining`` can be passed to
+                ``fetch_chunks`` to resume
+        """
+        if store is None:
+            chunks = self.plan(start, end, timespan, multiplier)
+        else:
+            chunks = []
+            for gap_start, gap_end in self._gaps(store, ticker, self.series_name(timespan, multiplier, adjusted),
+                                                 start, end):
+                chunks += self.plan(gap_start, gap_end, timespan, multiplier)
+            logger.info(f"Fetching {len(chunks)} chunk(s) of {ticker} {timespan} missing from the store")
+
+        bars = self.fetch_chunks(ticker, chunks, timespan, multiplier, store, adjusted)
+        if store is not None:
+            return store.read(ticker, self.series_name(timespan, multiplier, adjusted), start, end)
+        return bars
+
+    def fetch_chunks(self, ticker: str, chunks: List[Chunk], timespan: str = "minute",
+                     multiplier: int = 1, store: Optional[BarStore] = None,
+                     adjusted: bool = True) -> np.ndarray:
+        """Fetch explicit chunks in order (see ``fetch``)."""
+        parts: List[np.ndarray] = []
+        for i, (chunk_start, chunk_end) in enumerate(chunks):
+            try:
+                results = self.client.get_aggregates(
+                    ticker, multiplier, timespan,
+                    chunk_start.isoformat(), chunk_end.isoformat(), adjusted=adjusted,
+                    as_array=True,
+                )
+            except Exception as e:
+                logger.error(f"Chunk {chunk_start}..{chunk_end} for {ticker} failed: {e}")
+                raise RangeFetchError(
+                    f"Fetch of {ticker} stopped at chunk {chunk_start}..{chunk_end}: {e}",
+                    completed=chunks[:i], remaining=chunks[i:], bars=_stitch(parts),
+                ) from e
+
+            part = bars_to_array(results)
+            parts.append(part)
+            if store is not None:
+                series = self.series_name(timespan, multiplier, adjusted)
+                store.append(ticker, series, part)
+                # Today's bars may still change, so today is never marked complete
+                covered_end = min(chunk_end, datetime.now(timezone.utc).date() - timedelta(days=1))
+                if chunk_start <= covered_end:
+                    store.add_coverage(ticker, series, chunk_start, covered_end)
+            logger.info(f"Fetched {len(part)} {timespan} bars for {ticker} ({chunk_start}..{chunk_end})")
+
+        return _stitch(parts)
+
+
+def _stitch(parts: List[np.ndarray]) -> np.ndarray:
+    """Concatenate chunk results, sorted by ``t`` with duplicates removed."""
+    if not parts:
+        return bars_to_array([])
+    bars = np.concatenate(parts)
+    _, first = np.unique(bars["t"], return_index=True)
+    return bars[first]
@@ -0,0 +1,279 @@
+"""Compact typed records for holidays, dividends, splits, tickers and aggregate bars.
+
+Records keep their fields in ``__slots__`` with dates parsed once (``date``
+objects, timestamps as Unix ms ints) instead of one dict per row. They are
+read-only ``Mapping``s that present the original API form, so existing
+``record["date"]`` / ``record.get("close")`` code (and ``record == dict``)
+keeps working; typed values are the attributes (``holiday.date``).
+"""
+
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime, timezone
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+try:
+    from .bar_store import BAR_DTYPE, bars_to_array
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from bar_store import BAR_DTYPE, bars_to_array
+
+
+def _parse_date(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return value  # Unparseable values are kept as-is
+
+
+def _parse_time_ms(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return int(moment.timestamp() * 1000)
+    return value
+
+
+def _format_time_ms(value: int) -> str:
+    """Unix ms -> API timestamp ("2024-11-29T18:00:00.000Z")."""
+    moment = datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+    return f"{moment:%Y-%m-%dT%H:%M:%S}.{value % 1000:03d}Z"
+
+
+class Record(Mapping):
+    """Base for slotted API records with read-only dict access.
+
+    Subclasses list their API keys in ``_FIELDS`` (also their slot names).
+    Keys the class doesn't know about are kept in ``extra``.
+    """
+
+    __slots__ = ("extra",)
+    _FIELDS: tuple = ()
+    _DATE_FIELDS: frozenset = frozenset()
+    _TIME_FIELDS: frozenset = frozenset()
+
+    def __init__(self, **fields):
+        for name in self._FIELDS:
+            setattr(self, name, fields.pop(name, None))
+        self.extra: Optional[Dict[str, Any]] = fields or None
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "Record":
+        """Build a record from an API dict, parsing dates and timestamps."""
+        if isinstance(raw, cls):
+            return raw
+        record = cls.__new__(cls)
+        for name in cls._FIELDS:
+            value = raw.get(name)
+            if value is not None:
+                if name in cls._DATE_FIELDS:
+                    value = _parse_date(value)
+                elif name in cls._TIME_FIELDS:
+                    value = _parse_time_ms(value)
+            setattr(record, name, value)
+        extra = {key: value for key, value in raw.items() if key not in cls._FIELDS}
+        record.extra = extra or None
+        return record
+
+    @classmethod
+    def from_list(cls, records: Iterable[Dict[str, Any]]) -> List["Record"]:
+        """Convert a list of API dicts."""
+        return [cls.from_dict(record) for record in records]
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                if isinstance(value, date):
+                    return value.isoformat()
+                if key in self._TIME_FIELDS and isinstance(value, int):
+                    return _format_time_ms(value)
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self._FIELDS:
+            if getattr(self, name) is not None:
+                yield name
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The record in its API (JSON-serializable) form."""
+        return dict(self.items())
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._FIELDS
+                           if getattr(self, name) is not None)
+        return f"{self.__class__.__name__}({fields})"
+
+
+class Holiday(Record):
+    """A /v1/marketstatus/upcoming entry (``open``/``close`` in Unix ms)."""
+
+    _FIELDS = ("date", "exchange", "name", "status", "open", "close")
+    _DATE_FIELDS = frozenset({"date"})
+    _TIME_FIELDS = frozenset({"open", "close"})
+    __slots__ = _FIELDS
+
+    @property
+    def is_closed(self) -> bool:
+        return self.status == "closed"
+
+    @property
+    def is_early_close(self) -> bool:
+        return self.status == "early-close"
+
+
+class Dividend(Record):
+    """A /v3/reference/dividends entry."""
+
+    _FIELDS = ("ticker", "cash_amount", "currency", "declaration_date", "ex_dividend_date",
+               "record_date", "pay_date", "frequency", "dividend_type", "id")
+    _DATE_FIELDS = frozenset({"declaration_date", "ex_dividend_date", "record_date", "pay_date"})
+    __slots__ = _FIELDS
+
+
+class Split(Record):
+    """A /v3/reference/splits entry (``split_to`` new shares per ``split_from`` old)."""
+
+    _FIELDS = ("ticker", "execution_date", "split_from", "split_to", "id")
+    _DATE_FIELDS = frozenset({"execution_date"})
+    __slots__ = _FIELDS
+
+    @property
+    def ratio(self) -> float:
+        return self.split_to / self.split_from
+
+
+class Ticker(Record):
+    """A /v3/reference/tickers entry (``last_updated_utc``/``delisted_utc`` in Unix ms)."""
+
+    _FIELDS = ("ticker", "name", "market", "locale", "type", "active", "primary_exchange",
+               "currency_name", "cik", "last_updated_utc", "delisted_utc")
+    _TIME_FIELDS = frozenset({"last_updated_utc", "delisted_utc"})
+    __slots__ = _FIELDS
+
+
+class Bar(Record):
+    """One aggregate bar (``t`` in Unix ms); see BarSeries for bulk use."""
+
+    _FIELDS = BAR_DTYPE.names
+    __slots__ = _FIELDS
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Bar":
+        """Build from a BAR_DTYPE row tuple (NaN ``vw`` means absent)."""
+        bar = cls.__new__(cls)
+        for name, value in zip(cls._FIELDS, row):
+            setattr(bar, name, None if value != value else value)
+        bar.extra = None
+        return bar
+
+
+# BAR_DTYPE integer fields, where 0 can't stand for "absent" the way NaN does
+_INT_BAR_FIELDS = tuple(name for name in BAR_DTYPE.names if BAR_DTYPE[name].kind == "i")
+
+
+class BarSeries(Sequence):
+    """Read-only sequence of Bars backed by one BAR_DTYPE array.
+
+    Indexing builds a Bar on demand; bulk work should use ``array`` (or
+    ``np.asarray(series)``) directly. Series built with ``from_list`` keep
+    only what the array can't hold in ``extras`` (row -> fields): keys
+    outside BAR_DTYPE such as ``otc``, and integer fields the API left out
+    (stored as None), so Bars still carry them.
+    """
+
+    __slots__ = ("array", "extras")
+
+    def __init__(self, array: np.ndarray, extras: Optional[Dict[int, Dict[str, Any]]] = None):
+        self.array = array
+        self.extras = extras or None
+
+    @classmethod
+    def from_list(cls, records: Iterable[Dict[str, Any]]) -> "BarSeries":
+        """Build from API ``results`` records."""
+        records = records if isinstance(records, list) else list(records)
+        extras = {}
+        for i, record in enumerate(records):
+            extra = {key: value for key, value in record.items() if key not in BAR_DTYPE.fields}
+            for name in _INT_BAR_FIELDS:
+                if record.get(name) is None:
+                    extra[name] = None
+            if extra:
+                extras[i] = extra
+        return cls(bars_to_array(records), extras)
+
+    @classmethod
+    def concat(cls, parts: Iterable["BarSeries"]) -> "BarSeries":
+        """Join series end to end (e.g. the pages of one response)."""
+        parts = list(parts)
+        extras = {}
+        offset = 0
+        for part in parts:
+            for i, extra in (part.extras or {}).items():
+                extras[offset + i] = extra
+            offset += len(part)
+        array = np.concatenate([part.array for part in parts]) if parts else bars_to_array([])
+        return cls(array, extras)
+
+    def _bar(self, i: int, row: tuple) -> Bar:
+        bar = Bar.from_row(row)
+        extra = self.extras.get(i) if self.extras else None
+        if extra:
+            for key, value in extra.items():
+                if key in BAR_DTYPE.fields:
+                    setattr(bar, key, value)
+                else:
+                    bar.extra = bar.extra or {}
+                    bar.extra[key] = value
+        return bar
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            rows = range(len(self))[index]
+            extras = None
+            if self.extras:
+                extras = {j: self.extras[i] for j, i in enumerate(rows) if i in self.extras}
+            return BarSeries(self.array[index], extras)
+        i = range(len(self))[index]
+        return self._bar(i, self.array[i].item())
+
+    def __iter__(self) -> Iterator[Bar]:
+        for i, row in enumerate(self.array.tolist()):
+            yield self._bar(i, row)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.array if dtype is None else self.array.astype(dtype)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, BarSeries):
+            return self.array.tobytes() == other.array.tobytes() and \
+                (self.extras or {}) == (other.extras or {})
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Bars as plain API dicts."""
+        return [bar.to_dict() for bar in self]
+
+    def __repr__(self):
+        return f"BarSeries({len(self)} bars)"
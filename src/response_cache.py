@@ -0,0 +1,300 @@
+"""Persistent on-disk response cache for Massive.com API calls."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from datetime import date, datetime, timezone
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "explore-massive")
+
+# (endpoint regex, TTL seconds). None = never expires, 0 = never cached.
+# First match wins; endpoints with a date in the path are handled by
+# ResponseCache.ttl_for before these rules are consulted.
+DEFAULT_TTL_RULES: List[Tuple[str, Optional[float]]] = [
+    (r"^/v2/last/", 0),
+    (r"/snapshot/", 0),
+    (r"^/v1/marketstatus/now", 0),
+    (r"^/v1/marketstatus/upcoming", 6 * 3600),
+    (r"^/v2/aggs/ticker/[^/]+/prev", 3600),
+    (r"^(/v3)?/reference/tickers/types", 7 * 86400),
+    (r"^(/v3)?/reference/(exchanges|conditions)", 7 * 86400),
+    (r"^(/v3)?/reference/", 86400),
+    (r".*", 300),
+]
+
+# Endpoints whose path ends in a date (or a from/to date range)
+_DATED_ENDPOINTS = re.compile(
+    r"^/v1/open-close/[^/]+/(?P<end>[^/]+)$"
+    r"|^/v2/aggs/ticker/[^/]+/range/\d+/\w+/[^/]+/(?P<range_end>[^/]+)$"
+    r"|^/v2/aggs/grouped/locale/\w+/market/\w+/(?P<grouped>[^/]+)$"
+)
+# TTL for dated endpoints whose range is still open (today or later)
+OPEN_RANGE_TTL = 60
+
+
+def _parse_path_date(value: str) -> Optional[date]:
+    """Parse an ISO date or millisecond timestamp from a URL path segment."""
+    try:
+        if value.isdigit():
+            return datetime.fromtimestamp(int(value) / 1000, tz=timezone.utc).date()
+        return date.fromisoformat(value)
+    except (ValueError, OverflowError):
+        return None
+
+
+class CacheEntry:
+    """A cached response body plus its freshness metadata.
+
+    Entries stored from raw bytes keep them in ``raw`` (so columnar callers
+    can decode them without building dicts); ``body`` parses them on first use.
+    """
+
+    __slots__ = ("key", "path", "_body", "raw", "stored_at", "expires_at", "etag")
+
+    def __init__(self, key: str, path: str, body: Any, stored_at: float,
+                 expires_at: Optional[float], etag: Optional[str], raw: Optional[bytes] = None):
+        self.key = key
+        self.path = path
+        self._body = body
+        self.raw = raw
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.etag = etag
+
+    @property
+    def body(self) -> Any:
+        if self._body is None and self.raw is not None:
+            self._body = json.loads(self.raw)
+        return self._body
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at is None or time.time() < self.expires_at
+
+
+class ResponseCache:
+    """Read-through, zlib-compressed JSON response cache on local disk.
+
+    Entries are keyed on API host, endpoint and query parameters (the API key
+    is never part of the key). Each endpoint family gets a TTL from ``ttl_rules``;
+    open-close, range and grouped aggregates whose dates are entirely in the
+    past never expire. When the total size exceeds ``max_bytes`` the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 512 * 1024 * 1024,
+                 ttl_rules: Optional[List[Tuple[str, Optional[float]]]] = None):
+        """Initialize response cache.
+
+        Args:
+            directory: Cache directory (defaults to ~/.cache/explore-massive)
+            max_bytes: Size budget for all entries before LRU eviction
+            ttl_rules: (regex, seconds) pairs; None = never expire, 0 = skip
+        """
+        self.directory = os.path.join(os.path.expanduser(directory or DEFAULT_CACHE_DIR), "responses")
+        self.max_bytes = max_bytes
+        self.ttl_rules = [(re.compile(p), ttl) for p, ttl in (ttl_rules or DEFAULT_TTL_RULES)]
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None,
+                 host: Optional[str] = None) -> str:
+        """Build the cache key for an endpoint, its query parameters and API host."""
+        params = {k: v for k, v in (params or {}).items() if k != "apiKey"}
+        parts = [endpoint, params] if host is None else [host, endpoint, params]
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        """Return TTL seconds for an endpoint (None = never expires, 0 = skip)."""
+        # Absolute URLs (pagination next_url) are matched on their path
+        path = urlsplit(endpoint).path
+        match = _DATED_ENDPOINTS.match(path)
+        if match:
+            value = match.group("end") or match.group("range_end") or match.group("grouped")
+            last_day = _parse_path_date(value)
+            if last_day is not None:
+                today = datetime.now(timezone.utc).date()
+                return None if last_day < today else OPEN_RANGE_TTL
+
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(path):
+                return ttl
+        return 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json.z")
+
+    def lookup(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+               host: Optional[str] = None) -> Optional[CacheEntry]:
+        """Look up a cached response.
+
+        Counts a hit only for a fresh entry. A stale entry is still returned
+        so its ETag can be used for conditional revalidation.
+        """
+        if self.ttl_for(endpoint) == 0:
+            return None
+
+        key = self.make_key(endpoint, params, host)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                envelope = json.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            envelope = None
+        except (OSError, ValueError, zlib.error) as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove(path)
+            envelope = None
+
+        if envelope is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        raw = envelope.get("raw")
+        entry = CacheEntry(key, path, envelope.get("body"), envelope["stored_at"],
+                           envelope["expires_at"], envelope.get("etag"),
+                           raw=None if raw is None else raw.encode("utf-8"))
+        with self._lock:
+            if entry.fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry.fresh:
+            self._touch(path)
+        return entry
+
+    def store(self, endpoint: str, params: Optional[Dict[str, Any]], body: Any,
+              etag: Optional[str] = None, raw: Optional[bytes] = None,
+              host: Optional[str] = None):
+        """Store a response if its endpoint family is cacheable.
+
+        Args:
+            endpoint: Endpoint path or URL
+            params: Query parameters
+            body: Parsed response (ignored when ``raw`` is given)
+            etag: ETag for later revalidation
+            raw: Response bytes (UTF-8 JSON), stored as is instead of ``body``
+            host: API scheme and host, so different servers never share entries
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl == 0:
+            return
+
+        now = time.time()
+        key = self.make_key(endpoint, params, host)
+        envelope = self._envelope(endpoint, now, ttl, etag, body, raw)
+        self._write(self._path(key), envelope)
+        with self._lock:
+            self.stores += 1
+        self._evict_if_needed()
+
+    def revalidated(self, entry: CacheEntry, endpoint: str):
+        """Extend a stale entry after the server answered 304 Not Modified."""
+        ttl = self.ttl_for(endpoint)
+        envelope = self._envelope(endpoint, time.time(), ttl, entry.etag, entry._body, entry.raw)
+        self._write(entry.path, envelope)
+        with self._lock:
+            self.revalidations += 1
+
+    @staticmethod
+    def _envelope(endpoint: str, now: float, ttl: Optional[float], etag: Optional[str],
+                  body: Any, raw: Optional[bytes]) -> Dict[str, Any]:
+        envelope = {
+            "endpoint": endpoint,
+            "stored_at": now,
+            "expires_at": None if ttl is None else now + ttl,
+            "etag": etag,
+        }
+        if raw is not None:
+            envelope["raw"] = raw.decode("utf-8")
+        else:
+            envelope["body"] = body
+        return envelope
+
+    def _write(self, path: str, envelope: Dict[str, Any]):
+        payload = zlib.compress(json.dumps(envelope, separators=(",", ":")).encode("utf-8"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        old_size = os.path.getsize(path) if os.path.exists(path) else 0
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._total_bytes += len(payload) - old_size
+
+    def _touch(self, path: str):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _remove(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._total_bytes -= size
+
+    def _scan(self):
+        """Yield (path, size, mtime) for every entry on disk."""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json.z"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def _evict_if_needed(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        # Least recently used first (hits refresh mtime)
+        for path, size, _ in sorted(self._scan(), key=lambda item: item[2]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            with self._lock:
+                self.evictions += 1
+
+    def clear(self):
+        """Delete every cached entry."""
+        for path, _, _ in list(self._scan()):
+            self._remove(path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "revalidations": self.revalidations,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "bytes": self._total_bytes,
+            }
@@ -0,0 +1,195 @@
+"""Retry policy and persistent entitlement (403) map for API requests."""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Any, Optional, Tuple
+
+import requests
+
+try:
+    from .endpoints import endpoint_template
+    from .file_lock import lock_file, unlock_file
+    from .response_cache import DEFAULT_CACHE_DIR
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from endpoints import endpoint_template
+    from file_lock import lock_file, unlock_file
+    from response_cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class EndpointForbiddenError(requests.exceptions.HTTPError):
+    """Endpoint is known to be outside the plan's entitlements (cached 403)."""
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for transient failures.
+
+    Retries 429 and 5xx responses and connection errors. A ``Retry-After``
+    header (seconds or HTTP date) overrides the computed backoff.
+    """
+
+    def __init__(self, max_retries: int = 3, backoff_base: float = 2.0,
+                 backoff_max: float = 60.0,
+                 retry_statuses=(429, 500, 502, 503, 504)):
+        """Initialize retry policy.
+
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff_base: Backoff ceiling for the first retry, in seconds
+            backoff_max: Upper bound on any single wait
+            retry_statuses: HTTP statuses worth retrying
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def should_retry(self, status: Optional[int], attempt: int) -> bool:
+        """Whether to retry after ``attempt`` (0-based) ended with ``status``.
+
+        ``status`` is None for connection errors and timeouts.
+        """
+        if attempt >= self.max_retries:
+            return False
+        return status is None or status in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before retry number ``attempt + 1``."""
+        if retry_after:
+            seconds = _parse_retry_after(retry_after)
+            if seconds is not None:
+                return min(seconds, self.backoff_max)
+        # "Full jitter": spreads out concurrent retries
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+def _parse_retry_after(value: str) -> Optional[float]:
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _file_version(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class EntitlementMap:
+    """Remembers endpoint families that returned 403 on this plan.
+
+    Keyed by ``endpoint_template`` so a 403 on ``/v2/last/trade/AAPL`` also
+    short-circuits ``/v2/last/trade/MSFT``. Entries expire after ``ttl`` so
+    plan upgrades are picked up. Stored as JSON, shared by every script:
+    writes re-read and merge the file under an exclusive file lock (like
+    SharedRateLimiter), and reads reload it when another process changed it.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 7 * 86400):
+        """Initialize entitlement map.
+
+        Args:
+            path: JSON file (defaults to entitlements.json in MASSIVE_CACHE_DIR
+                or ~/.cache/explore-massive)
+            ttl: Seconds a recorded 403 stays in force
+        """
+        cache_dir = os.path.expanduser(os.getenv("MASSIVE_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.path = path or os.path.join(cache_dir, "entitlements.json")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._lock_path = f"{self.path}.lock"
+        self._mtime: Optional[Tuple[int, int]] = None  # (mtime_ns, size) at the last load
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            self._mtime = _file_version(self.path)
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            self._mtime = None
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable entitlement map {self.path}: {e}")
+            return {}
+
+    def _reload_if_changed(self):
+        """Pick up entries other processes wrote since the last load."""
+        if _file_version(self.path) != self._mtime:
+            with self._lock:
+                self._entries = self._load()
+
+    def _update(self, change: Callable[[Dict[str, Dict[str, Any]]], None]):
+        """Apply ``change`` to the entries on disk (re-read under the file lock) and save."""
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self._lock_path, "a+") as lock:
+                lock_file(lock)
+                try:
+                    entries = self._load()
+                    change(entries)
+                    tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        json.dump(entries, f, indent=2, sort_keys=True)
+                    os.replace(tmp_path, self.path)
+                    self._mtime = _file_version(self.path)
+                    self._entries = entries
+                finally:
+                    unlock_file(lock)
+
+    def forbidden_until(self, endpoint: str) -> Optional[float]:
+        """Expiry timestamp if the endpoint's family is known forbidden."""
+        self._reload_if_changed()
+        entry = self._entries.get(endpoint_template(endpoint))
+        if entry is None or entry["until"] <= time.time():
+            return None
+        return entry["until"]
+
+    def check(self, endpoint: str):
+        """Raise EndpointForbiddenError if the endpoint is known forbidden."""
+        until = self.forbidden_until(endpoint)
+        if until is not None:
+            template = endpoint_template(endpoint)
+            raise EndpointForbiddenError(
+                f"403 Forbidden (cached until {time.strftime('%Y-%m-%d %H:%M', time.localtime(until))}): {template}"
+            )
+
+    def record_forbidden(self, endpoint: str, status: int = 403):
+        """Remember that the endpoint's family is forbidden."""
+        template = endpoint_template(endpoint)
+        now = time.time()
+        entry = {"status": status, "recorded_at": now, "until": now + self.ttl}
+        try:
+            self._update(lambda entries: entries.__setitem__(template, entry))
+        except OSError as e:
+            with self._lock:
+                self._entries[template] = entry  # Still skip it in this process
+            logger.warning(f"Could not save entitlement map {self.path}: {e}")
+        logger.warning(f"🚫 {template} is not entitled on this plan; skipping for {self.ttl / 3600:.0f}h")
+
+    def forget(self, endpoint: Optional[str] = None):
+        """Drop one family (or everything) from the map."""
+        if endpoint is None:
+            self._update(lambda entries: entries.clear())
+        else:
+            self._update(lambda entries: entries.pop(endpoint_template(endpoint), None))
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Active (unexpired) entries by template."""
+        self._reload_if_changed()
+        now = time.time()
+        return {k: dict(v) for k, v in self._entries.items() if v["until"] > now}
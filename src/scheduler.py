@@ -0,0 +1,200 @@
+"""Priority request scheduler with single-flight deduplication."""
+
+import heapq
+import itertools
+import json
+import logging
+import threading
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Dict, List, Any, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request priority classes (lower value runs first)."""
+
+    CRITICAL = 0    # Trading-critical: holiday / market status checks
+    NORMAL = 1      # Interactive lookups
+    BACKGROUND = 2  # Backfills and bulk exports
+
+
+class _Job:
+    """One in-flight request shared by every caller that asked for it."""
+
+    __slots__ = ("endpoint", "method", "params", "data", "future", "priority", "started")
+
+    def __init__(self, endpoint, method, params, data, priority):
+        self.endpoint = endpoint
+        self.method = method
+        self.params = params
+        self.data = data
+        self.future: Future = Future()
+        self.priority = priority
+        self.started = False
+
+
+class RequestScheduler:
+    """Orders calls to ``MassiveAPIClient._make_request`` by priority.
+
+    Identical requests (same method, endpoint, params and body) that are
+    queued or running at the same time are merged: the API is called once
+    and every caller receives the same Future. Callers that need to mutate
+    the response should copy it first.
+    """
+
+    def __init__(self, client, workers: int = 1):
+        """Initialize scheduler.
+
+        Args:
+            client: MassiveAPIClient (or anything with ``_make_request``)
+            workers: Number of dispatch threads. One is enough for a single
+                rate limiter; more only help when calls can run in parallel.
+        """
+        self.client = client
+        self._queue: List[Tuple[int, int, str]] = []
+        self._inflight: Dict[str, _Job] = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._shutdown = False
+        self.merged_count = 0
+        self._threads = [
+            threading.Thread(target=self._run, name=f"massive-scheduler-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @staticmethod
+    def _key(endpoint: str, method: str, params: Optional[Dict[str, Any]],
+             data: Optional[Dict[str, Any]]) -> str:
+        return json.dumps([method.upper(), endpoint, params or {}, data], sort_keys=True, default=str)
+
+    def submit(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+               method: str = "GET", data: Optional[Dict[str, Any]] = None,
+               priority: Priority = Priority.NORMAL) -> Future:
+        """Queue a request.
+
+        Args:
+            endpoint: API endpoint passed to ``_make_request``
+            params: Query parameters
+            method: HTTP method
+            data: Request body data
+            priority: Priority class; a duplicate submitted at a more urgent
+                priority promotes the queued request
+
+        Returns:
+            Future resolving to the response JSON
+        """
+        key = self._key(endpoint, method, params, data)
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("Scheduler has been shut down")
+
+            job = self._inflight.get(key)
+            if job is not None:
+                self.merged_count += 1
+                if not job.started and priority < job.priority:
+                    job.priority = priority
+                    heapq.heappush(self._queue, (int(priority), next(self._counter), key))
+                    self._cond.notify()
+                return job.future
+
+            job = _Job(endpoint, method, dict(params or {}), data, priority)
+            self._inflight[key] = job
+            heapq.heappush(self._queue, (int(priority), next(self._counter), key))
+            self._cond.notify()
+            return job.future
+
+    def submit_many(self, requests: Iterable[Any],
+                    priority: Priority = Priority.NORMAL) -> List[Future]:
+        """Queue a batch of requests.
+
+        Args:
+            requests: Endpoint strings, ``(endpoint, params)`` tuples or dicts
+                of ``submit`` keyword arguments
+            priority: Default priority for entries that don't set one
+
+        Returns:
+            Futures in the same order as ``requests``
+        """
+        futures = []
+        for request in requests:
+            if isinstance(request, str):
+                futures.append(self.submit(request, priority=priority))
+            elif isinstance(request, dict):
+                kwargs = dict(request)
+                kwargs.setdefault("priority", priority)
+                futures.append(self.submit(**kwargs))
+            else:
+                endpoint, params = request
+                futures.append(self.submit(endpoint, params, priority=priority))
+        return futures
+
+    def _next_job(self) -> Optional[Tuple[str, _Job]]:
+        """Pop the most urgent job that hasn't started yet (blocks)."""
+        with self._cond:
+            while True:
+                while self._queue:
+                    _, _, key = heapq.heappop(self._queue)
+                    job = self._inflight.get(key)
+                    # Stale heap entries are left behind by promotions
+                    if job is not None and not job.started:
+                        job.started = True
+                        return key, job
+                if self._shutdown:
+                    return None
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            item = self._next_job()
+            if item is None:
+                return
+            key, job = item
+
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    result = self.client._make_request(job.endpoint, method=job.method,
+                                                       params=dict(job.params), data=job.data)
+                except BaseException as e:
+                    logger.error(f"Scheduled request failed: {job.endpoint}: {e}")
+                    job.future.set_exception(e)
+                else:
+                    job.future.set_result(result)
+
+            with self._cond:
+                self._inflight.pop(key, None)
+
+    def pending(self) -> int:
+        """Number of queued or running requests."""
+        with self._cond:
+            return len(self._inflight)
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """Stop the dispatch threads.
+
+        Args:
+            wait: Block until queued work has drained
+            cancel_pending: Cancel requests that haven't started yet
+        """
+        with self._cond:
+            if cancel_pending:
+                for key, job in list(self._inflight.items()):
+                    if not job.started:
+                        job.future.cancel()
+                        del self._inflight[key]
+                self._queue.clear()
+            self._shutdown = True
+            self._cond.notify_all()
+
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
@@ -0,0 +1,308 @@
+"""In-process ticker universe index: symbol prefix, name token and fuzzy search.
+
+``/reference/tickers?search=`` spends one rate-limited call per query. The
+index keeps a local snapshot of the ticker universe (stocks, fx and crypto
+by default) and answers searches from memory:
+
+- symbol prefix: bisect over the sorted symbols (``C:EURUSD`` is also
+  found as ``EUR``)
+- name tokens: every query word must prefix-match a word of the name
+- fuzzy: trigram similarity on the name (catches typos like "nvida")
+
+The snapshot is gzip JSON; ``refresh`` only downloads tickers updated since
+the last one (pages sorted by ``last_updated_utc``, newest first).
+"""
+
+import bisect
+import gzip
+import heapq
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, List, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .records import Ticker
+    from .response_cache import DEFAULT_CACHE_DIR
+except ImportError:  # Imported as a top-level module (scripts run from src/)
+    from records import Ticker
+    from response_cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+MARKETS = ("stocks", "fx", "crypto")
+PAGE_LIMIT = 1000  # API maximum for /v3/reference/tickers
+
+_MIN_COVERAGE = 0.6  # Share of query trigrams a fuzzy match must contain
+_WORDS = re.compile(r"[a-z0-9]+")
+
+
+def default_snapshot_path() -> str:
+    """tickers.json.gz in MASSIVE_CACHE_DIR (or ~/.cache/explore-massive), resolved per call."""
+    cache_dir = os.path.expanduser(os.getenv("MASSIVE_CACHE_DIR", DEFAULT_CACHE_DIR))
+    return os.path.join(cache_dir, "tickers.json.gz")
+
+
+def _trigrams(text: str) -> List[str]:
+    padded = f"  {' '.join(_WORDS.findall(text.lower()))} "
+    return list({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+class TickerIndex:
+    """Searchable, persistable snapshot of the ticker universe."""
+
+    def __init__(self, tickers: Iterable[Ticker] = (), path: Optional[str] = None):
+        """Initialize ticker index.
+
+        Args:
+            tickers: Initial records (Ticker or API dicts)
+            path: Snapshot file used by ``save``/``load`` (default tickers.json.gz
+                in MASSIVE_CACHE_DIR or ~/.cache/explore-massive)
+        """
+        self.path = path or default_snapshot_path()
+        self._tickers: Dict[str, Ticker] = {}
+        self.high_water: Dict[str, int] = {}  # market -> newest last_updated_utc (ms)
+        self.saved_at: Optional[float] = None
+        for ticker in tickers:
+            ticker = Ticker.from_dict(ticker)
+            self._tickers[ticker.ticker] = ticker
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._tickers)
+
+    def get(self, symbol: str) -> Optional[Ticker]:
+        """Exact symbol lookup."""
+        return self._tickers.get(symbol.upper())
+
+    # -- Index -------------------------------------------------------------
+
+    def _build(self):
+        self._records: List[Ticker] = sorted(self._tickers.values(), key=lambda t: t.ticker)
+        # Symbol keys grouped by length, so shorter completions come out first
+        by_length: Dict[int, List[Tuple[str, int]]] = {}
+        words: Dict[str, List[int]] = {}
+        grams: Dict[str, List[int]] = {}
+        gram_counts = []
+        for i, record in enumerate(self._records):
+            symbol = record.ticker.upper()
+            keys = {symbol, symbol.split(":", 1)[1]} if ":" in symbol else {symbol}
+            for key in keys:
+                by_length.setdefault(len(key), []).append((key, i))
+            name = record.name or ""
+            for word in set(_WORDS.findall(name.lower())):
+                words.setdefault(word, []).append(i)  # ids ascend, so postings stay sorted
+            name_grams = _trigrams(name)
+            gram_counts.append(len(name_grams))
+            for gram in name_grams:
+                grams.setdefault(gram, []).append(i)
+        self._symbols: Dict[int, Tuple[List[str], List[int]]] = {}
+        for length, entries in by_length.items():
+            entries.sort()
+            self._symbols[length] = ([key for key, _ in entries], [i for _, i in entries])
+        self._words = words
+        self._word_keys = sorted(words)
+        self._grams = {gram: np.array(ids, dtype=np.int32) for gram, ids in grams.items()}
+        self._gram_counts = np.array(gram_counts, dtype=np.float64)
+
+    def _symbol_matches(self, symbol: str) -> Iterator[int]:
+        """Ids whose symbol starts with ``symbol``: exact first, then by length."""
+        for length in sorted(k for k in self._symbols if k >= len(symbol)):
+            keys, ids = self._symbols[length]
+            start = bisect.bisect_left(keys, symbol)
+            end = bisect.bisect_left(keys, symbol + "\uffff", start)
+            yield from ids[start:end]
+
+    def _word_matches(self, words: List[str]) -> Iterator[int]:
+        """Ids whose name has every query word: whole words first, then prefixes."""
+        if len(words) == 1:
+            # Postings are sorted, so merge them lazily instead of building sets
+            word = words[0]
+            yield from self._words.get(word, ())
+            completions = [self._words[key] for key in self._word_keys_from(word) if key != word]
+            yield from heapq.merge(*completions)
+            return
+        exact, prefix = None, None
+        for word in words:
+            word_exact = set(self._words.get(word, ()))
+            word_prefix = set().union(*(self._words[key] for key in self._word_keys_from(word)))
+            exact = word_exact if exact is None else exact & word_exact
+            prefix = word_prefix if prefix is None else prefix & word_prefix
+        yield from sorted(exact)
+        yield from sorted(prefix - exact)
+
+    def _word_keys_from(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._word_keys, prefix)
+        end = bisect.bisect_left(self._word_keys, prefix + "\uffff", start)
+        return self._word_keys[start:end]
+
+    def _fuzzy_matches(self, query: str) -> Iterator[int]:
+        """Ids whose name holds most of ``query``'s trigrams, best first.
+
+        Ranked by the share of query trigrams found in the name, then by
+        Dice similarity (so shorter names win ties).
+        """
+        query_grams = _trigrams(query)
+        postings = [self._grams[gram] for gram in query_grams if gram in self._grams]
+        if not postings:
+            return
+        shared = np.bincount(np.concatenate(postings), minlength=len(self._records))
+        coverage = shared / len(query_grams)
+        ids = np.nonzero(coverage >= _MIN_COVERAGE)[0]
+        dice = 2 * shared[ids] / (len(query_grams) + self._gram_counts[ids])
+        yield from ids[np.lexsort((ids, -dice, -coverage[ids]))].tolist()
+
+    # -- Search ------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 10, market: Optional[str] = None,
+               type: Optional[str] = None, active: Optional[bool] = None) -> List[Ticker]:
+        """Best matches for a symbol or company name query.
+
+        Symbol matches rank first (exact, then shortest completions), then
+        names containing every query word, then, only if nothing matched,
+        fuzzy name matches.
+
+        Args:
+            query: Symbol, symbol prefix or (part of) a company name
+            limit: Maximum results
+            market: Keep only this market (stocks, fx, crypto, ...)
+            type: Keep only this ticker type (CS, ETF, ...)
+            active: Keep only active (True) or inactive (False) tickers
+
+        Returns:
+            Ticker records, best match first
+        """
+        results: List[Ticker] = []
+        seen = set()
+        matched = False
+        words = _WORDS.findall(query.lower())
+        stages = [self._symbol_matches(query.strip().upper())] if query.strip() else []
+        if words:
+            stages.append(self._word_matches(words))
+        for stage in stages + [None]:
+            if stage is None:
+                if matched or not words:
+                    break
+                stage = self._fuzzy_matches(query)  # Typo fallback
+            for i in stage:
+                matched = True
+                if i in seen:
+                    continue
+                seen.add(i)
+                record = self._records[i]
+                if ((market is None or record.market == market)
+                        and (type is None or record.type == type)
+                        and (active is None or bool(record.active) == active)):
+                    results.append(record)
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    # -- Persistence -------------------------------------------------------
+
+    def save(self, path: Optional[str] = None):
+        """Atomically write the snapshot."""
+        path = path or self.path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.saved_at = time.time()
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": self.saved_at,
+            "high_water": self.high_water,
+            "tickers": [record.to_dict() for record in self._records],
+        }
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        logger.info(f"💾 Saved {len(self)} tickers to {path}")
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "TickerIndex":
+        """Read a snapshot written by ``save``.
+
+        Raises:
+            FileNotFoundError: No snapshot at ``path``
+            ValueError: Snapshot written by an incompatible version
+        """
+        path = path or default_snapshot_path()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported ticker snapshot version {snapshot.get('version')} in {path}")
+        index = cls(snapshot["tickers"], path=path)
+        index.high_water = snapshot.get("high_water", {})
+        index.saved_at = snapshot.get("saved_at")
+        return index
+
+    @classmethod
+    def open(cls, client, path: Optional[str] = None, max_age: float = 86400,
+             markets: Iterable[str] = MARKETS) -> "TickerIndex":
+        """Load the snapshot, refreshing it first if missing or older than ``max_age`` seconds."""
+        path = path or default_snapshot_path()
+        try:
+            index = cls.load(path)
+        except (FileNotFoundError, ValueError):
+            index = cls(path=path)
+        if index.saved_at is None or time.time() - index.saved_at > max_age:
+            index.refresh(client, markets)
+            index.save()
+        return index
+
+    # -- Sync --------------------------------------------------------------
+
+    def refresh(self, client, markets: Iterable[str] = MARKETS,
+                include_inactive: bool = False) -> Dict[str, int]:
+        """Download tickers changed since the last refresh and rebuild the index.
+
+        The first refresh of a market loads every active ticker (plus
+        inactive ones with ``include_inactive``). Later refreshes walk both
+        lists newest-first and stop at the high-water mark, so tickers that
+        were delisted since are updated too, usually for one call per list.
+
+        Args:
+            client: MassiveAPIClient
+            markets: Markets to refresh
+            include_inactive: Also load delisted tickers on the first refresh
+
+        Returns:
+            Calls made and tickers added or updated
+        """
+        stats = {"calls": 0, "updated": 0}
+        for market in markets:
+            since = self.high_water.get(market)
+            lists = (True, False) if since is not None or include_inactive else (True,)
+            newest = since or 0
+            for active in lists:
+                newest = max(newest, self._fetch(client, market, active, since, stats))
+            self.high_water[market] = newest
+        self._build()
+        logger.info(f"✅ Ticker index: {stats['updated']} updated in {stats['calls']} call(s); {len(self)} total")
+        return stats
+
+    def _fetch(self, client, market: str, active: bool, since: Optional[int],
+               stats: Dict[str, int]) -> int:
+        params = {"market": market, "active": str(active).lower(), "limit": PAGE_LIMIT,
+                  "sort": "last_updated_utc", "order": "desc"}
+        # Cached pages can be up to a day old and would hide recent changes
+        page = client._make_request("/reference/tickers", params=params, use_cache=False)
+        newest = 0
+        while True:
+            stats["calls"] += 1
+            for raw in page.get("results") or []:
+                record = Ticker.from_dict(raw)
+                updated = record.last_updated_utc if isinstance(record.last_updated_utc, int) else 0
+                if since is not None and updated < since:
+                    return newest  # Sorted newest first: everything further is known
+                newest = max(newest, updated)
+                self._tickers[record.ticker] = record
+                stats["updated"] += 1
+            next_url = page.get("next_url")
+            if not next_url:
+                return newest
+            page = client._make_request(next_url, use_cache=False)
@@ -0,0 +1,132 @@
+"""Vectorized trading calendar built on NumPy business-day arithmetic."""
+
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NAT = np.datetime64("NaT", "m")
+
+
+def _as_days(dates) -> np.ndarray:
+    """Coerce dates, ISO strings or datetime64 values to datetime64[D]."""
+    return np.asarray(dates, dtype="datetime64[D]")
+
+
+class TradingCalendar:
+    """Answers trading-day questions for whole arrays of dates at once.
+
+    Closed holidays are folded into a ``np.busdaycalendar`` so membership,
+    next/previous day and day counts are single NumPy calls. Early-close
+    sessions are kept as a separate pair of sorted arrays (date, close time).
+    Session times are naive datetime64[m] in the exchange's local time.
+
+    Note:
+        ``/v1/marketstatus/upcoming`` only lists upcoming holidays. For
+        backtests, pass past holidays in via ``holidays``.
+    """
+
+    def __init__(self, holidays: Iterable = (), early_closes: Optional[Dict[Any, Any]] = None,
+                 weekmask: str = "1111100", regular_close: str = "16:00",
+                 tz: str = "America/New_York"):
+        """Initialize trading calendar.
+
+        Args:
+            holidays: Full-day closure dates
+            early_closes: {date: local close datetime} for shortened sessions
+            weekmask: Trading weekdays, Monday first ("1111111" for crypto)
+            regular_close: Normal session close, local "HH:MM"
+            tz: Exchange time zone (used to localize API close times)
+        """
+        self.holidays = np.unique(_as_days(list(holidays)))
+        self.weekmask = weekmask
+        self.tz = tz
+        hours, minutes = (int(part) for part in regular_close.split(":"))
+        self.regular_close = np.timedelta64(hours * 60 + minutes, "m")
+        self._busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+
+        early_closes = early_closes or {}
+        days = _as_days(list(early_closes.keys()))
+        times = np.asarray(list(early_closes.values()), dtype="datetime64[m]")
+        order = np.argsort(days)
+        self.early_close_dates = days[order]
+        self.early_close_times = times[order]
+
+    @classmethod
+    def from_holidays(cls, holidays: List[Dict[str, Any]], exchange: Optional[str] = None,
+                      **kwargs) -> "TradingCalendar":
+        """Build a calendar from /v1/marketstatus/upcoming records.
+
+        Args:
+            holidays: Holiday records ("date", "exchange", "status", "close")
+            exchange: Only use records for this exchange
+            **kwargs: Passed to the constructor (weekmask, regular_close, tz)
+        """
+        zone = ZoneInfo(kwargs.get("tz", "America/New_York"))
+
+        closed = []
+        early_closes = {}
+        for holiday in holidays:
+            if exchange and holiday.get("exchange") != exchange:
+                continue
+            status = holiday.get("status")
+            if status == "closed":
+                closed.append(holiday["date"])
+            elif status == "early-close" and holiday.get("close"):
+                close_utc = datetime.fromisoformat(holiday["close"].replace("Z", "+00:00"))
+                if close_utc.tzinfo is None:
+                    close_utc = close_utc.replace(tzinfo=timezone.utc)
+                early_closes[holiday["date"]] = close_utc.astimezone(zone).replace(tzinfo=None)
+        return cls(closed, early_closes, **kwargs)
+
+    def is_trading_day(self, dates):
+        """True where the date has a session (early closes included)."""
+        return np.is_busday(_as_days(dates), busdaycal=self._busdaycal)
+
+    def is_early_close(self, dates):
+        """True where the session closes early."""
+        return np.isin(_as_days(dates), self.early_close_dates)
+
+    def next_trading_day(self, dates):
+        """First trading day strictly after each date."""
+        return np.busday_offset(_as_days(dates), 1, roll="backward", busdaycal=self._busdaycal)
+
+    def previous_trading_day(self, dates):
+        """Last trading day strictly before each date."""
+        return np.busday_offset(_as_days(dates), -1, roll="forward", busdaycal=self._busdaycal)
+
+    def roll_forward(self, dates):
+        """Each date if it is a trading day, else the next one."""
+        return np.busday_offset(_as_days(dates), 0, roll="forward", busdaycal=self._busdaycal)
+
+    def offset(self, dates, days):
+        """Move each date by ``days`` trading days (rolling forward first)."""
+        return np.busday_offset(_as_days(dates), days, roll="forward", busdaycal=self._busdaycal)
+
+    def trading_days_between(self, start, end):
+        """Count trading days in ``start..end`` inclusive (broadcasts)."""
+        return np.busday_count(_as_days(start), _as_days(end) + np.timedelta64(1, "D"),
+                               busdaycal=self._busdaycal)
+
+    def trading_days(self, start, end) -> np.ndarray:
+        """All trading days in ``start..end`` inclusive."""
+        days = np.arange(_as_days(start), _as_days(end) + np.timedelta64(1, "D"), dtype="datetime64[D]")
+        return days[self.is_trading_day(days)]
+
+    def session_close(self, dates) -> np.ndarray:
+        """Local close time per date; NaT where there is no session."""
+        days = np.atleast_1d(_as_days(dates))
+        closes = days.astype("datetime64[m]") + self.regular_close
+
+        if len(self.early_close_dates):
+            pos = np.searchsorted(self.early_close_dates, days)
+            pos = np.minimum(pos, len(self.early_close_dates) - 1)
+            early = self.early_close_dates[pos] == days
+            closes[early] = self.early_close_times[pos[early]]
+
+        closes[~self.is_trading_day(days)] = NAT
+        return closes if np.ndim(dates) else closes[0]
@@ -0,0 +1,250 @@
+"""Pluggable HTTP transports for MassiveAPIClient: live, recording and replay.
+
+A transport is any object with ``headers`` (a dict of default headers),
+``request(method, url, params=None, json=None, headers=None)`` returning a
+``requests.Response``, and ``close()``.
+
+Cassettes are gzip-compressed JSON keyed by method, path and query (the API
+key and host are left out, so a cassette recorded against one base URL
+replays against another).
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import threading
+from http import HTTPStatus
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+# Response headers worth keeping in a cassette
+RECORDED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Retry-After")
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMissError(LookupError):
+    """A replayed request has no recorded response."""
+
+
+class HTTPTransport:
+    """Live transport: a ``requests.Session`` with a sized connection pool.
+
+    One pool per host is kept alive across calls; ``pool_maxsize`` should be
+    at least the number of threads sharing the client (e.g. scheduler
+    workers) or connections get discarded after each request.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10,
+                 compress: bool = True, timeout: Optional[float] = None):
+        """Initialize HTTP transport.
+
+        Args:
+            pool_connections: Number of hosts to keep pools for
+            pool_maxsize: Connections kept per host
+            compress: Ask for gzip/deflate responses (decoded transparently)
+            timeout: Seconds before a connect/read times out (None = wait forever)
+        """
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate" if compress else "identity"
+        self.timeout = timeout
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                json: Any = None, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        return self.session.request(method, url, params=params, json=json, headers=headers,
+                                    timeout=self.timeout)
+
+    def close(self):
+        self.session.close()
+
+
+def interaction_key(method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                    json_body: Any = None) -> str:
+    """Cassette key: method, path and sorted query without the API key."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != "apiKey"]
+    query += [(k, str(v)) for k, v in (params or {}).items() if k != "apiKey"]
+    key = f"{method.upper()} {parts.path}"
+    if query:
+        key += f"?{urlencode(sorted(query))}"
+    if json_body is not None:
+        key += f" {json.dumps(json_body, sort_keys=True)}"
+    return key
+
+
+def build_response(status: int, body: bytes, headers: Dict[str, str], url: str) -> requests.Response:
+    """Construct a ``requests.Response`` without a network round trip."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers = CaseInsensitiveDict(headers)
+    response.url = url
+    response.encoding = "utf-8"
+    try:
+        response.reason = HTTPStatus(status).phrase
+    except ValueError:
+        response.reason = ""
+    return response
+
+
+def _load_cassette(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        cassette = json.load(f)
+    if cassette.get("version") != CASSETTE_VERSION:
+        raise ValueError(f"Unsupported cassette version {cassette.get('version')} in {path}")
+    return cassette["interactions"]
+
+
+class RecordingTransport:
+    """Passes requests to a live transport and records every response.
+
+    Responses for the same key are kept in order, so paginated or
+    changing endpoints replay the same sequence. 304s are not recorded
+    (replay answers conditional requests itself). The cassette is written
+    by ``save()``/``close()`` or at interpreter exit; recording into an
+    existing cassette adds to it.
+    """
+
+    def __init__(self, path: str, inner=None):
+        """Initialize recording transport.
+
+        Args:
+            path: Cassette file (gzip JSON)
+            inner: Transport that performs the requests (default HTTPTransport)
+        """
+        self.path = path
+        self.inner = inner or HTTPTransport()
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Dict[str, Any]]] = (
+            _load_cassette(path) if os.path.exists(path) else {}
+        )
+        self._closed = False
+        # Scripts rarely close their client; don't lose the recording
+        atexit.register(self._save_at_exit)
+
+    @property
+    def headers(self):
+        return self.inner.headers
+
+    def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                json: Any = None, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        response = self.inner.request(method, url, params=params, json=json, headers=headers)
+        if response.status_code != 304:
+            entry = {
+                "status": response.status_code,
+                "headers": {name: response.headers[name] for name in RECORDED_HEADERS
+                            if name in response.headers},
+                "body": response.content.decode("utf-8", errors="replace"),
+            }
+            key = interaction_key(method, url, params, json)
+            with self._lock:
+                self._interactions.setdefault(key, []).append(entry)
+        return response
+
+    def save(self):
+        """Atomically write the cassette."""
+        with self._lock:
+            cassette = {"version": CASSETTE_VERSION, "interactions": self._interactions}
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(cassette, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        logger.info(f"💾 Saved {sum(map(len, self._interactions.values()))} responses to {self.path}")
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self.save()
+            self.inner.close()
+
+    def _save_at_exit(self):
+        if not self._closed and self._interactions:
+            self.save()
+
+
+class ReplayTransport:
+    """Serves responses from a cassette without touching the network.
+
+    Repeated requests walk through the recorded responses for their key and
+    then keep returning the last one. A conditional request whose
+    If-None-Match matches the recorded ETag gets a 304.
+    """
+
+    def __init__(self, path: str):
+        """Initialize replay transport.
+
+        Args:
+            path: Cassette written by RecordingTransport
+
+        Raises:
+            FileNotFoundError: The cassette does not exist
+        """
+        self.path = path
+        self.headers: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._interactions: Dict[str, List[Tuple[int, Dict[str, str], bytes]]] = {
+            key: [(entry["status"], entry["headers"], entry["body"].encode("utf-8")) for entry in entries]
+            for key, entries in _load_cassette(path).items()
+        }
+        self._positions: Dict[str, int] = {}
+
+    def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                json: Any = None, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        key = interaction_key(method, url, params, json)
+        entries = self._interactions.get(key)
+        if not entries:
+            raise CassetteMissError(f"No recorded response for {key} in {self.path}")
+        with self._lock:
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        status, recorded_headers, body = entries[min(position, len(entries) - 1)]
+
+        etag = recorded_headers.get("ETag")
+        if etag and (headers or {}).get("If-None-Match") == etag:
+            return build_response(304, b"", {"ETag": etag}, url)
+        return build_response(status, body, recorded_headers, url)
+
+    def rewind(self):
+        """Start every key's response sequence from the beginning again."""
+        with self._lock:
+            self._positions.clear()
+
+    def close(self):
+        pass
+
+
+def transport_from_env():
+    """Transport selected by MASSIVE_CASSETTE / MASSIVE_CASSETTE_MODE, else HTTPTransport.
+
+    MASSIVE_CASSETTE_MODE is "record" or "replay" (default: replay when the
+    cassette exists, record otherwise).
+    """
+    path = os.getenv("MASSIVE_CASSETTE")
+    if not path:
+        return HTTPTransport()
+    mode = os.getenv("MASSIVE_CASSETTE_MODE") or (REPLAY if os.path.exists(path) else RECORD)
+    if mode == REPLAY:
+        logger.info(f"📼 Replaying API responses from {path}")
+        return ReplayTransport(path)
+    if mode == RECORD:
+        logger.info(f"⏺️  Recording API responses to {path}")
+        return RecordingTransport(path)
+    raise ValueError(f"Unknown MASSIVE_CASSETTE_MODE '{mode}'. Use 'record' or 'replay'")
@@ -24,5 +24,43 @@ def test_api_client_missing_key():
             MassiveAPIClient()
 
 
+def _paged_client(pages):
+    """Client whose session returns the given JSON pages in order."""
+    from src.api_client import MassiveAPIClient
+    client = MassiveAPIClient(api_key="test_key", rate_limiter=Mock())
+    responses = []
+    for page in pages:
+        response = Mock(status_code=200, headers={}, content=b"{}")
+        response.json.return_value = page
+        responses.append(response)
+    client.session.request = Mock(side_effect=responses)
+    return client
+
+
+def test_iter_results_follows_next_url():
+    """Test iter_results walks every page and passes next_url through."""
+    next_url = "https://api.massive.com/v3/reference/tickers?cursor=abc"
+    client = _paged_client([
+        {"results": [{"ticker": "A"}, {"ticker": "B"}], "next_url": next_url},
+        {"results": [{"ticker": "C"}]},
+    ])
+    tickers = [r["ticker"] for r in client.iter_results("/reference/tickers", params={"market": "fx"})]
+    assert tickers == ["A", "B", "C"]
+    assert client.session.request.call_args_list[1].args[1] == next_url
+    assert client.session.request.call_args_list[1].kwargs["params"] == {"apiKey": "test_key"}
+
+
+def test_iter_results_stops_early():
+    """Test max_items and max_pages stop before fetching further pages."""
+    page = {"results": [{"ticker": "A"}, {"ticker": "B"}], "next_url": "https://x/v3/next"}
+    client = _paged_client([page, page])
+    assert len(list(client.iter_results("/reference/tickers", max_items=2))) == 2
+    assert client.session.request.call_count == 1
+
+    client = _paged_client([page, page, page])
+    assert len(list(client.iter_results("/reference/tickers", max_pages=2))) == 4
+    assert client.session.request.call_count == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,69 @@
+"""Tests for asyncio API client."""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.async_client import AsyncMassiveAPIClient, AsyncRateLimiter
+
+
+@pytest.mark.asyncio
+async def test_async_rate_limiter_waits_when_window_full():
+    """Test limiter awaits instead of blocking once the budget is used."""
+    limiter = AsyncRateLimiter(calls_per_minute=2)
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    with patch("src.async_client.asyncio.sleep", fake_sleep):
+        await asyncio.gather(*(limiter.wait_if_needed() for _ in range(3)))
+
+    assert len(sleeps) == 1
+    assert 59 < sleeps[0] <= 60.1
+
+
+@pytest.mark.asyncio
+async def test_async_client_requests_share_session():
+    """Test holidays and dividends go through one session with the API key."""
+    seen = []
+
+    async def holidays(request):
+        seen.append(request.query.get("apiKey"))
+        return web.json_response([{"date": "2024-12-25", "exchange": "NYSE", "status": "closed"}])
+
+    async def dividends(request):
+        seen.append(request.query.get("apiKey"))
+        return web.json_response({"results": [{"ticker": request.query["ticker"]}]})
+
+    app = web.Application()
+    app.router.add_get("/v1/marketstatus/upcoming", holidays)
+    app.router.add_get("/v3/reference/dividends", dividends)
+
+    async with TestServer(app) as server:
+        base_url = str(server.make_url("/v3"))
+        async with AsyncMassiveAPIClient(api_key="test_key", base_url=base_url,
+                                         rate_limiter=AsyncRateLimiter(calls_per_minute=100)) as client:
+            holidays_result, dividends_result = await asyncio.gather(
+                client.get_market_holidays(), client.get_dividends("AAPL")
+            )
+            session = client._get_session()
+            assert client._get_session() is session
+
+    assert holidays_result[0]["status"] == "closed"
+    assert dividends_result == [{"ticker": "AAPL"}]
+    assert seen == ["test_key", "test_key"]
+
+
+def test_async_client_missing_key():
+    """Test async client raises error without API key."""
+    with patch.dict(os.environ, {}, clear=True):
+        with pytest.raises(ValueError):
+            AsyncMassiveAPIClient()
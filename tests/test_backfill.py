@@ -0,0 +1,89 @@
+"""Tests for daily backfill engine."""
+
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from unittest.mock import Mock
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.backfill import GROUPED, PER_TICKER, DailyBackfill
+from src.bar_store import BarStore, to_epoch_ms
+
+
+def _grouped_client():
+    """Fake client serving grouped daily bars for three tickers."""
+    client = Mock()
+
+    def make_request(endpoint, params=None):
+        day = endpoint.rsplit("/", 1)[1]
+        t = to_epoch_ms(day)
+        return {"results": [{"T": sym, "t": t, "c": float(i)} for i, sym in enumerate(["AAPL", "MSFT", "ZZZ"])]}
+
+    client._make_request.side_effect = make_request
+    return client
+
+
+def test_choose_mode_by_call_count(tmp_path):
+    """Test large universes use grouped calls and small ones per-ticker ranges."""
+    backfill = DailyBackfill(Mock(), BarStore(str(tmp_path)))
+    week = (date(2024, 1, 1), date(2024, 1, 7))
+    assert backfill.estimate_calls(["AAPL"] * 1, *week) == {GROUPED: 5, PER_TICKER: 1}
+    assert backfill.choose_mode(["AAPL"], *week) == PER_TICKER
+    assert backfill.choose_mode([f"T{i}" for i in range(500)], *week) == GROUPED
+
+
+def test_grouped_backfill_pivots_and_resumes(tmp_path):
+    """Test grouped responses become per-ticker series and skip done days."""
+    client = _grouped_client()
+    store = BarStore(str(tmp_path))
+    backfill = DailyBackfill(client, store, flush_days=2)
+
+    written = backfill.run(["AAPL", "MSFT"], date(2024, 1, 1), date(2024, 1, 7), mode=GROUPED)
+    assert written == {"AAPL": 5, "MSFT": 5}
+    assert client._make_request.call_count == 5  # weekends skipped
+    assert list(store.read("MSFT", "day")["c"]) == [1.0] * 5
+    assert store.count("ZZZ", "day") == 0
+
+    backfill.run(["AAPL", "MSFT"], date(2024, 1, 1), date(2024, 1, 9), mode=GROUPED)
+    assert client._make_request.call_count == 7
+    assert store.count("AAPL", "day") == 7
+
+
+def test_grouped_checkpoint_tracks_days_and_adjusted(tmp_path):
+    """Test an earlier range and an unadjusted run aren't skipped by the checkpoint."""
+    client = _grouped_client()
+    backfill = DailyBackfill(client, BarStore(str(tmp_path)))
+
+    backfill.run(["AAPL", "MSFT"], date(2024, 1, 1), date(2024, 1, 7), mode=GROUPED)
+    written = backfill.run(["AAPL", "MSFT"], date(2023, 12, 25), date(2023, 12, 29), mode=GROUPED)
+    assert written == {"AAPL": 5, "MSFT": 5} and client._make_request.call_count == 10
+
+    raw = backfill.run(["AAPL", "MSFT"], date(2024, 1, 1), date(2024, 1, 7), mode=GROUPED, adjusted=False)
+    assert client._make_request.call_count == 15
+    assert client._make_request.call_args.kwargs["params"] == {"adjusted": "false"}
+    # Unadjusted bars go to their own series instead of deduplicating against adjusted ones
+    assert raw == {"AAPL": 5, "MSFT": 5} and backfill.store.count("AAPL", "day_unadjusted") == 5
+    assert backfill.store.count("AAPL", "day") == 10
+
+
+def test_grouped_backfill_records_coverage_but_not_today(tmp_path):
+    """Test flushed days count as covered for range fetches and today is refetched."""
+    client = _grouped_client()
+    store = BarStore(str(tmp_path))
+    backfill = DailyBackfill(client, store, flush_days=2)
+
+    backfill.run(["AAPL", "MSFT"], date(2024, 1, 1), date(2024, 1, 7), mode=GROUPED)
+    assert store.coverage("MSFT", "day") == [(date(2024, 1, 1), date(2024, 1, 7))]
+    assert store.coverage("ZZZ", "day") == []
+    backfill.planner.fetch("AAPL", date(2024, 1, 2), date(2024, 1, 5), "day", store=store)
+    assert client.get_aggregates.call_count == 0  # Nothing missing
+
+    day = datetime.now(timezone.utc).date()
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    calls = client._make_request.call_count
+    backfill.run(["AAPL"], day, day, mode=GROUPED)
+    backfill.run(["AAPL"], day, day, mode=GROUPED)
+    assert client._make_request.call_count == calls + 2
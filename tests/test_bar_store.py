@@ -0,0 +1,68 @@
+"""Tests for memory-mapped bar store."""
+
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.bar_store import BAR_DTYPE, BarStore, to_epoch_ms
+
+DAY_MS = 86_400_000
+START = to_epoch_ms("2024-01-02")
+
+
+def _bars(days):
+    return [
+        {"t": START + d * DAY_MS, "o": 1.0 + d, "h": 2.0 + d, "l": 0.5 + d, "c": 1.5 + d, "v": 100.0 * d}
+        for d in days
+    ]
+
+
+def test_append_is_incremental_and_deduplicated(tmp_path):
+    """Test appends keep only bars newer than the stored tail."""
+    store = BarStore(str(tmp_path))
+    assert store.append("AAPL", "day", _bars([0, 1, 2])) == 3
+    assert store.append("AAPL", "day", _bars([2, 1, 3, 3, 4])) == 2
+    bars = store.read("AAPL", "day")
+    assert bars.dtype == BAR_DTYPE
+    assert list((bars["t"] - START) // DAY_MS) == [0, 1, 2, 3, 4]
+    assert np.isnan(bars["vw"]).all() and (bars["n"] == 0).all()
+    assert store.last_timestamp("AAPL", "day") == START + 4 * DAY_MS
+
+
+def test_read_slices_by_time_without_copy(tmp_path):
+    """Test range reads are memmap views bounded by inclusive dates."""
+    store = BarStore(str(tmp_path))
+    store.append("X:BTCUSD", "day", _bars(range(10)))
+    window = store.read("X:BTCUSD", "day", start="2024-01-04", end="2024-01-06")
+    assert isinstance(window, np.memmap)
+    assert list(window["c"]) == [3.5, 4.5, 5.5]
+    assert len(store.read("X:BTCUSD", "day", start=START + 20 * DAY_MS)) == 0
+    assert len(store.read("MSFT", "day")) == 0
+    store.append("X_BTCUSD", "day", _bars([0]))
+    assert store.tickers() == ["X:BTCUSD", "X_BTCUSD"]  # Names don't collide
+    assert store.count("X:BTCUSD", "day") == 10
+
+
+def test_torn_tail_is_ignored_and_repaired(tmp_path):
+    """Test a partial trailing record from a crashed append is discarded."""
+    store = BarStore(str(tmp_path))
+    store.append("AAPL", "minute", _bars([0, 1]))
+    with open(store._path("AAPL", "minute"), "ab") as f:
+        f.write(b"\x00" * 10)
+    assert store.count("AAPL", "minute") == 2
+    store.append("AAPL", "minute", _bars([2]))
+    assert os.path.getsize(store._path("AAPL", "minute")) == 3 * BAR_DTYPE.itemsize
+
+
+def test_older_bars_are_merged_in(tmp_path):
+    """Test backfilled history and gaps are merged before the stored tail."""
+    store = BarStore(str(tmp_path))
+    store.append("AAPL", "day", _bars([5, 6, 7]))
+    assert store.append("AAPL", "day", _bars([0, 1, 2, 5])) == 3
+    assert store.append("AAPL", "day", _bars([3, 4, 8])) == 3
+    bars = store.read("AAPL", "day")
+    assert list((bars["t"] - START) // DAY_MS) == list(range(9))
+    assert store.first_timestamp("AAPL", "day") == START
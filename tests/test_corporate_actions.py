@@ -0,0 +1,122 @@
+"""Tests for local split/dividend adjustment."""
+
+from datetime import date, datetime, timedelta, timezone
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_server import MockMassiveServer
+from src.api_client import MassiveAPIClient, RateLimiter
+from src.bar_store import BAR_DTYPE, BarStore, series_name
+from src.corporate_actions import AdjustmentEngine, SplitSync, adjustment_factors
+from src.dividend_sync import DividendSync
+from src.records import Dividend, Split
+from src.retry import EntitlementMap
+
+
+def _client(server, tmp_path):
+    return MassiveAPIClient(api_key="test_key", base_url=server.base_url,
+                            rate_limiter=RateLimiter(calls_per_minute=10 ** 9),
+                            entitlements=EntitlementMap(str(tmp_path / "entitlements.json")))
+
+
+def _daily_bars(first: date, count: int) -> np.ndarray:
+    """Bars stamped 04:00 UTC (midnight New York) on consecutive days."""
+    start = int(datetime(first.year, first.month, first.day, 4, tzinfo=timezone.utc).timestamp() * 1000)
+    bars = np.zeros(count, dtype=BAR_DTYPE)
+    bars["t"] = start + np.arange(count) * 86_400_000
+    bars["o"] = bars["h"] = bars["l"] = bars["c"] = bars["vw"] = 100.0
+    bars["v"] = 1000.0
+    bars["n"] = 7
+    return bars
+
+
+def test_factors_match_hand_computation():
+    """Test split and dividend factors apply only to bars before each event."""
+    bars = _daily_bars(date(2024, 6, 1), 6)  # June 1..6
+    bars["c"] = [100, 100, 50, 50, 40, 40]
+    splits = [Split.from_dict({"ticker": "X", "execution_date": "2024-06-03", "split_from": 1, "split_to": 2}),
+              {"ticker": "X", "execution_date": "2024-07-01", "split_from": 1, "split_to": 3}]  # After the data
+    dividends = [Dividend.from_dict({"ticker": "X", "ex_dividend_date": "2024-06-05", "cash_amount": 1.0})]
+
+    price, volume = adjustment_factors(bars["t"], bars["c"], splits)
+    assert price.tolist() == [0.5, 0.5, 1, 1, 1, 1]
+    assert volume.tolist() == [2, 2, 1, 1, 1, 1]
+
+    price, volume = adjustment_factors(bars["t"], bars["c"], splits, dividends)
+    dividend = 1 - 1.0 / 50  # Close on June 4, the day before the ex date
+    np.testing.assert_allclose(price, [0.5 * dividend] * 2 + [dividend] * 2 + [1, 1])
+    assert volume.tolist() == [2, 2, 1, 1, 1, 1]
+
+
+def test_split_sync_then_adjusted_reads_are_cached(tmp_path):
+    """Test splits sync incrementally and the engine reuses factors until bars change."""
+    with MockMassiveServer(tickers=100) as server:
+        db = str(tmp_path / "actions.db")
+        with SplitSync(_client(server, tmp_path), db) as splits, \
+                DividendSync(None, db) as dividends:
+            first = splits.sync(as_of=date(2024, 12, 1))
+            assert first["inserted"] == 4 and first["calls"] == 1
+            assert splits.sync(as_of=date(2024, 12, 2))["fetched"] == 0  # Nothing after Nov 2
+
+            ticker = server.tickers[25]
+            split = splits.splits(ticker)[0]
+            assert split.ratio == 2 and split.execution_date == date(2024, 6, 10)
+
+            store = BarStore(str(tmp_path / "bars"))
+            raw = series_name("day", adjusted=False)
+            store.append(ticker, raw, _daily_bars(date(2024, 6, 3), 10))
+            store.append(ticker, "day", _daily_bars(date(2024, 6, 3), 10))  # Already adjusted; not used
+            engine = AdjustmentEngine(store, splits, dividends)
+
+            adjusted = engine.read(ticker, "day")
+            assert adjusted["c"].tolist() == [50.0] * 7 + [100.0] * 3
+            assert adjusted["v"].tolist() == [2000.0] * 7 + [1000.0] * 3
+            assert adjusted["n"].tolist() == [7] * 10
+            window = engine.read(ticker, "day", start="2024-06-09", end="2024-06-11")
+            assert window["c"].tolist() == [50.0, 100.0, 100.0]
+
+            cached = engine.factors(ticker, "day")[1]
+            assert engine.factors(ticker, "day")[1] is cached
+            store.append(ticker, raw, _daily_bars(date(2024, 6, 13), 1))
+            assert engine.factors(ticker, "day")[1] is not cached
+            assert len(engine.read(ticker, "day", dividends=True)) == 11
+
+            # Adjusting bars the API already adjusted would apply the split twice
+            store.append(server.tickers[50], "day", _daily_bars(date(2024, 6, 3), 10))
+            with pytest.raises(ValueError, match="adjusted=False"):
+                engine.read(server.tickers[50], "day")
+
+
+def test_events_start_at_new_york_midnight():
+    """Test a winter split also adjusts the previous evening's post-market bars."""
+    evening = int(datetime(2024, 1, 8, 0, 30, tzinfo=timezone.utc).timestamp() * 1000)  # Jan 7, 19:30 EST
+    midnight = int(datetime(2024, 1, 8, 5, tzinfo=timezone.utc).timestamp() * 1000)  # Jan 8, 00:00 EST
+    split = {"ticker": "X", "execution_date": "2024-01-08", "split_from": 1, "split_to": 2}
+
+    price, volume = adjustment_factors([evening, midnight - 60_000, midnight], [10.0] * 3, [split])
+    assert price.tolist() == [0.5, 0.5, 1.0] and volume.tolist() == [2, 2, 1]
+
+
+def test_corrected_split_invalidates_cached_factors(tmp_path):
+    """Test a same-day re-sync that changes a ratio isn't served stale factors."""
+    with MockMassiveServer(tickers=200) as server:
+        with SplitSync(_client(server, tmp_path), str(tmp_path / "actions.db")) as splits:
+            splits.sync(as_of=date(2024, 8, 10))
+            ticker = server.tickers[175]
+            execution_date = date.fromisoformat(splits.splits(ticker)[0]["execution_date"])
+
+            store = BarStore(str(tmp_path / "bars"))
+            store.append(ticker, series_name("day", adjusted=False),
+                         _daily_bars(execution_date - timedelta(days=2), 4))
+            engine = AdjustmentEngine(store, splits)
+            assert engine.read(ticker, "day")["c"].tolist() == [50.0, 50.0, 100.0, 100.0]
+
+            record = next(r for r in server.records("splits") if r["ticker"] == ticker)
+            record["split_to"] = 4
+            assert splits.sync(as_of=date(2024, 8, 10))["updated"] == 1
+            assert engine.read(ticker, "day")["c"].tolist() == [25.0, 25.0, 100.0, 100.0]
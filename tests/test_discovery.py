@@ -0,0 +1,55 @@
+"""Tests for endpoint discovery engine."""
+
+import pytest
+import requests
+from unittest.mock import Mock
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.discovery import DiscoveryEngine, EndpointRegistry, load_catalog
+from src.retry import EntitlementMap
+
+
+def test_bundled_catalog_loads():
+    """Test the shipped catalog is valid and has unique names."""
+    catalog = load_catalog()
+    assert len(catalog) > 20
+    assert all(entry["priority"] >= 1 for entry in catalog)
+
+
+def test_run_respects_budget_priority_and_registry(tmp_path):
+    """Test only untested entries are probed, most important first."""
+    catalog_path = tmp_path / "endpoints.yaml"
+    catalog_path.write_text(
+        "endpoints:\n"
+        "  - {name: low, endpoint: /reference/low, priority: 9}\n"
+        "  - {name: high, endpoint: /reference/tickers, params: {limit: 1}, priority: 1}\n"
+        "  - {name: missing, endpoint: /reference/missing, priority: 2}\n"
+    )
+    client = Mock()
+    client.entitlements = EntitlementMap(str(tmp_path / "entitlements.json"))
+
+    def make_request(endpoint, params=None):
+        if endpoint == "/reference/missing":
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.HTTPError("404 Not Found", response=response)
+        return {"status": "OK", "results": [{"ticker": "A", "active": True}]}
+
+    client._make_request.side_effect = make_request
+    registry = EndpointRegistry(str(tmp_path / "registry.json"))
+    engine = DiscoveryEngine(client, load_catalog(str(catalog_path)), registry)
+
+    first = engine.run(budget=2)
+    assert [r["name"] for r in first] == ["high", "missing"]
+    assert first[0]["sample_schema"] == {"ticker": "str", "active": "bool"}
+    assert first[1]["status"] == "not_found"
+
+    # New process: registry reloaded from disk, only the leftover entry is probed
+    engine = DiscoveryEngine(client, load_catalog(str(catalog_path)),
+                             EndpointRegistry(str(tmp_path / "registry.json")))
+    assert [r["name"] for r in engine.run(budget=5)] == ["low"]
+    assert engine.run(budget=5) == []
+    assert client._make_request.call_count == 3
@@ -0,0 +1,79 @@
+"""Tests for incremental dividend sync."""
+
+from datetime import date
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_server import MockMassiveServer
+from src.api_client import MassiveAPIClient, RateLimiter
+from src.dividend_sync import DividendSync
+from src.retry import EntitlementMap
+
+
+def _client(server, tmp_path):
+    return MassiveAPIClient(api_key="test_key", base_url=server.base_url,
+                            rate_limiter=RateLimiter(calls_per_minute=10 ** 9),
+                            entitlements=EntitlementMap(str(tmp_path / "entitlements.json")))
+
+
+def test_initial_load_then_refresh_fetches_only_recent(tmp_path):
+    """Test a large initial load pages market-wide and refreshes cost one call."""
+    with MockMassiveServer(tickers=300, dividends_per_ticker=8) as server:
+        universe = server.tickers[:50]
+        with DividendSync(_client(server, tmp_path), str(tmp_path / "dividends.db"),
+                          max_ticker_calls=10) as sync:
+            first = sync.sync(universe, as_of=date(2024, 11, 20))
+            assert first["calls"] == 3  # 2400 records, 1000 per page
+            assert first["inserted"] == 50 * 8 and sync.count() == 400
+            assert first["skipped"] == 2000
+
+            refresh = sync.sync(universe, as_of=date(2024, 12, 5))
+            assert refresh["calls"] == 1
+            assert refresh["inserted"] == 0 and refresh["unchanged"] == 50
+
+            # A corrected amount inside the window is picked up as an update
+            record = next(r for r in server.records("dividends")
+                          if r["ticker"] == universe[0] and r["ex_dividend_date"] == "2024-12-01")
+            record["cash_amount"] = 9.99
+            again = sync.sync(universe, as_of=date(2024, 12, 6))
+            assert again["updated"] == 1 and again["unchanged"] == 49
+            assert sync.dividends(universe[0])[-1].cash_amount == 9.99
+            assert sync.high_water_mark() == date(2024, 12, 6)
+
+
+def test_new_tickers_get_history_per_ticker(tmp_path):
+    """Test tickers added later are backfilled with one call each."""
+    with MockMassiveServer(tickers=20, dividends_per_ticker=4) as server:
+        with DividendSync(_client(server, tmp_path), str(tmp_path / "dividends.db")) as sync:
+            sync.sync(server.tickers[:2], as_of=date(2024, 12, 5))
+            stats = sync.sync(server.tickers[:3], as_of=date(2024, 12, 6))
+
+            assert stats["calls"] == 2  # history for the new ticker + refresh
+            assert len(sync.dividends(server.tickers[2])) == 4
+            assert sync.synced_tickers() == sorted(server.tickers[:3])
+
+
+def test_small_initial_universe_loads_per_ticker(tmp_path):
+    """Test a universe within max_ticker_calls doesn't page the whole market."""
+    with MockMassiveServer(tickers=300, dividends_per_ticker=8) as server:
+        universe = server.tickers[:3]
+        with DividendSync(_client(server, tmp_path), str(tmp_path / "dividends.db")) as sync:
+            stats = sync.sync(universe, as_of=date(2024, 12, 5))
+
+            assert stats["calls"] == 3 and stats["fetched"] == 3 * 8 and stats["skipped"] == 0
+            assert sync.synced_tickers() == sorted(universe)
+            assert sync.sync(universe + [server.tickers[3]], as_of=date(2024, 12, 6))["calls"] == 2
+
+
+def test_whole_market_sync_after_a_universe_loads_everything(tmp_path):
+    """Test sync(None) after a universe-only load backfills the rest of the market once."""
+    with MockMassiveServer(tickers=20, dividends_per_ticker=4) as server:
+        with DividendSync(_client(server, tmp_path), str(tmp_path / "dividends.db")) as sync:
+            sync.sync(server.tickers[:2], as_of=date(2024, 12, 5))
+            stats = sync.sync(as_of=date(2024, 12, 6))
+
+            assert sync.count() == 20 * 4 and stats["inserted"] == 18 * 4
+            assert sync.sync(as_of=date(2024, 12, 7))["calls"] == 1  # Refresh only from now on
@@ -0,0 +1,146 @@
+"""Tests for the streaming exporter."""
+
+import csv
+import gzip
+import json
+from datetime import date
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_server import MockMassiveServer
+from src.api_client import MassiveAPIClient, RateLimiter
+from src.exporter import CSVWriter, Exporter
+from src.retry import EntitlementMap
+
+
+class _FailingClient(MassiveAPIClient):
+    """Raises once ``fail_after`` requests have been made."""
+
+    fail_after = None
+
+    def _make_request(self, *args, **kwargs):
+        if self.fail_after is not None:
+            if self.fail_after == 0:
+                raise ConnectionError("network down")
+            self.fail_after -= 1
+        return super()._make_request(*args, **kwargs)
+
+
+def _client(server, tmp_path, fail_after=None):
+    client = _FailingClient(api_key="test_key", base_url=server.base_url,
+                            rate_limiter=RateLimiter(calls_per_minute=10 ** 9),
+                            entitlements=EntitlementMap(str(tmp_path / "entitlements.json")))
+    client.fail_after = fail_after
+    return client
+
+
+@pytest.fixture
+def server():
+    with MockMassiveServer(tickers=250) as mock:
+        yield mock
+
+
+def test_paginated_export_resumes_after_failure(server, tmp_path):
+    """Test an interrupted gzip NDJSON export resumes without refetching or duplicates."""
+    output = str(tmp_path / "tickers.ndjson.gz")
+    params = {"limit": 20}
+    with pytest.raises(ConnectionError):
+        Exporter(_client(server, tmp_path, fail_after=7), output, buffer_rows=50).export_pages(
+            "/reference/tickers", params)
+    assert os.path.exists(f"{output}.checkpoint.json")
+
+    before = server.request_count
+    rows = Exporter(_client(server, tmp_path), output, buffer_rows=50).export_pages("/reference/tickers", params)
+    assert rows == 250
+    assert server.request_count - before == 13 - 6  # Pages 1-6 were checkpointed (3 flushes of 2 pages)
+    with gzip.open(output, "rt") as f:
+        tickers = [json.loads(line)["ticker"] for line in f]
+    assert tickers == server.tickers
+    assert not os.path.exists(f"{output}.checkpoint.json")
+
+
+def test_aggregate_export_to_csv_resumes_by_chunk(server, tmp_path):
+    """Test chunked minute bars for several tickers land in one CSV exactly once."""
+    output = str(tmp_path / "bars.csv")
+    args = (["AAAA", "AAAB"], 1, "minute", date(2024, 1, 1), date(2024, 6, 30))
+    with pytest.raises(ConnectionError):
+        Exporter(_client(server, tmp_path, fail_after=3), output, buffer_rows=1).export_aggregates(*args)
+
+    rows = Exporter(_client(server, tmp_path), output, buffer_rows=1).export_aggregates(*args)
+    with open(output, newline="") as f:
+        records = list(csv.DictReader(f))
+    assert rows == len(records) == 2 * 130 * 390  # 130 weekdays, 390 bars each
+    assert [r["T"] for r in records[::390 * 130]] == ["AAAA", "AAAB"]
+    assert len({(r["T"], r["t"]) for r in records}) == len(records)
+
+
+def test_parquet_export(server, tmp_path):
+    """Test Parquet output is a dataset of parts with one schema."""
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    output = str(tmp_path / "tickers.parquet")
+    Exporter(_client(server, tmp_path), output, buffer_rows=100).export_pages("/reference/tickers", {"limit": 100})
+    table = pyarrow_parquet.read_table(output)
+    assert table.num_rows == 250
+    assert sorted(os.listdir(output)) == ["part-00000.parquet", "part-00001.parquet", "part-00002.parquet"]
+
+
+def test_aggregate_export_keeps_every_api_field(server, tmp_path):
+    """Test exported bars are the API records, not a round trip through BAR_DTYPE."""
+    class _OTCClient(_FailingClient):
+        def _make_request(self, *args, **kwargs):
+            page = super()._make_request(*args, **kwargs)
+            for bar in page.get("results") or []:
+                bar["otc"] = True
+            return page
+
+    client = _OTCClient(api_key="test_key", base_url=server.base_url,
+                        rate_limiter=RateLimiter(calls_per_minute=10 ** 9),
+                        entitlements=EntitlementMap(str(tmp_path / "entitlements.json")))
+    output = str(tmp_path / "bars.ndjson")
+    Exporter(client, output).export_aggregates(["AAAA"], 1, "day", date(2024, 1, 1), date(2024, 1, 5))
+    with open(output) as f:
+        rows = [json.loads(line) for line in f]
+    expected = client.get_aggregates("AAAA", 1, "day", "2024-01-01", "2024-01-05").to_list()
+    assert rows == [dict(bar, T="AAAA") for bar in expected]
+    assert rows[0]["otc"] is True and isinstance(rows[0]["t"], int)
+
+
+def test_csv_keeps_keys_missing_from_the_header(tmp_path):
+    """Test keys first seen after the header land in the extra column."""
+    output = str(tmp_path / "rows.csv")
+    writer = CSVWriter(output, compress=False)
+    writer.write([{"a": 1, "b": 2}])
+    writer.write([{"a": 3, "c": {"x": 1}, "d": None}])
+    writer.close()
+    with open(output, newline="") as f:
+        records = list(csv.DictReader(f))
+    assert list(records[0]) == ["a", "b", "extra"]
+    assert records[0]["extra"] == "" and records[1]["b"] == ""
+    assert json.loads(records[1]["extra"]) == {"c": {"x": 1}, "d": None}
+
+
+def test_finished_export_is_not_repeated_after_a_crash(server, tmp_path, monkeypatch):
+    """Test a crash after the last flush but before cleanup doesn't append a second copy."""
+    output = str(tmp_path / "tickers.ndjson")
+    params = {"limit": 100}
+    real_remove = os.remove
+
+    def crash(path):
+        if path.endswith(".checkpoint.json"):
+            raise KeyboardInterrupt
+        real_remove(path)
+
+    monkeypatch.setattr(os, "remove", crash)
+    with pytest.raises(KeyboardInterrupt):
+        Exporter(_client(server, tmp_path), output, buffer_rows=50).export_pages("/reference/tickers", params)
+    monkeypatch.setattr(os, "remove", real_remove)
+
+    before = server.request_count
+    rows = Exporter(_client(server, tmp_path), output, buffer_rows=50).export_pages("/reference/tickers", params)
+    with open(output) as f:
+        assert rows == len(f.readlines()) == 250
+    assert server.request_count == before and not os.path.exists(f"{output}.checkpoint.json")
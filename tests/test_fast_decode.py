@@ -0,0 +1,98 @@
+"""Tests for columnar response decoding."""
+
+import json
+import numpy as np
+import requests
+from unittest.mock import Mock
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_server import MockMassiveServer
+from src import fast_decode
+from src.api_client import MassiveAPIClient, RateLimiter
+from src.bar_store import BAR_DTYPE, bars_to_array
+from src.fast_decode import TRADE_DTYPE, columns_to_records, decode_columns
+from src.response_cache import ResponseCache
+from src.retry import EntitlementMap
+
+
+def test_uniform_rows_scan_matches_json_decode():
+    """Test the dict-free scan matches json.loads + bars_to_array exactly."""
+    payload = json.dumps({
+        "ticker": "AAPL",
+        "results": [
+            {"v": 1200.0, "vw": 185.1, "o": 185.0, "c": 185.2, "h": 185.3, "l": 184.9, "t": 1704205800000, "n": 12},
+            {"v": 5.5e-05, "vw": 1.25e+2, "o": -1.0, "c": 2, "h": 3, "l": 0, "t": 1704205860000, "n": 1},
+        ],
+        "next_url": "https://api.massive.com/v2/aggs/ticker/AAPL/range/1/minute/x?cursor=[2]",
+    }).encode()
+
+    assert fast_decode._scan_rows(payload[payload.find(b"[") + 1:payload.find(b"]")], BAR_DTYPE) is not None
+    body = decode_columns(payload)
+    expected = bars_to_array(json.loads(payload)["results"])
+    assert body["results"].dtype == BAR_DTYPE
+    assert np.array_equal(body["results"], expected)
+    assert body["next_url"].endswith("cursor=[2]")
+    assert body["ticker"] == "AAPL"
+
+
+def test_irregular_rows_fall_back_to_parser():
+    """Test strings, nulls, nested arrays and ns timestamps keep exact values."""
+    payload = json.dumps({"results": [
+        {"sip_timestamp": 1704205800123456789, "price": 185.01, "size": 100, "exchange": 4,
+         "conditions": [12, 37], "id": "a1"},
+        {"sip_timestamp": 1704205800123456790, "price": None, "size": 5, "exchange": 11},
+    ]}).encode()
+
+    trades = decode_columns(payload, TRADE_DTYPE)["results"]
+    assert trades["sip_timestamp"].tolist() == [1704205800123456789, 1704205800123456790]
+    assert trades["price"][0] == 185.01 and np.isnan(trades["price"][1])
+    assert trades["exchange"].tolist() == [4, 11]
+    assert columns_to_records(trades[:1])[0]["size"] == 100.0
+
+
+def test_client_as_array_pages_and_caches(tmp_path):
+    """Test get_aggregates(as_array=True) stitches pages and round-trips the cache."""
+    with MockMassiveServer() as server:
+        client = MassiveAPIClient(api_key="test_key", base_url=server.base_url,
+                                  rate_limiter=RateLimiter(calls_per_minute=10 ** 9),
+                                  cache=ResponseCache(str(tmp_path / "cache")),
+                                  entitlements=EntitlementMap(str(tmp_path / "entitlements.json")))
+        bars = client.get_aggregates("AAPL", 1, "minute", "2024-01-02", "2024-01-05", limit=1000, as_array=True)
+        records = client.get_aggregates("AAPL", 1, "minute", "2024-01-02", "2024-01-05", limit=1000)
+        cached = client.get_aggregates("AAPL", 1, "minute", "2024-01-02", "2024-01-05", limit=1000, as_array=True)
+        requests_made = server.request_count
+
+    assert len(bars) == 4 * 390
+    assert np.array_equal(bars, bars_to_array(records))
+    assert np.array_equal(cached, bars)
+    assert requests_made == 2  # two pages, then all from cache
+
+
+def test_boolean_and_null_rows_fall_back_and_cache_keeps_original(tmp_path):
+    """Test otc/null values decode via the parser and the cache stores the API body."""
+    rows = [{"v": 10.0, "o": 1.5, "c": 1.6, "h": 1.7, "l": 1.4, "t": 1704205800000, "n": 3, "otc": True},
+            {"v": 11.0, "o": 1.6, "c": 1.7, "h": 1.8, "l": 1.5, "t": 1704205860000, "otc": False, "vw": None}]
+    for results in ([rows[0], rows[0]], [{"vw": None, "t": 1}, {"vw": None, "t": 2}], rows):
+        payload = json.dumps({"results": results}).encode()
+        decoded, expected = decode_columns(payload)["results"], bars_to_array(results)
+        for name in BAR_DTYPE.names:
+            np.testing.assert_array_equal(decoded[name], expected[name])
+
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps({"status": "OK", "results": rows}).encode()
+    client = MassiveAPIClient(api_key="test_key", rate_limiter=RateLimiter(calls_per_minute=10 ** 9),
+                              cache=ResponseCache(str(tmp_path / "cache")),
+                              entitlements=EntitlementMap(str(tmp_path / "entitlements.json")),
+                              base_url="https://api.massive.com/v3")
+    client.session.request = Mock(return_value=response)
+    endpoint = "/v2/aggs/ticker/AAPL/range/1/minute/2024-01-02/2024-01-02"
+    assert client._make_request(endpoint, columns=BAR_DTYPE)["results"]["n"].tolist() == [3, 0]
+    assert client._make_request(endpoint) == {"status": "OK", "results": rows}  # Lossless cache hit
+    assert client.cache.lookup(endpoint, {}, "https://api.massive.com").raw == response.content  # Stored unparsed
+    assert client._make_request(endpoint, columns=BAR_DTYPE)["results"]["n"].tolist() == [3, 0]
+    assert client.session.request.call_count == 1
@@ -0,0 +1,58 @@
+"""Tests for local FX cross rates."""
+
+from datetime import date
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_server import MockMassiveServer
+from src.api_client import MassiveAPIClient, RateLimiter
+from src.fx_rates import FXRates, parse_pair
+from src.retry import EntitlementMap
+
+
+def test_cross_rates_are_triangulated_and_direct_quotes_win():
+    """Test crosses go through the anchor (or a longer chain) unless quoted directly."""
+    rates = FXRates({"C:EURUSD": 1.10, "C:USDJPY": 150.0, "C:GBPUSD": 1.25,
+                     "C:EURGBP": 0.87, "C:EURHUF": 400.0, "X:BTCUSD": 60000.0})
+
+    assert parse_pair("X:BTCUSD") is None and rates.currencies == ["EUR", "GBP", "HUF", "JPY", "USD"]
+    assert rates.rate("EUR", "JPY") == pytest.approx(1.10 * 150)
+    assert rates.rate("JPY", "GBP") == pytest.approx(1 / 150 / 1.25)
+    assert rates.rate("EUR", "GBP") == 0.87  # Direct quote, not 1.10 / 1.25
+    assert rates.rate("GBP", "EUR") == pytest.approx(1 / 0.87)
+    assert rates.rate("HUF", "USD") == pytest.approx(1.10 / 400)  # HUF -> EUR -> USD
+    with pytest.raises(ValueError, match="Unknown currency CHF"):
+        rates.rate("CHF", "USD")
+
+
+def test_bulk_conversion_broadcasts():
+    """Test array conversion matches element-wise rates."""
+    rates = FXRates({"EURUSD": 1.10, "USDJPY": 150.0, "GBPUSD": 1.25})
+    amounts = np.array([100.0, 2500.0, 1.0, 40.0])
+    source = ["EUR", "jpy", "GBP", "USD"]
+
+    to_usd = rates.convert(amounts, source, "USD")
+    np.testing.assert_allclose(to_usd, [110.0, 2500 / 150, 1.25, 40.0])
+    pairwise = rates.convert(amounts, source, ["JPY", "EUR", "USD", "GBP"])
+    expected = [a * rates.rate(f, t) for a, f, t in zip(amounts, source, ["JPY", "EUR", "USD", "GBP"])]
+    np.testing.assert_allclose(pairwise, expected)
+    assert rates.convert(10, "GBP", "EUR") == pytest.approx(10 * 1.25 / 1.10)
+    assert rates.table(["EUR", "USD"])["EUR"]["USD"] == 1.10
+
+
+def test_load_uses_one_grouped_call_per_day_tried(tmp_path):
+    """Test a weekend date falls back to Friday's snapshot."""
+    with MockMassiveServer(tickers=10) as server:
+        client = MassiveAPIClient(api_key="test_key", base_url=server.base_url,
+                                  rate_limiter=RateLimiter(calls_per_minute=10 ** 9),
+                                  entitlements=EntitlementMap(str(tmp_path / "entitlements.json")))
+        rates = FXRates.load(client, date(2024, 6, 9))  # Sunday
+
+        assert rates.as_of == date(2024, 6, 7) and server.request_count == 3
+        assert rates.rate("PLN", "JPY") == pytest.approx(server.fx_rate("PLN", "JPY", date(2024, 6, 7)))
+        assert rates.rate("NZD", "CHF") == pytest.approx(server.fx_rate("NZD", "CHF", date(2024, 6, 7)))
@@ -0,0 +1,117 @@
+"""Tests for market holiday fetcher."""
+
+import json
+import threading
+from datetime import date
+import pytest
+from unittest.mock import Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+HOLIDAYS = [
+    {"date": "2024-11-28", "exchange": "NYSE", "name": "Thanksgiving", "status": "closed"},
+    {"date": "2024-11-28", "exchange": "NASDAQ", "name": "Thanksgiving", "status": "closed"},
+    {"date": "2024-11-29", "exchange": "NASDAQ", "name": "Thanksgiving", "status": "early-close",
+     "open": "2024-11-29T14:30:00.000Z", "close": "2024-11-29T18:00:00.000Z"},
+]
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    with patch.dict(os.environ, {"MASSIVE_API_KEY": "test_key"}):
+        from holiday_fetcher import HolidayFetcher
+        fetcher = HolidayFetcher("NASDAQ", snapshot_path=str(tmp_path / "holidays.json"))
+    fetcher.client.get_market_holidays = Mock(return_value=HOLIDAYS)
+    return fetcher
+
+
+def test_lookups_use_index_with_single_fetch(fetcher):
+    """Test all query methods answer from one fetch."""
+    assert fetcher.is_market_closed(date(2024, 11, 28))
+    assert not fetcher.is_trading_day(date(2024, 11, 28))
+    assert fetcher.is_early_close(date(2024, 11, 29))
+    assert fetcher.is_trading_day(date(2024, 11, 29))
+    assert fetcher.get_early_close_time(date(2024, 11, 29)) == "2024-11-29T18:00:00.000Z"
+    assert fetcher.get_holiday_name(date(2024, 11, 28), exchange="NYSE") == "Thanksgiving"
+    assert fetcher.get_holiday_info(date(2024, 11, 29), exchange="NYSE") is None
+    assert not fetcher.is_trading_day(date(2024, 11, 30))  # Saturday
+    assert fetcher.client.get_market_holidays.call_count == 1
+
+
+def test_index_rebuilt_on_refresh(fetcher):
+    """Test a forced refresh replaces the indexed data."""
+    assert fetcher.fetch_holidays() == HOLIDAYS[1:]
+    fetcher.client.get_market_holidays.return_value = HOLIDAYS[:1]
+    fetcher.fetch_holidays(force_refresh=True)
+    assert not fetcher.is_market_closed(date(2024, 11, 28))
+    assert fetcher.is_market_closed(date(2024, 11, 28), exchange="NYSE")
+
+
+def test_get_calendar_built_from_fetched_holidays(fetcher):
+    """Test the vectorized calendar reflects the exchange's closures."""
+    calendar = fetcher.get_calendar()
+    assert calendar.is_trading_day(["2024-11-28", "2024-11-29"]).tolist() == [False, True]
+    assert fetcher.get_calendar() is calendar
+    assert fetcher.get_calendar("NYSE").is_early_close(["2024-11-29"]).tolist() == [False]
+    assert fetcher.client.get_market_holidays.call_count == 1
+
+
+def test_snapshot_serves_cold_start_and_refreshes_in_background(tmp_path):
+    """Test a stale snapshot answers at once while the API refresh runs."""
+    snapshot = tmp_path / "holidays.json"
+    snapshot.write_text(json.dumps({"fetched_at": "2024-01-01T00:00:00", "holidays": HOLIDAYS[:1]}))
+    gate = threading.Event()
+
+    def slow_fetch():
+        gate.wait(timeout=5)
+        return HOLIDAYS
+
+    with patch.dict(os.environ, {"MASSIVE_API_KEY": "test_key"}):
+        from holiday_fetcher import HolidayFetcher
+        fetcher = HolidayFetcher("NYSE", snapshot_path=str(snapshot))
+    fetcher.client.get_market_holidays = Mock(side_effect=slow_fetch)
+
+    # Served from the stale snapshot while the refresh is blocked
+    assert fetcher.is_market_closed(date(2024, 11, 28))
+    assert not fetcher.is_market_closed(date(2024, 11, 28), exchange="NASDAQ")
+    gate.set()
+    fetcher._refresh_thread.join(timeout=5)
+
+    assert fetcher.is_market_closed(date(2024, 11, 28), exchange="NASDAQ")
+    assert len(json.loads(snapshot.read_text())["holidays"]) == 3
+    assert fetcher.client.get_market_holidays.call_count == 1
+
+
+def test_failed_refresh_keeps_last_good_calendar(fetcher):
+    """Test an API failure doesn't silently turn holidays into trading days."""
+    fetcher.fetch_holidays()
+    fetcher.client.get_market_holidays.side_effect = ConnectionError("down")
+    assert fetcher.fetch_holidays(force_refresh=True) == HOLIDAYS[1:]
+    assert fetcher.is_market_closed(date(2024, 11, 28))
+
+
+def test_failed_refresh_backs_off_and_empty_calendar_raises(tmp_path):
+    """Test failures don't start a refresh per lookup, and no data isn't "market open"."""
+    with patch.dict(os.environ, {"MASSIVE_API_KEY": "test_key"}):
+        from holiday_fetcher import CalendarUnavailableError, HolidayFetcher
+        fetcher = HolidayFetcher("NASDAQ", snapshot_path=str(tmp_path / "holidays.json"))
+    fetcher.client.get_market_holidays = Mock(side_effect=ConnectionError("down"))
+
+    for _ in range(3):
+        with pytest.raises(CalendarUnavailableError):
+            fetcher.is_market_closed(date(2024, 11, 28))
+    assert fetcher.client.get_market_holidays.call_count == 1  # Backing off
+
+    # A stale calendar whose refresh fails is served without a new thread per lookup
+    fetcher._retry_at = None
+    fetcher.client.get_market_holidays = Mock(return_value=HOLIDAYS)
+    fetcher.fetch_holidays(force_refresh=True)
+    fetcher._cache_timestamp -= fetcher._cache_duration
+    fetcher.client.get_market_holidays.side_effect = ConnectionError("down")
+    assert fetcher.is_market_closed(date(2024, 11, 28))
+    fetcher._refresh_thread.join(timeout=5)
+    for _ in range(5):
+        assert fetcher.is_market_closed(date(2024, 11, 28))
+    assert fetcher.client.get_market_holidays.call_count == 2
@@ -0,0 +1,120 @@
+"""Tests for local technical indicators."""
+
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.bar_store import BAR_DTYPE, BarStore
+from src.indicators import (ATR, EMA, MACD, RSI, SMA, Bollinger, IndicatorEngine, as_panel,
+                            atr, bollinger, ema, macd, rsi, sma)
+
+DAY_MS = 86_400_000
+
+
+def _bars(seed: int, count: int, start: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    bars = np.zeros(count, dtype=BAR_DTYPE)
+    bars["t"] = (start + np.arange(count)) * DAY_MS
+    bars["c"] = 100 + np.cumsum(rng.normal(size=count))
+    bars["h"] = bars["c"] + rng.random(count)
+    bars["l"] = bars["c"] - rng.random(count)
+    return bars
+
+
+def _reference_ema(values, n, alpha):
+    out = np.full(len(values), np.nan)
+    out[n - 1] = value = values[:n].mean()
+    for i in range(n, len(values)):
+        value += alpha * (values[i] - value)
+        out[i] = value
+    return out
+
+
+def test_indicators_match_loop_definitions():
+    """Test each indicator against a plain per-bar implementation."""
+    bars = _bars(0, 300)
+    close, high, low = bars["c"], bars["h"], bars["l"]
+
+    expected_sma = np.array([np.nan] * 19 + [close[i - 19:i + 1].mean() for i in range(19, 300)])
+    assert np.allclose(sma(close, 20), expected_sma, equal_nan=True)
+    assert np.allclose(ema(close, 20), _reference_ema(close, 20, 2 / 21), equal_nan=True)
+
+    change = np.diff(close)
+    gain = _reference_ema(np.maximum(change, 0), 14, 1 / 14)
+    loss = _reference_ema(np.maximum(-change, 0), 14, 1 / 14)
+    assert np.allclose(rsi(close, 14)[1:], 100 - 100 / (1 + gain / loss), equal_nan=True)
+
+    previous = np.r_[np.nan, close[:-1]]
+    true_range = np.fmax(high - low, np.fmax(abs(high - previous), abs(low - previous)))
+    assert np.allclose(atr(high, low, close, 14), _reference_ema(true_range, 14, 1 / 14), equal_nan=True)
+
+    bands = bollinger(close, 20, 2.0)
+    assert np.isclose(bands["upper"][-1] - bands["middle"][-1], 2 * close[-20:].std())
+    lines = macd(close)
+    assert np.allclose(lines["macd"], ema(close, 12) - ema(close, 26), equal_nan=True)
+    assert np.allclose(lines["hist"], lines["macd"] - lines["signal"], equal_nan=True)
+
+
+def test_panel_rows_match_single_series():
+    """Test ragged tickers in one panel get the same values as alone."""
+    short, long = _bars(1, 80)["c"], _bars(2, 200)["c"]
+    panel, lengths = as_panel([short, long])
+    values = rsi(panel)
+    assert list(lengths) == [80, 200]
+    assert np.allclose(values[0, :80], rsi(short), equal_nan=True)
+    assert np.isnan(values[0, 80:]).all()
+    assert np.allclose(values[1], rsi(long), equal_nan=True)
+
+
+def test_engine_incremental_updates_match_full_recompute(tmp_path):
+    """Test appending bars and updating equals computing from scratch."""
+    store = BarStore(str(tmp_path))
+    tickers = [f"T{i}" for i in range(5)]
+    full = {ticker: _bars(i, 120 + 10 * i) for i, ticker in enumerate(tickers)}
+    for ticker, bars in full.items():
+        store.append(ticker, "day", bars[:-3])
+
+    indicators = {"sma20": SMA(20), "ema10": EMA(10), "rsi": RSI(14), "macd": MACD(),
+                  "bb": Bollinger(20), "atr": ATR(14)}
+    engine = IndicatorEngine(store, indicators)
+    engine.update(tickers)
+    for ticker, bars in full.items():
+        store.append(ticker, "day", bars[-3:])
+    latest = engine.update(tickers)
+
+    assert np.allclose(latest["sma20"], [sma(full[t]["c"], 20)[-1] for t in tickers])
+    assert np.allclose(latest["macd.signal"], [macd(full[t]["c"])["signal"][-1] for t in tickers])
+    assert np.allclose(latest["bb.lower"], [bollinger(full[t]["c"])["lower"][-1] for t in tickers])
+    assert np.allclose(latest["atr"], [atr(full[t]["h"], full[t]["l"], full[t]["c"])[-1] for t in tickers])
+
+    # Nothing new: values carry over
+    again = engine.update(tickers[:2])
+    assert np.allclose(again["rsi"], latest["rsi"][:2])
+
+
+def test_engine_recomputes_after_older_history_is_merged(tmp_path):
+    """Test backfilled bars before the first stored one aren't skipped."""
+    store = BarStore(str(tmp_path))
+    bars = _bars(3, 80)
+    store.append("T", "day", bars[40:])
+    engine = IndicatorEngine(store, {"sma20": SMA(20), "ema10": EMA(10)})
+    engine.update(["T"])
+
+    store.append("T", "day", bars[:40])
+    latest = engine.update(["T"])
+    assert np.allclose(latest["ema10"], ema(bars["c"], 10)[-1])
+    assert np.allclose(latest["sma20"], sma(bars["c"], 20)[-1])
+
+
+def test_rolling_windows_stay_precise_on_long_high_priced_series():
+    """Test the band width doesn't cancel to zero for 500k bars near 50,000."""
+    rng = np.random.default_rng(7)
+    close = 50_000 + np.cumsum(rng.normal(scale=0.01, size=500_000))
+    bands = bollinger(close, 20)
+    for end in (20, 250_000, 500_000):
+        window = close[end - 20:end]
+        assert np.isclose(bands["middle"][end - 1], window.mean(), rtol=0, atol=1e-9)
+        std = (bands["upper"][end - 1] - bands["middle"][end - 1]) / 2
+        assert np.isclose(std, window.std(), rtol=1e-6)
@@ -0,0 +1,103 @@
+"""Tests for multi-key dispatch."""
+
+import pytest
+import requests
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_server import MockMassiveServer
+from src.api_client import MassiveAPIClient
+from src.key_pool import KeyPool
+from src.retry import EndpointForbiddenError, EntitlementMap
+from src.transport import build_response
+
+
+def test_keys_rotate_fairly_and_wait_when_all_busy():
+    """Test calls spread across keys and the 7th call waits for a window."""
+    pool = KeyPool(["a", "b", "c"], calls_per_minute=2, period=0.5)
+    start = time.monotonic()
+    used = [pool.acquire() for _ in range(6)]
+    assert time.monotonic() - start < 0.2
+    assert sorted(used) == ["a", "a", "b", "b", "c", "c"]
+    assert used[:3] == ["a", "b", "c"]
+
+    pool.acquire()
+    assert time.monotonic() - start >= 0.45
+
+
+def test_rejected_key_leaves_rotation(tmp_path):
+    """Test a 401 key is disabled and requests succeed on the others."""
+    with MockMassiveServer(api_keys=["k1", "k2"], tickers=5, dividends_per_ticker=1) as server:
+        client = MassiveAPIClient(base_url=server.base_url,
+                                  key_pool=KeyPool(["k1", "bad", "k2"], calls_per_minute=10 ** 6),
+                                  entitlements=EntitlementMap(str(tmp_path / "entitlements.json")))
+        for _ in range(4):
+            assert client.get_market_holidays()
+
+    assert [state["disabled"] for state in client.key_pool.status()] == [None, "401 Unauthorized", None]
+    assert server.status_counts[401] == 1
+
+
+class _PlanTransport:
+    """Answers 403 for keys outside ``entitled``."""
+
+    def __init__(self, entitled):
+        self.entitled = set(entitled)
+        self.headers = {}
+        self.keys = []
+
+    def request(self, method, url, params=None, json=None, headers=None):
+        self.keys.append(params["apiKey"])
+        if params["apiKey"] in self.entitled:
+            return build_response(200, b'{"status": "OK", "results": []}', {}, url)
+        return build_response(403, b'{"status": "NOT_AUTHORIZED"}', {}, url)
+
+
+def test_forbidden_key_falls_back_before_recording_entitlement(tmp_path):
+    """Test a 403 tries other keys; the entitlement map only learns when all fail."""
+    entitlements = EntitlementMap(str(tmp_path / "entitlements.json"))
+    transport = _PlanTransport(entitled={"pro"})
+    client = MassiveAPIClient(key_pool=KeyPool(["basic", "pro"], calls_per_minute=10 ** 6),
+                              entitlements=entitlements, transport=transport)
+
+    assert client.get_dividends(ticker="AAPL") == []
+    assert transport.keys == ["basic", "pro"]
+    assert client.get_dividends(ticker="MSFT") == []
+    assert transport.keys[2:] == ["pro"]  # basic is skipped for this endpoint now
+
+    assert not entitlements.entries()
+    transport.entitled.clear()
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_dividends(ticker="IBM")
+    assert entitlements.entries()
+    with pytest.raises(EndpointForbiddenError):
+        client.get_dividends(ticker="IBM")
+
+
+def test_pooled_keys_share_per_key_windows_across_processes(tmp_path, monkeypatch):
+    """Test MASSIVE_RATE_LIMIT_FILE gives each pooled key its own host-wide window."""
+    monkeypatch.delenv("MASSIVE_CASSETTE", raising=False)
+    monkeypatch.setenv("MASSIVE_RATE_LIMIT_FILE", str(tmp_path / "rate.json"))
+    pools = [KeyPool(["a", "b"], calls_per_minute=2, period=0.6) for _ in range(2)]
+    for pool in pools:
+        client = MassiveAPIClient(base_url="http://localhost:1", key_pool=pool)
+        assert type(client.rate_limiter).__name__ == "NullRateLimiter"
+
+    start = time.monotonic()
+    used = [pools[i % 2].acquire() for i in range(4)]  # Two "processes", 2 keys x 2 calls
+    assert time.monotonic() - start < 0.3 and sorted(used) == ["a", "a", "b", "b"]
+    pools[0].acquire()  # Both keys' shared windows are full
+    assert time.monotonic() - start >= 0.5
+    assert len([f for f in os.listdir(tmp_path) if f.endswith(".lock")]) == 2
+
+
+def test_explicit_api_key_wins_over_env_pool(monkeypatch):
+    """Test api_key= isn't replaced by MASSIVE_API_KEYS."""
+    monkeypatch.setenv("MASSIVE_API_KEYS", "k1,k2")
+    client = MassiveAPIClient(api_key="mine", base_url="http://localhost:1")
+    assert client.api_key == "mine" and client.key_pool is None
+    assert MassiveAPIClient(base_url="http://localhost:1").key_pool.keys == ["k1", "k2"]
@@ -0,0 +1,84 @@
+"""Tests for per-endpoint request metrics."""
+
+import pytest
+import requests
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_server import MockMassiveServer
+from src.api_client import MassiveAPIClient, RateLimiter
+from src.metrics import ClientMetrics, RequestEvent
+from src.retry import EntitlementMap, RetryPolicy
+
+
+def _client(server, tmp_path, **kwargs):
+    return MassiveAPIClient(api_key="test_key", base_url=server.base_url,
+                            rate_limiter=RateLimiter(calls_per_minute=10 ** 9),
+                            entitlements=EntitlementMap(str(tmp_path / "entitlements.json")), **kwargs)
+
+
+def test_client_records_per_template_metrics(tmp_path):
+    """Test pages and tickers collapse into templates with bytes and statuses."""
+    with MockMassiveServer(tickers=250, rate_limit=1, rate_window=0.2) as server:
+        client = _client(server, tmp_path, retry_policy=RetryPolicy(backoff_base=0.05, backoff_max=0.3))
+        list(client.iter_results("/reference/tickers", params={"limit": 100}))
+        client.get_aggregates("AAAA", 1, "day", "2024-01-01", "2024-01-31")
+        client.get_aggregates("AAAB", 1, "day", "2024-02-01", "2024-02-29")
+        with pytest.raises(requests.exceptions.HTTPError):
+            client._make_request("/v1/unknown")
+
+    snapshot = client.metrics.snapshot()
+    tickers = snapshot["/v3/reference/tickers"]
+    assert tickers["requests"] == 3
+    assert tickers["statuses"] == {200: 3}
+    assert tickers["attempts"] > 3  # rate_limit=1 forces retries
+    assert tickers["retry_backoff_seconds"] > 0
+    assert tickers["response_bytes"] > 0
+    assert tickers["latency_seconds"]["buckets"][float("inf")] == 3
+
+    assert snapshot["/v2/aggs/ticker/{ticker}/range/{n}/day/{date}/{date}"]["requests"] == 2
+    assert snapshot["/v1/unknown"]["errors"] == 1
+    assert snapshot["/v1/unknown"]["statuses"] == {404: 1}
+
+
+def test_hooks_run_and_failures_are_contained():
+    """Test before/after hooks see the event and a raising hook is ignored."""
+    metrics = ClientMetrics()
+    seen = []
+    metrics.add_hook(before=lambda e: seen.append(("before", e.template)),
+                     after=lambda e: seen.append(("after", e.status)))
+    metrics.add_hook(after=lambda e: 1 / 0)
+
+    event = metrics.start("/v1/open-close/AAPL/2024-01-02")
+    event.status = 200
+    event.latency = 0.02
+    metrics.finish(event)
+
+    assert seen == [("before", "/v1/open-close/{ticker}/{date}"), ("after", 200)]
+    assert metrics.snapshot()["/v1/open-close/{ticker}/{date}"]["requests"] == 1
+
+
+def test_prometheus_exposition():
+    """Test histogram buckets are cumulative and labels are rendered."""
+    metrics = ClientMetrics(buckets=(0.1, 1.0))
+    for latency in (0.05, 0.5, 2.0):
+        event = RequestEvent("/v3/reference/dividends")
+        event.status = 200
+        event.latency = latency
+        event.wait = 0.25
+        event.bytes = 100
+        metrics.finish(event)
+
+    text = metrics.to_prometheus()
+    label = 'endpoint="/v3/reference/dividends"'
+    assert f"massive_requests_total{{{label}}} 3" in text
+    assert f"massive_rate_limit_wait_seconds_total{{{label}}} 0.75" in text
+    assert f"massive_response_bytes_total{{{label}}} 300" in text
+    assert f'massive_responses_total{{{label},status="200"}} 3' in text
+    assert f'massive_request_duration_seconds_bucket{{{label},le="0.1"}} 1' in text
+    assert f'massive_request_duration_seconds_bucket{{{label},le="1.0"}} 2' in text
+    assert f'massive_request_duration_seconds_bucket{{{label},le="+Inf"}} 3' in text
+    assert "# TYPE massive_request_duration_seconds histogram" in text
@@ -0,0 +1,52 @@
+"""Tests for the client against the local mock server."""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_server import MockMassiveServer
+from src.api_client import MassiveAPIClient, RateLimiter
+from src.response_cache import ResponseCache
+from src.retry import EntitlementMap, RetryPolicy
+
+
+def _client(server, tmp_path, **kwargs):
+    kwargs.setdefault("rate_limiter", RateLimiter(calls_per_minute=10 ** 9))
+    return MassiveAPIClient(api_key="test_key", base_url=server.base_url,
+                            entitlements=EntitlementMap(str(tmp_path / "entitlements.json")), **kwargs)
+
+
+@pytest.fixture
+def server():
+    with MockMassiveServer(tickers=250, dividends_per_ticker=2) as mock:
+        yield mock
+
+
+def test_iter_results_walks_every_page(server, tmp_path):
+    """Test pagination follows next_url across the whole universe."""
+    client = _client(server, tmp_path)
+    tickers = [r["ticker"] for r in client.iter_results("/reference/tickers", params={"limit": 100})]
+    assert tickers == server.tickers
+    assert server.request_count == 3
+
+
+def test_retries_after_mock_429(tmp_path):
+    """Test a rate-limited call is retried once the window allows it."""
+    with MockMassiveServer(rate_limit=1, rate_window=0.2) as server:
+        client = _client(server, tmp_path, retry_policy=RetryPolicy(backoff_base=0.05, backoff_max=0.3))
+        client.get_market_holidays()
+        assert client.get_market_holidays()
+        assert server.status_counts[429] >= 1
+
+
+def test_closed_range_served_from_cache(server, tmp_path):
+    """Test a repeated closed aggregate range only reaches the server once."""
+    client = _client(server, tmp_path, cache=ResponseCache(str(tmp_path / "cache")))
+    first = client.get_aggregates("AAAA", 1, "day", "2024-01-01", "2024-01-31")
+    second = client.get_aggregates("AAAA", 1, "day", "2024-01-01", "2024-01-31")
+    assert first == second
+    assert len(first) == 23
+    assert server.request_count == 1
@@ -0,0 +1,99 @@
+"""Tests for aggregate range planner."""
+
+from datetime import date, timedelta
+import pytest
+from unittest.mock import Mock
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.bar_store import BarStore, to_epoch_ms
+from src.range_planner import RangeFetchError, RangePlanner
+
+
+def _daily_minute_bars(from_date, to_date):
+    """Fake API: two minute bars per weekday in the range."""
+    day, end = date.fromisoformat(from_date), date.fromisoformat(to_date)
+    bars = []
+    while day <= end:
+        if day.weekday() < 5:
+            t = to_epoch_ms(day) + 14 * 3_600_000
+            bars += [{"t": t, "c": 1.0}, {"t": t + 60_000, "c": 2.0}]
+        day += timedelta(days=1)
+    return bars
+
+
+def test_plan_uses_fewest_chunks_under_cap():
+    """Test minute plans respect the cap and daily plans need one call."""
+    planner = RangePlanner(Mock())
+    chunks = planner.plan(date(2020, 1, 1), date(2023, 12, 31), "minute")
+    # 960 bars/day * 0.9 * 50000 cap -> 46 trading days per chunk
+    assert all(
+        sum(1 for d in range((e - s).days + 1) if (s + timedelta(d)).weekday() < 5) <= 46
+        for s, e in chunks
+    )
+    assert chunks[0][0] == date(2020, 1, 1) and chunks[-1][1] == date(2023, 12, 31)
+    assert all(b[0] - a[1] == timedelta(days=1) for a, b in zip(chunks, chunks[1:]))
+    assert len(chunks) == 23
+    assert planner.plan(date(2004, 1, 1), date(2024, 1, 1), "day") == [(date(2004, 1, 1), date(2024, 1, 1))]
+
+
+def test_plan_skips_calendar_holidays():
+    """Test days the calendar marks closed don't count toward the cap."""
+    calendar = Mock()
+    calendar.is_trading_day.side_effect = lambda d: d.day % 2 == 0
+    planner = RangePlanner(Mock(), calendar=calendar, result_cap=5, safety=1.0)
+    chunks = planner.plan(date(2024, 1, 1), date(2024, 1, 20), "day")
+    assert chunks == [(date(2024, 1, 1), date(2024, 1, 11)), (date(2024, 1, 12), date(2024, 1, 20))]
+
+
+def test_fetch_resumes_from_store_after_failure(tmp_path):
+    """Test a failed chunk can be resumed without refetching stored chunks."""
+    client = Mock()
+    calls = []
+
+    def get_aggregates(ticker, multiplier, timespan, from_date, to_date, adjusted=True, as_array=False):
+        calls.append(from_date)
+        if len(calls) == 2:
+            raise ConnectionError("network down")
+        return _daily_minute_bars(from_date, to_date)
+
+    client.get_aggregates.side_effect = get_aggregates
+    planner = RangePlanner(client, result_cap=10, safety=1.0)
+    planner.bars_per_day = lambda timespan, multiplier=1: 2  # 5 weekdays per chunk
+    store = BarStore(str(tmp_path))
+
+    with pytest.raises(RangeFetchError) as err:
+        planner.fetch("AAPL", date(2024, 1, 1), date(2024, 1, 21), store=store)
+    assert len(err.value.completed) == 1
+    assert len(err.value.bars) == 10
+
+    bars = planner.fetch("AAPL", date(2024, 1, 1), date(2024, 1, 21), store=store)
+    assert calls == ["2024-01-01", "2024-01-08", "2024-01-08", "2024-01-15"]
+    assert len(bars) == 30
+    assert (bars["t"][1:] > bars["t"][:-1]).all()
+
+
+def test_fetch_fills_history_older_than_the_store(tmp_path):
+    """Test a range before the stored bars is fetched rather than skipped."""
+    client = Mock()
+    calls = []
+
+    def get_aggregates(ticker, multiplier, timespan, from_date, to_date, adjusted=True, as_array=False):
+        calls.append((from_date, to_date))
+        return _daily_minute_bars(from_date, to_date)
+
+    client.get_aggregates.side_effect = get_aggregates
+    planner = RangePlanner(client)
+    store = BarStore(str(tmp_path))
+    planner.fetch("AAPL", date(2024, 1, 8), date(2024, 1, 12), store=store)
+
+    older = planner.fetch("AAPL", date(2023, 12, 25), date(2023, 12, 29), store=store)
+    assert calls[1] == ("2023-12-25", "2023-12-29") and len(older) == 10
+
+    # Only the days not yet covered are fetched, including the hole between the two ranges
+    planner.fetch("AAPL", date(2023, 12, 18), date(2024, 1, 19), store=store)
+    assert calls[2:] == [("2023-12-18", "2023-12-24"), ("2023-12-30", "2024-01-07"),
+                         ("2024-01-13", "2024-01-19")]
+    assert store.count("AAPL", "minute") == 2 * 25
@@ -0,0 +1,62 @@
+"""Tests for cross-process shared rate limiter."""
+
+import multiprocessing
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.api_client import MassiveAPIClient, RateLimiter, SharedRateLimiter
+
+
+def _worker(path, calls, results):
+    """Take `calls` slots from the shared limiter and report when each fired."""
+    import time
+    limiter = SharedRateLimiter(path, calls_per_minute=3, period=1.0)
+    for _ in range(calls):
+        limiter.wait_if_needed()
+        results.put(time.time())
+
+
+def test_shared_rate_limiter_across_processes(tmp_path):
+    """Test several processes never exceed one combined budget."""
+    path = str(tmp_path / "rate_limit.json")
+    ctx = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_worker, args=(path, 3, results)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+        assert worker.exitcode == 0
+
+    times = sorted(results.get(timeout=5) for _ in range(9))
+    # Any 4 consecutive calls must span at least one full window
+    for i in range(len(times) - 3):
+        assert times[i + 3] - times[i] >= 0.99
+    # 9 calls at 3 per second need at least two extra windows
+    assert times[-1] - times[0] >= 1.99
+
+
+def test_shared_rate_limiter_recovers_from_corrupt_state(tmp_path):
+    """Test an unreadable state file is treated as an empty window."""
+    path = tmp_path / "rate_limit.json"
+    path.write_text("not json")
+    limiter = SharedRateLimiter(str(path), calls_per_minute=2, period=1.0)
+    limiter.wait_if_needed()
+    assert len(limiter._read_call_times()) == 1
+
+
+def test_client_uses_shared_limiter_from_env(tmp_path):
+    """Test MASSIVE_RATE_LIMIT_FILE switches the default limiter."""
+    path = str(tmp_path / "rate_limit.json")
+    with patch.dict(os.environ, {"MASSIVE_API_KEY": "test_key", "MASSIVE_RATE_LIMIT_FILE": path}):
+        client = MassiveAPIClient()
+    assert isinstance(client.rate_limiter, SharedRateLimiter)
+    assert client.rate_limiter.path == path
+
+    with patch.dict(os.environ, {"MASSIVE_API_KEY": "test_key"}, clear=True):
+        client = MassiveAPIClient()
+    assert isinstance(client.rate_limiter, RateLimiter)
@@ -0,0 +1,78 @@
+"""Tests for typed API records."""
+
+import json
+import numpy as np
+import requests
+from unittest.mock import Mock
+from datetime import date
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_server import MockMassiveServer
+from src.api_client import MassiveAPIClient, RateLimiter
+from src.bar_store import bars_to_array
+from src.records import Bar, BarSeries, Dividend, Holiday
+from src.retry import EntitlementMap
+
+EARLY_CLOSE = {"date": "2024-11-29", "exchange": "NASDAQ", "name": "Thanksgiving", "status": "early-close",
+               "open": "2024-11-29T14:30:00.000Z", "close": "2024-11-29T18:00:00.000Z"}
+
+
+def test_holiday_is_typed_and_dict_compatible():
+    """Test dates are parsed once while dict access returns API values."""
+    holiday = Holiday.from_dict(dict(EARLY_CLOSE, source="mock"))
+    assert holiday.date == date(2024, 11, 29)
+    assert holiday.close == 1732903200000
+    assert holiday.is_early_close and not holiday.is_closed
+    assert holiday["date"] == "2024-11-29"
+    assert holiday.get("close") == "2024-11-29T18:00:00.000Z"
+    assert holiday.get("missing") is None
+    assert holiday == dict(EARLY_CLOSE, source="mock")
+    assert holiday.to_dict() == dict(EARLY_CLOSE, source="mock")
+    assert not hasattr(holiday, "__dict__")
+
+    closed = Holiday.from_dict({"date": "2024-11-28", "exchange": "NYSE", "status": "closed"})
+    assert "close" not in closed and len(closed) == 3
+
+
+def test_client_returns_typed_dividends_and_bars(tmp_path):
+    """Test client methods return Dividend records and an array-backed BarSeries."""
+    with MockMassiveServer(tickers=10, dividends_per_ticker=3) as server:
+        client = MassiveAPIClient(api_key="test_key", base_url=server.base_url,
+                                  rate_limiter=RateLimiter(calls_per_minute=10 ** 9),
+                                  entitlements=EntitlementMap(str(tmp_path / "entitlements.json")))
+        dividends = client.get_dividends("AAAA")
+        bars = client.get_aggregates("AAAA", 1, "day", "2024-01-01", "2024-01-31")
+
+    assert len(dividends) == 3 and all(isinstance(d, Dividend) for d in dividends)
+    assert isinstance(dividends[0].ex_dividend_date, date)
+    assert dividends[0]["ex_dividend_date"] == dividends[0].ex_dividend_date.isoformat()
+
+    assert isinstance(bars, BarSeries) and len(bars) == 23
+    assert isinstance(bars[0], Bar) and bars[0]["c"] == bars.array["c"][0]
+    assert np.asarray(bars) is bars.array
+    assert bars_to_array(bars) is bars.array
+    assert bars[1:3] == bars.to_list()[1:3]
+
+
+def test_get_aggregates_keeps_fields_outside_bar_dtype(tmp_path):
+    """Test the default BarSeries keeps otc, absent n and int values as the API sent them."""
+    results = [{"v": 10, "o": 1.5, "c": 1.6, "h": 1.7, "l": 1.4, "t": 1704205800000, "otc": True},
+               {"v": 11, "o": 1.6, "c": 1.7, "h": 1.8, "l": 1.5, "t": 1704205860000, "n": 2, "vw": None}]
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps({"status": "OK", "results": results}).encode()
+    client = MassiveAPIClient(api_key="test_key", rate_limiter=RateLimiter(calls_per_minute=10 ** 9),
+                              entitlements=EntitlementMap(str(tmp_path / "entitlements.json")))
+    client.session.request = Mock(return_value=response)
+
+    bars = client.get_aggregates("AAPL", 1, "minute", "2024-01-02", "2024-01-02")
+    expected = [results[0], {key: value for key, value in results[1].items() if value is not None}]
+    assert bars.to_list() == expected and bars[0] == results[0] and bars[-1] == expected[1]
+    assert bars[0]["otc"] is True and bars[0].get("n") is None and bars[1]["v"] == 11
+    assert bars.array["n"].tolist() == [0, 2] and np.isnan(bars.array["vw"]).all()
+    assert bars[1:].to_list() == expected[1:] and bars[:1].to_list() == expected[:1]
+    assert bars.extras == {0: {"otc": True, "n": None}}  # Nothing else is kept per bar
@@ -0,0 +1,94 @@
+"""Tests for on-disk response cache."""
+
+import json
+import time
+import pytest
+from unittest.mock import Mock
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.api_client import MassiveAPIClient, RateLimiter
+from src.response_cache import ResponseCache
+
+
+def _response(status=200, body=None, etag=None):
+    response = Mock()
+    response.status_code = status
+    response.headers = {"ETag": etag} if etag else {}
+    response.json.return_value = body
+    response.content = json.dumps(body).encode() if body is not None else b""
+    response.raise_for_status.return_value = None
+    return response
+
+
+def test_ttl_rules_by_endpoint_family(tmp_path):
+    """Test closed historical ranges never expire and real-time is skipped."""
+    cache = ResponseCache(str(tmp_path))
+    assert cache.ttl_for("/v1/open-close/AAPL/2020-01-02") is None
+    assert cache.ttl_for("/v2/aggs/ticker/AAPL/range/1/day/2020-01-01/2020-12-31") is None
+    assert cache.ttl_for("/v2/aggs/ticker/AAPL/range/1/day/2020-01-01/2999-12-31") == 60
+    assert cache.ttl_for("/v2/aggs/grouped/locale/us/market/stocks/2021-03-01") is None
+    assert cache.ttl_for("/v2/last/trade/AAPL") == 0
+    assert cache.ttl_for("/reference/tickers") == 86400
+
+
+def test_client_serves_repeat_calls_from_cache(tmp_path):
+    """Test a cached response skips both the network and the rate limiter."""
+    cache = ResponseCache(str(tmp_path))
+    limiter = Mock(spec=RateLimiter)
+    client = MassiveAPIClient(api_key="test_key", rate_limiter=limiter, cache=cache)
+    client.session.request = Mock(return_value=_response(body={"results": [1, 2]}))
+
+    endpoint = "/v1/open-close/AAPL/2020-01-02"
+    assert client._make_request(endpoint) == {"results": [1, 2]}
+    # A fresh client (restart) reads the same directory
+    client2 = MassiveAPIClient(api_key="other_key", rate_limiter=limiter,
+                               cache=ResponseCache(str(tmp_path)))
+    client2.session.request = Mock()
+    assert client2._make_request(endpoint) == {"results": [1, 2]}
+
+    client2.session.request.assert_not_called()
+    assert limiter.wait_if_needed.call_count == 1
+    assert client2.cache.stats()["hits"] == 1
+
+
+def test_clients_on_different_hosts_do_not_share_entries(tmp_path):
+    """Test a response cached from one server is not served to a client of another."""
+    endpoint = "/v1/open-close/AAPL/2020-01-02"
+    live = MassiveAPIClient(api_key="test_key", rate_limiter=Mock(), cache=ResponseCache(str(tmp_path)),
+                            base_url="https://api.massive.com/v3")
+    live.session.request = Mock(return_value=_response(body={"results": ["live"]}))
+    live._make_request(endpoint)
+
+    mock = MassiveAPIClient(api_key="test_key", rate_limiter=Mock(), cache=ResponseCache(str(tmp_path)),
+                            base_url="http://127.0.0.1:8080/v3")
+    mock.session.request = Mock(return_value=_response(body={"results": ["mock"]}))
+    assert mock._make_request(endpoint) == {"results": ["mock"]}
+    assert mock.session.request.call_count == 1
+
+
+def test_stale_entry_revalidates_with_etag(tmp_path):
+    """Test a stale entry sends If-None-Match and reuses the body on 304."""
+    cache = ResponseCache(str(tmp_path), ttl_rules=[(r".*", 0.01)])
+    client = MassiveAPIClient(api_key="test_key", rate_limiter=Mock(), cache=cache)
+    client.session.request = Mock(return_value=_response(body={"results": ["v1"]}, etag='"abc"'))
+    client._make_request("/reference/tickers", params={"market": "fx"})
+    time.sleep(0.02)
+
+    client.session.request = Mock(return_value=_response(status=304))
+    assert client._make_request("/reference/tickers", params={"market": "fx"}) == {"results": ["v1"]}
+    assert client.session.request.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+    assert cache.stats()["revalidations"] == 1
+
+
+def test_size_based_eviction(tmp_path):
+    """Test least recently used entries are evicted past max_bytes."""
+    cache = ResponseCache(str(tmp_path), max_bytes=1500)
+    for i in range(5):
+        cache.store(f"/reference/tickers/T{i}", None, {"payload": os.urandom(200).hex()})
+    stats = cache.stats()
+    assert stats["evictions"] > 0
+    assert stats["bytes"] <= 1500
+    assert cache.lookup("/reference/tickers/T4").body["payload"]
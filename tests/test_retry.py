@@ -0,0 +1,91 @@
+"""Tests for retry policy and entitlement map."""
+
+import pytest
+import requests
+from unittest.mock import Mock, patch
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.api_client import MassiveAPIClient
+from src.endpoints import endpoint_template
+from src.retry import EndpointForbiddenError, EntitlementMap, RetryPolicy
+
+
+def _response(status, body=None, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"{}" if body is None else body
+    response.headers.update(headers or {})
+    response.url = "https://api.massive.com/test"
+    return response
+
+
+@pytest.fixture
+def client(tmp_path):
+    return MassiveAPIClient(api_key="test_key", rate_limiter=Mock(),
+                            entitlements=EntitlementMap(str(tmp_path / "entitlements.json")))
+
+
+def test_endpoint_template_collapses_symbols_and_dates():
+    """Test concrete endpoints map to one family key."""
+    assert endpoint_template("/v2/aggs/ticker/AAPL/range/1/day/2024-01-01/2024-12-31") == \
+        "/v2/aggs/ticker/{ticker}/range/{n}/day/{date}/{date}"
+    assert endpoint_template("/v2/last/trade/C:EURUSD") == "/v2/last/trade/{ticker}"
+    assert endpoint_template("https://api.massive.com/v3/reference/tickers?cursor=x") == "/v3/reference/tickers"
+
+
+def test_retry_policy_honors_retry_after():
+    """Test Retry-After overrides jittered backoff and retries are bounded."""
+    policy = RetryPolicy(max_retries=2, backoff_base=1.0)
+    assert policy.delay(0, "7") == 7.0
+    assert 0 <= policy.delay(3) <= 8.0
+    assert policy.should_retry(429, 1) and not policy.should_retry(429, 2)
+    assert not policy.should_retry(404, 0)
+
+
+def test_client_retries_429_then_succeeds(client):
+    """Test a 429 is retried after the server-provided delay."""
+    client.session.request = Mock(side_effect=[
+        _response(429, headers={"Retry-After": "3"}),
+        _response(503),
+        _response(200, b'{"results": [1]}'),
+    ])
+    with patch("src.api_client.time.sleep") as sleep:
+        assert client._make_request("/reference/tickers") == {"results": [1]}
+    assert sleep.call_args_list[0].args == (3.0,)
+    assert client.rate_limiter.wait_if_needed.call_count == 3
+
+
+def test_forbidden_endpoint_is_short_circuited_across_clients(client, tmp_path):
+    """Test a 403 is remembered per endpoint family and persisted."""
+    client.session.request = Mock(return_value=_response(403))
+    with pytest.raises(requests.HTTPError):
+        client._make_request("/v2/last/trade/AAPL")
+
+    other = MassiveAPIClient(api_key="test_key", rate_limiter=Mock(),
+                             entitlements=EntitlementMap(str(tmp_path / "entitlements.json")))
+    other.session.request = Mock()
+    with pytest.raises(EndpointForbiddenError):
+        other._make_request("/v2/last/trade/MSFT")
+    other.session.request.assert_not_called()
+    other.rate_limiter.wait_if_needed.assert_not_called()
+
+    expired = EntitlementMap(str(tmp_path / "entitlements.json"), ttl=0)
+    expired.record_forbidden("/v2/last/nbbo/AAPL")
+    assert expired.forbidden_until("/v2/last/nbbo/AAPL") is None
+
+
+def test_entitlement_maps_merge_concurrent_writers(tmp_path):
+    """Test maps sharing a file keep each other's entries instead of clobbering them."""
+    path = str(tmp_path / "entitlements.json")
+    first, second = EntitlementMap(path), EntitlementMap(path)  # Both loaded the empty file
+    first.record_forbidden("/v2/last/trade/AAPL")
+    second.record_forbidden("/v2/last/nbbo/AAPL")
+
+    assert set(EntitlementMap(path).entries()) == {endpoint_template("/v2/last/trade/AAPL"),
+                                                   endpoint_template("/v2/last/nbbo/AAPL")}
+    assert first.forbidden_until("/v2/last/nbbo/MSFT") is not None  # Reloaded on change
+    second.forget("/v2/last/trade/AAPL")
+    assert first.forbidden_until("/v2/last/trade/MSFT") is None
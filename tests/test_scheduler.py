@@ -0,0 +1,72 @@
+"""Tests for priority request scheduler."""
+
+import threading
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.scheduler import Priority, RequestScheduler
+
+
+class _GatedClient:
+    """Fake client that blocks its first call until released."""
+
+    def __init__(self):
+        self.calls = []
+        self.gate = threading.Event()
+        self.first_call = threading.Event()
+
+    def _make_request(self, endpoint, method="GET", params=None, data=None):
+        self.calls.append((endpoint, params))
+        self.first_call.set()
+        self.gate.wait(timeout=5)
+        if endpoint == "/boom":
+            raise RuntimeError("boom")
+        return {"endpoint": endpoint, "params": params}
+
+
+def test_scheduler_orders_by_priority_and_merges_duplicates():
+    """Test critical calls jump the queue and duplicates share one call."""
+    client = _GatedClient()
+    with RequestScheduler(client) as scheduler:
+        blocker = scheduler.submit("/blocker")
+        client.first_call.wait(timeout=5)
+
+        backfill = scheduler.submit_many(
+            [("/v2/aggs/a", {"x": 1}), ("/v2/aggs/b", {"x": 2})],
+            priority=Priority.BACKGROUND,
+        )
+        status_a = scheduler.submit("/v1/marketstatus/upcoming", priority=Priority.CRITICAL)
+        status_b = scheduler.submit("/v1/marketstatus/upcoming", priority=Priority.CRITICAL)
+        client.gate.set()
+
+        results = [f.result(timeout=5) for f in [blocker, status_a] + backfill]
+
+    assert status_a is status_b
+    assert scheduler.merged_count == 1
+    assert [c[0] for c in client.calls] == [
+        "/blocker", "/v1/marketstatus/upcoming", "/v2/aggs/a", "/v2/aggs/b"
+    ]
+    assert results[2]["params"] == {"x": 1}
+
+
+def test_scheduler_promotes_duplicate_and_propagates_errors():
+    """Test a more urgent duplicate promotes the queued request."""
+    client = _GatedClient()
+    scheduler = RequestScheduler(client)
+    scheduler.submit("/blocker")
+    client.first_call.wait(timeout=5)
+
+    scheduler.submit("/normal")
+    failing = scheduler.submit("/boom", priority=Priority.BACKGROUND)
+    promoted = scheduler.submit("/boom", priority=Priority.CRITICAL)
+    client.gate.set()
+    scheduler.shutdown()
+
+    assert failing is promoted
+    with pytest.raises(RuntimeError):
+        failing.result(timeout=5)
+    assert [c[0] for c in client.calls] == ["/blocker", "/boom", "/normal"]
+    assert scheduler.pending() == 0
@@ -0,0 +1,67 @@
+"""Tests for the local ticker universe index."""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_server import MockMassiveServer
+from src.api_client import MassiveAPIClient, RateLimiter
+from src.response_cache import ResponseCache
+from src.retry import EntitlementMap
+from src.ticker_index import TickerIndex, default_snapshot_path
+
+TICKERS = [
+    {"ticker": "AAPL", "name": "Apple Inc.", "market": "stocks", "type": "CS", "active": True},
+    {"ticker": "AAPLW", "name": "Apple Warrants", "market": "stocks", "type": "WARRANT", "active": False},
+    {"ticker": "APLE", "name": "Apple Hospitality REIT, Inc.", "market": "stocks", "type": "CS", "active": True},
+    {"ticker": "NVDA", "name": "NVIDIA Corporation", "market": "stocks", "type": "CS", "active": True},
+    {"ticker": "C:EURUSD", "name": "Euro - United States Dollar", "market": "fx", "active": True},
+    {"ticker": "X:BTCUSD", "name": "Bitcoin - United States Dollar", "market": "crypto", "active": True},
+]
+
+
+def _symbols(results):
+    return [record.ticker for record in results]
+
+
+def test_symbol_name_and_fuzzy_search():
+    """Test prefix, word and typo queries rank the expected tickers first."""
+    index = TickerIndex(TICKERS)
+    assert _symbols(index.search("AAP")) == ["AAPL", "AAPLW"]
+    assert _symbols(index.search("apple hosp")) == ["APLE"]
+    assert _symbols(index.search("nvida"))[0] == "NVDA"
+    assert _symbols(index.search("EUR")) == ["C:EURUSD"]
+    assert _symbols(index.search("united states", market="crypto")) == ["X:BTCUSD"]
+    assert _symbols(index.search("apple", active=True, type="CS")) == ["AAPL", "APLE"]
+    assert index.search("AAPL")[0]["name"] == "Apple Inc."  # Dict access still works
+    assert index.search("zzzzzz") == []
+
+
+def test_snapshot_round_trip_and_incremental_refresh(tmp_path):
+    """Test the snapshot persists and later refreshes only read new changes."""
+    with MockMassiveServer(tickers=300) as server:
+        client = MassiveAPIClient(api_key="test_key", base_url=server.base_url,
+                                  rate_limiter=RateLimiter(calls_per_minute=10 ** 9),
+                                  cache=ResponseCache(str(tmp_path / "cache")),  # Must not serve refreshes
+                                  entitlements=EntitlementMap(str(tmp_path / "entitlements.json")))
+        path = str(tmp_path / "tickers.json.gz")
+        index = TickerIndex.open(client, path=path, markets=["stocks"])
+        active = sum(1 for record in server.records("tickers") if record["active"])
+        assert len(index) == active
+
+        loaded = TickerIndex.load(path)
+        assert len(loaded) == active and loaded.high_water == index.high_water
+
+        record = next(r for r in server.records("tickers") if r["active"])
+        record.update(name="Zebra Robotics", last_updated_utc="2025-06-01T00:00:00Z")
+        stats = loaded.refresh(client, ["stocks"])
+        assert stats["calls"] == 2  # One page each of the active and inactive lists
+        assert _symbols(loaded.search("zebra")) == [record["ticker"]]
+
+
+def test_default_snapshot_follows_cache_dir(tmp_path, monkeypatch):
+    """Test the default snapshot path honours MASSIVE_CACHE_DIR set after import."""
+    monkeypatch.setenv("MASSIVE_CACHE_DIR", str(tmp_path))
+    assert TickerIndex(TICKERS).path == default_snapshot_path() == str(tmp_path / "tickers.json.gz")
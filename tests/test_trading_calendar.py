@@ -0,0 +1,52 @@
+"""Tests for vectorized trading calendar."""
+
+from datetime import date
+import numpy as np
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from trading_calendar import TradingCalendar
+
+HOLIDAYS = [
+    {"date": "2024-11-28", "exchange": "NASDAQ", "name": "Thanksgiving", "status": "closed"},
+    {"date": "2024-11-29", "exchange": "NASDAQ", "name": "Thanksgiving", "status": "early-close",
+     "open": "2024-11-29T14:30:00.000Z", "close": "2024-11-29T18:00:00.000Z"},
+    {"date": "2024-12-25", "exchange": "NASDAQ", "name": "Christmas", "status": "closed"},
+    {"date": "2024-12-24", "exchange": "NYSE", "name": "Christmas Eve", "status": "closed"},
+]
+
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar.from_holidays(HOLIDAYS, exchange="NASDAQ")
+
+
+def test_bulk_membership_and_navigation(calendar):
+    """Test whole date arrays are answered in one call."""
+    days = np.array(["2024-11-27", "2024-11-28", "2024-11-29", "2024-11-30", "2024-12-24"],
+                    dtype="datetime64[D]")
+    assert calendar.is_trading_day(days).tolist() == [True, False, True, False, True]
+    assert calendar.next_trading_day(days).astype(str).tolist() == [
+        "2024-11-29", "2024-11-29", "2024-12-02", "2024-12-02", "2024-12-26"]
+    assert calendar.previous_trading_day(days).astype(str).tolist() == [
+        "2024-11-26", "2024-11-27", "2024-11-27", "2024-11-29", "2024-12-23"]
+    assert calendar.is_trading_day(date(2024, 12, 25)) == False
+
+
+def test_counts_and_ranges(calendar):
+    """Test inclusive trading-day counts broadcast over arrays."""
+    starts = np.array(["2024-11-25", "2024-12-01"], dtype="datetime64[D]")
+    assert calendar.trading_days_between(starts, "2024-12-31").tolist() == [25, 21]
+    assert len(calendar.trading_days("2024-11-25", "2024-11-29")) == 4
+
+
+def test_session_close_handles_early_close(calendar):
+    """Test early-close sessions use the localized API close time."""
+    closes = calendar.session_close(["2024-11-27", "2024-11-28", "2024-11-29"])
+    assert closes[0] == np.datetime64("2024-11-27T16:00")
+    assert np.isnat(closes[1])
+    assert closes[2] == np.datetime64("2024-11-29T13:00")
+    assert calendar.is_early_close(["2024-11-29", "2024-11-27"]).tolist() == [True, False]
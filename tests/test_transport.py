@@ -0,0 +1,69 @@
+"""Tests for record/replay transports."""
+
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_server import MockMassiveServer
+from src.api_client import MassiveAPIClient, NullRateLimiter
+from src.response_cache import ResponseCache
+from src.retry import EntitlementMap
+from src.transport import (CassetteMissError, HTTPTransport, RecordingTransport,
+                           ReplayTransport, interaction_key, transport_from_env)
+
+
+def _client(tmp_path, transport, base_url="https://api.massive.com/v3", **kwargs):
+    return MassiveAPIClient(api_key="test_key", base_url=base_url, transport=transport,
+                            rate_limiter=NullRateLimiter(),
+                            entitlements=EntitlementMap(str(tmp_path / "entitlements.json")), **kwargs)
+
+
+def test_record_then_replay_offline(tmp_path):
+    """Test a recorded pipeline replays identically with the server gone."""
+    cassette = str(tmp_path / "run.json.gz")
+    with MockMassiveServer(tickers=250) as server:
+        with _client(tmp_path, RecordingTransport(cassette), base_url=server.base_url) as client:
+            live_tickers = list(client.iter_results("/reference/tickers", params={"limit": 100}))
+            live_holidays = client.get_market_holidays()
+
+    client = _client(tmp_path, ReplayTransport(cassette))  # different host, no server
+    assert list(client.iter_results("/reference/tickers", params={"limit": 100})) == live_tickers
+    assert client.get_market_holidays() == live_holidays
+    with pytest.raises(CassetteMissError):
+        client.get_dividends("AAPL")
+
+
+def test_replay_answers_conditional_requests(tmp_path):
+    """Test If-None-Match against the recorded ETag yields a 304."""
+    cassette = str(tmp_path / "run.json.gz")
+    with MockMassiveServer() as server:
+        with _client(tmp_path, RecordingTransport(cassette), base_url=server.base_url) as client:
+            client.get_market_holidays()
+
+    replay = ReplayTransport(cassette)
+    cache = ResponseCache(str(tmp_path / "cache"), ttl_rules=[(r".*", -1)])  # always stale
+    client = _client(tmp_path, replay, cache=cache)
+    first = client.get_market_holidays()
+    assert client.get_market_holidays() == first
+    assert cache.stats()["revalidations"] == 1
+
+
+def test_transport_selection_and_keys(tmp_path):
+    """Test env selection, pool settings and API-key-free cassette keys."""
+    transport = HTTPTransport(pool_maxsize=32, compress=True)
+    assert transport.session.get_adapter("https://api.massive.com")._pool_maxsize == 32
+    assert transport.headers["Accept-Encoding"] == "gzip, deflate"
+
+    assert interaction_key("GET", "http://a/v3/x?cursor=2&apiKey=k", {"limit": 5}) == \
+        interaction_key("GET", "https://b/v3/x", {"apiKey": "other", "limit": "5", "cursor": "2"})
+
+    cassette = str(tmp_path / "env.json.gz")
+    with patch.dict(os.environ, {"MASSIVE_CASSETTE": cassette}):
+        recorder = transport_from_env()
+        assert isinstance(recorder, RecordingTransport)
+        recorder.close()
+        assert isinstance(transport_from_env(), ReplayTransport)